@@ -0,0 +1,197 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from django.http import HttpResponse
+
+# Metrics are kept per process; with several worker processes, scrape each
+# one (or run a single process) to see all of them
+_registry = []
+
+# Histogram buckets (seconds) spanning file writes to long Gemini calls
+DEFAULT_BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    A value that only goes up, per combination of label values
+    """
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        """
+        Args:
+            amount (float): Amount to add
+            **labels: Value of each label name
+        """
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            values = sorted(self._values.items())
+
+        for key, value in values:
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Histogram:
+    """
+    Distribution of observed values (e.g. durations), per combination of
+    label values
+    """
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: [count per bucket (not cumulative) + overflow, sum]
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        """
+        Args:
+            value (float): Observed value
+            **labels: Value of each label name
+        """
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            counts[0][index] += 1
+            counts[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe how long the block takes, whether or not it raises
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            values = sorted(
+                (key, (list(counts), total)) for key, (counts, total) in self._values.items()
+            )
+
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(
+                    self.labelnames, key, [("le", _format_value(float(bound)))]
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def render_metrics():
+    """
+    Returns:
+        str: Every metric in the Prometheus text exposition format
+    """
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint
+    """
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+STAGE_SECONDS = Histogram(
+    "ytsummarizer_stage_duration_seconds",
+    "Time spent in each stage of the summarization pipeline",
+    ["stage"],
+)
+GEMINI_REQUESTS = Counter(
+    "ytsummarizer_gemini_requests_total",
+    "Gemini generate_content calls (each attempt counts)",
+    ["model", "outcome"],
+)
+GEMINI_TOKENS = Counter(
+    "ytsummarizer_gemini_tokens_total",
+    "Tokens used by Gemini calls, as reported by the API",
+    ["direction"],
+)
+RETRIES = Counter(
+    "ytsummarizer_retries_total",
+    "Gemini calls retried after a backoff",
+)
+FALLBACKS = Counter(
+    "ytsummarizer_fallbacks_total",
+    "Summaries that fell back to a cheaper method",
+    ["kind"],
+)
+CACHE_LOOKUPS = Counter(
+    "ytsummarizer_summary_cache_lookups_total",
+    "Summary lookups by where the summary was found (cache, database) or miss",
+    ["result"],
+)
+MODEL_ROUTES = Counter(
+    "ytsummarizer_model_routes_total",
+    "Video summaries by the model tier the router started them on, and why",
+    ["tier", "reason"],
+)
+MODEL_ESCALATIONS = Counter(
+    "ytsummarizer_model_escalations_total",
+    "Summaries retried on a more capable model because the output failed validation",
+    ["reason"],
+)
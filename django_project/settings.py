@@ -84,6 +84,20 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Playlist workers write summaries concurrently: WAL lets readers and a
+        # writer work at the same time, writers wait for the lock instead of
+        # failing with "database is locked", and IMMEDIATE transactions take
+        # the write lock up front so two writers can't deadlock upgrading it.
+        # Every connection switches the file to WAL mode, so db.sqlite3 is a
+        # local file created by `python manage.py migrate`, not tracked in git.
+        "OPTIONS": {
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+            ),
+            "timeout": 20,
+            "transaction_mode": "IMMEDIATE",
+        },
     }
 }
 
@@ -135,3 +149,125 @@ STATICFILES_DIRS = [
 ]
 
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+
+# Summary cache: generated summaries are stored on disk, keyed by video ID,
+# style, model and prompt version. Entries expire after SUMMARY_CACHE_TTL
+# seconds and the oldest are culled once SUMMARY_CACHE_MAX_ENTRIES is reached.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "summaries": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "summary_cache",
+        "TIMEOUT": int(os.environ.get("SUMMARY_CACHE_TTL", 60 * 60 * 24 * 30)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("SUMMARY_CACHE_MAX_ENTRIES", 5000)),
+        },
+    },
+}
+
+# Number of playlist videos summarized in parallel (upper bound for the
+# "max_workers" request parameter)
+PLAYLIST_MAX_WORKERS = int(os.environ.get("PLAYLIST_MAX_WORKERS", 4))
+
+# Number of playlist videos summarized at once by the async playlist endpoint
+# (upper bound for its "max_concurrency" request parameter). Videos waiting
+# there cost a coroutine rather than a thread; Gemini calls are still limited
+# by the rate limits below.
+ASYNC_PLAYLIST_CONCURRENCY = int(os.environ.get("ASYNC_PLAYLIST_CONCURRENCY", 64))
+
+# Maximum number of videos in one request to the video batch endpoint
+BATCH_MAX_VIDEOS = int(os.environ.get("BATCH_MAX_VIDEOS", 500))
+
+# Number of playlist jobs run at the same time by the background workers of
+# each process (see summarize/jobs.py). The job queue is per process and does
+# not survive a restart.
+PLAYLIST_JOB_WORKERS = int(os.environ.get("PLAYLIST_JOB_WORKERS", 2))
+
+# Gemini rate limiting (see summarize/ratelimit.py). All Gemini calls in a
+# process share these request and token budgets; concurrency starts at
+# GEMINI_MAX_CONCURRENCY and is lowered automatically when the quota is hit.
+GEMINI_REQUESTS_PER_MINUTE = int(os.environ.get("GEMINI_REQUESTS_PER_MINUTE", 60))
+GEMINI_TOKENS_PER_MINUTE = int(os.environ.get("GEMINI_TOKENS_PER_MINUTE", 1_000_000))
+GEMINI_MAX_CONCURRENCY = int(os.environ.get("GEMINI_MAX_CONCURRENCY", 8))
+GEMINI_EXPECTED_OUTPUT_TOKENS = int(
+    os.environ.get("GEMINI_EXPECTED_OUTPUT_TOKENS", 4000)
+)
+# Retry backoff: exponential from GEMINI_BACKOFF_BASE seconds, capped at
+# GEMINI_BACKOFF_MAX, with random jitter
+GEMINI_BACKOFF_BASE = float(os.environ.get("GEMINI_BACKOFF_BASE", 2))
+GEMINI_BACKOFF_MAX = float(os.environ.get("GEMINI_BACKOFF_MAX", 60))
+
+# Gemini models, tried in order until one can be initialized (see summarize/gemini.py)
+GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-1.5-pro")
+GEMINI_FALLBACK_MODELS = os.environ.get(
+    "GEMINI_FALLBACK_MODELS", "gemini-1.0-pro"
+).split(",")
+
+# Model router (see summarize/router.py). Tiers go from the cheapest to the
+# most capable model. Video summaries start on the cheapest tier and move up
+# only if its output fails validation, except for ROUTER_CAPABLE_STYLES and
+# for videos estimated (at GEMINI_VIDEO_TOKENS_PER_SECOND) to need more than
+# ROUTER_FAST_MAX_INPUT_TOKENS input tokens, which start on the most capable
+# tier. Requests with less than ROUTER_FAST_DEADLINE_SECONDS of time budget
+# always start on the cheapest tier.
+GEMINI_MODEL_TIERS = {
+    "fast": os.environ.get("GEMINI_FAST_MODEL", "gemini-1.5-flash"),
+    "capable": GEMINI_MODEL,
+}
+ROUTER_CAPABLE_STYLES = os.environ.get(
+    "ROUTER_CAPABLE_STYLES", "academic,technical"
+).split(",")
+ROUTER_FAST_MAX_INPUT_TOKENS = int(
+    os.environ.get("ROUTER_FAST_MAX_INPUT_TOKENS", 300_000)
+)
+ROUTER_FAST_DEADLINE_SECONDS = float(os.environ.get("ROUTER_FAST_DEADLINE_SECONDS", 60))
+GEMINI_VIDEO_TOKENS_PER_SECOND = int(
+    os.environ.get("GEMINI_VIDEO_TOKENS_PER_SECOND", 300)
+)
+
+# Total time budget (seconds) of one video summary, covering every retry,
+# backoff sleep and the simple-prompt fallback (see summarize/deadline.py)
+SUMMARY_DEADLINE_SECONDS = float(os.environ.get("SUMMARY_DEADLINE_SECONDS", 300))
+
+# How long (seconds) a fetched playlist's video list is reused before yt-dlp
+# is run again (see get_links_from_playlist/views.py)
+PLAYLIST_CACHE_TTL = int(os.environ.get("PLAYLIST_CACHE_TTL", 60 * 60))
+
+# Playlist digests summarize the per-video summaries in groups of at most this
+# many (estimated) prompt tokens, then summarize those group summaries again
+# until one is left (see summarize/digest.py)
+DIGEST_GROUP_TOKENS = int(os.environ.get("DIGEST_GROUP_TOKENS", 30_000))
+
+# Long-video mode (see summarize/longvideo.py): videos of at least
+# LONG_VIDEO_THRESHOLD_SECONDS are summarized in LONG_VIDEO_CHUNK_SECONDS time
+# windows, up to LONG_VIDEO_MAX_WORKERS windows at a time, and the partial
+# summaries are merged
+LONG_VIDEO_THRESHOLD_SECONDS = int(
+    os.environ.get("LONG_VIDEO_THRESHOLD_SECONDS", 45 * 60)
+)
+LONG_VIDEO_CHUNK_SECONDS = int(os.environ.get("LONG_VIDEO_CHUNK_SECONDS", 15 * 60))
+LONG_VIDEO_MAX_WORKERS = int(os.environ.get("LONG_VIDEO_MAX_WORKERS", 4))
+
+# Transcripts are stored once per video (see summarize/transcripts.py) and
+# later summaries of the video are written from the stored text, with the
+# output capped at TRANSCRIPT_SUMMARY_MAX_OUTPUT_TOKENS
+TRANSCRIPT_SUMMARY_MAX_OUTPUT_TOKENS = int(
+    os.environ.get("TRANSCRIPT_SUMMARY_MAX_OUTPUT_TOKENS", 2048)
+)
+
+# Extractive engine (see summarize/engines.py): summarizes stored transcripts,
+# or caption files named {video_id}.vtt / .srt in CAPTIONS_DIR, in-process
+# without Gemini. With EXTRACTIVE_FALLBACK, requests that Gemini cannot answer
+# because of retriable errors, its quota or the deadline get an extractive
+# summary (marked "degraded") instead of an error, and for
+# DEGRADED_MODE_SECONDS after Gemini reports an exceeded quota such requests
+# are answered that way straight away. 0 disables the latter.
+CAPTIONS_DIR = Path(os.environ.get("CAPTIONS_DIR", BASE_DIR / "captions"))
+EXTRACTIVE_FALLBACK = os.environ.get("EXTRACTIVE_FALLBACK", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+DEGRADED_MODE_SECONDS = float(os.environ.get("DEGRADED_MODE_SECONDS", 60))
@@ -2,8 +2,11 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
 
+from .metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("api/playlist/", include("get_links_from_playlist.urls")),
     path("api/summarize/", include("summarize.urls")),
     path("summarize/", include("summarize.urls")),
@@ -1,3 +1,22 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Playlist, PlaylistMembership, Video
+
+
+@admin.register(Video)
+class VideoAdmin(admin.ModelAdmin):
+    list_display = ("video_id", "title", "duration", "updated_at")
+    search_fields = ("video_id", "title")
+
+
+class PlaylistMembershipInline(admin.TabularInline):
+    model = PlaylistMembership
+    raw_id_fields = ("video",)
+    extra = 0
+
+
+@admin.register(Playlist)
+class PlaylistAdmin(admin.ModelAdmin):
+    list_display = ("playlist_id", "url", "fetched_at")
+    search_fields = ("playlist_id",)
+    inlines = [PlaylistMembershipInline]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Playlist',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('playlist_id', models.CharField(max_length=64, unique=True)),
+                ('url', models.URLField(max_length=500)),
+                ('fetched_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Video',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('video_id', models.CharField(max_length=32, unique=True)),
+                ('url', models.URLField(max_length=500)),
+                ('title', models.CharField(blank=True, max_length=500)),
+                ('duration', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PlaylistMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('added_at', models.DateTimeField(auto_now_add=True)),
+                ('removed_at', models.DateTimeField(blank=True, null=True)),
+                ('playlist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='get_links_from_playlist.playlist')),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='get_links_from_playlist.video')),
+            ],
+            options={
+                'ordering': ['position'],
+            },
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='videos',
+            field=models.ManyToManyField(related_name='playlists', through='get_links_from_playlist.PlaylistMembership', to='get_links_from_playlist.video'),
+        ),
+        migrations.AddIndex(
+            model_name='playlistmembership',
+            index=models.Index(fields=['playlist', 'removed_at', 'position'], name='membership_listing_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='playlistmembership',
+            constraint=models.UniqueConstraint(fields=('playlist', 'video'), name='unique_playlist_video'),
+        ),
+    ]
@@ -1,3 +1,100 @@
 from django.db import models
 
-# Create your models here.
+
+class VideoManager(models.Manager):
+    def for_id(self, video_id, url=None):
+        """
+        Get the Video row of a video ID, creating it if the video is new
+
+        Args:
+            video_id (str): Canonical YouTube video ID
+            url (str): Video URL, defaults to the watch URL of the ID
+
+        Returns:
+            Video: The row
+        """
+        video, _ = self.get_or_create(
+            video_id=video_id,
+            defaults={"url": url or f"https://www.youtube.com/watch?v={video_id}"},
+        )
+        return video
+
+
+class Video(models.Model):
+    """
+    A YouTube video, shared by every playlist that contains it
+    """
+
+    video_id = models.CharField(max_length=32, unique=True)
+    url = models.URLField(max_length=500)
+    title = models.CharField(max_length=500, blank=True)
+    # Length in seconds, if the playlist listing included it
+    duration = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = VideoManager()
+
+    def __str__(self):
+        return self.title or self.video_id
+
+    def as_dict(self):
+        """
+        Returns:
+            dict: Video dictionary in the format used by the views
+        """
+        video = {"title": self.title, "id": self.video_id, "url": self.url}
+        if self.duration is not None:
+            video["duration"] = self.duration
+        return video
+
+
+class Playlist(models.Model):
+    """
+    A YouTube playlist and when its membership was last fetched
+    """
+
+    playlist_id = models.CharField(max_length=64, unique=True)
+    url = models.URLField(max_length=500)
+    fetched_at = models.DateTimeField(null=True, blank=True)
+    videos = models.ManyToManyField(
+        Video, through="PlaylistMembership", related_name="playlists"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.playlist_id
+
+
+class PlaylistMembership(models.Model):
+    """
+    A video's place in a playlist. Videos removed from the playlist keep their
+    row with removed_at set, so changes between fetches can be reported.
+    """
+
+    playlist = models.ForeignKey(
+        Playlist, on_delete=models.CASCADE, related_name="memberships"
+    )
+    video = models.ForeignKey(
+        Video, on_delete=models.CASCADE, related_name="memberships"
+    )
+    position = models.PositiveIntegerField()
+    added_at = models.DateTimeField(auto_now_add=True)
+    removed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["playlist", "video"], name="unique_playlist_video"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["playlist", "removed_at", "position"],
+                name="membership_listing_idx",
+            )
+        ]
+        ordering = ["position"]
+
+    def __str__(self):
+        return f"{self.playlist} #{self.position}: {self.video}"
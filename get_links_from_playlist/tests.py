@@ -1,3 +1,339 @@
+from unittest import mock
+
+from django.db import IntegrityError, transaction
 from django.test import TestCase
+from django.urls import reverse
+
+from . import views
+from .models import Playlist, PlaylistMembership, Video
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLtest"
+
+
+def make_videos(*video_ids):
+    return [
+        {
+            "title": f"Video {video_id}",
+            "id": video_id,
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+        }
+        for video_id in video_ids
+    ]
+
+
+class PlaylistSnapshotTests(TestCase):
+    def test_fresh_snapshot_is_reused(self):
+        with mock.patch.object(
+            views, "extract_playlist_videos_ytdlp", return_value=make_videos("a", "b")
+        ) as extract:
+            first = views.get_playlist_videos(PLAYLIST_URL, max_age=3600)
+            second = views.get_playlist_videos(PLAYLIST_URL, max_age=3600)
+
+        self.assertEqual(first, second)
+        self.assertEqual([video["id"] for video in second], ["a", "b"])
+        self.assertEqual(extract.call_count, 1)
+
+    def test_max_age_zero_lists_the_playlist_again(self):
+        with mock.patch.object(
+            views, "extract_playlist_videos_ytdlp", return_value=make_videos("a")
+        ) as extract:
+            views.get_playlist_videos(PLAYLIST_URL)
+            views.get_playlist_videos(PLAYLIST_URL, max_age=0)
+
+        self.assertEqual(extract.call_count, 2)
+
+    def test_errors_are_not_saved(self):
+        with mock.patch.object(
+            views, "extract_playlist_videos_ytdlp", return_value={"error": "boom"}
+        ):
+            videos = views.get_playlist_videos(PLAYLIST_URL)
+
+        self.assertEqual(videos, {"error": "boom"})
+        self.assertIsNone(views.load_playlist_snapshot(PLAYLIST_URL))
+
+    def test_snapshot_keeps_playlist_order(self):
+        views.save_playlist_snapshot(PLAYLIST_URL, make_videos("c", "a", "b", "a"))
+
+        snapshot = views.load_playlist_snapshot(PLAYLIST_URL)
+
+        self.assertEqual([video["id"] for video in snapshot["videos"]], ["c", "a", "b"])
+        self.assertEqual(snapshot["playlist_url"], PLAYLIST_URL)
+
+    def test_refresh_reports_added_and_removed_videos(self):
+        views.save_playlist_snapshot(PLAYLIST_URL, make_videos("a", "b", "c"))
+
+        with mock.patch.object(
+            views, "extract_playlist_videos_ytdlp", return_value=make_videos("b", "d")
+        ):
+            changes = views.refresh_playlist_videos(PLAYLIST_URL)
+
+        self.assertEqual([video["id"] for video in changes["added"]], ["d"])
+        self.assertEqual(
+            sorted(video["id"] for video in changes["removed"]), ["a", "c"]
+        )
+        snapshot = views.load_playlist_snapshot(PLAYLIST_URL)
+        self.assertEqual([video["id"] for video in snapshot["videos"]], ["b", "d"])
+
+    def test_removed_videos_keep_their_membership(self):
+        views.save_playlist_snapshot(PLAYLIST_URL, make_videos("a", "b"))
+        views.save_playlist_snapshot(PLAYLIST_URL, make_videos("b"))
+
+        removed = PlaylistMembership.objects.get(video__video_id="a")
+        self.assertIsNotNone(removed.removed_at)
+
+        # A video that comes back is a member again, at its new position
+        views.save_playlist_snapshot(PLAYLIST_URL, make_videos("b", "a"))
+        removed.refresh_from_db()
+        self.assertIsNone(removed.removed_at)
+        self.assertEqual(removed.position, 2)
+
+    def test_changes_endpoint(self):
+        views.save_playlist_snapshot(PLAYLIST_URL, make_videos("a"))
+
+        with mock.patch.object(
+            views, "extract_playlist_videos_ytdlp", return_value=make_videos("a", "b")
+        ):
+            response = self.client.post(
+                reverse("get_playlist_changes"),
+                {"playlist_url": PLAYLIST_URL},
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([video["id"] for video in response.json()["added"]], ["b"])
+        self.assertEqual(Playlist.objects.get().playlist_id, "PLtest")
+
+
+class FakeYoutubeDL:
+    """
+    Stands in for yt_dlp.YoutubeDL, answering extract_info from a dict of URLs
+    """
+
+    def __init__(self, results):
+        self.results = results
+        self.urls = []
+
+    def __call__(self, options):
+        self.options = options
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def extract_info(self, url, download=False, process=True):
+        self.urls.append(url)
+        result = self.results[url]
+        if isinstance(result, Exception):
+            raise result
+        return result() if callable(result) else result
+
+
+def playlist_result(*entries):
+    return lambda: {"_type": "playlist", "entries": iter(entries)}
+
+
+class InProcessListingTests(TestCase):
+    def listing(self, results, url=PLAYLIST_URL):
+        ydl = FakeYoutubeDL(results)
+        with mock.patch("yt_dlp.YoutubeDL", ydl):
+            return list(views.iter_playlist_videos_ytdlp(url)), ydl
+
+    def test_lists_flat_entries(self):
+        videos, ydl = self.listing(
+            {
+                PLAYLIST_URL: playlist_result(
+                    {
+                        "url": "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+                        "title": "A",
+                    },
+                    {"url": "bbbbbbbbbbb", "id": "bbbbbbbbbbb", "duration": 61.0},
+                    None,
+                )
+            }
+        )
+
+        self.assertEqual(
+            videos,
+            [
+                {
+                    "title": "A",
+                    "id": "aaaaaaaaaaa",
+                    "url": "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+                },
+                {
+                    "title": "",
+                    "id": "bbbbbbbbbbb",
+                    "url": "https://www.youtube.com/watch?v=bbbbbbbbbbb",
+                    "duration": 61,
+                },
+            ],
+        )
+        self.assertTrue(ydl.options["lazy_playlist"])
+        self.assertNotIn("ignoreerrors", ydl.options)
+
+    def test_url_results_are_followed_to_the_playlist(self):
+        embed_url = "https://www.youtube.com/embed/videoseries?list=PLtest"
+
+        videos, ydl = self.listing(
+            {
+                embed_url: {"_type": "url", "url": PLAYLIST_URL},
+                PLAYLIST_URL: playlist_result(
+                    {"url": "aaaaaaaaaaa", "id": "aaaaaaaaaaa"}
+                ),
+            },
+            url=embed_url,
+        )
+
+        self.assertEqual([video["id"] for video in videos], ["aaaaaaaaaaa"])
+        self.assertEqual(ydl.urls, [embed_url, PLAYLIST_URL])
+
+    def test_single_video_is_not_a_playlist(self):
+        video_url = "https://youtu.be/aaaaaaaaaaa"
+
+        with self.assertRaises(views.PlaylistExtractionError):
+            self.listing({video_url: {"_type": "video", "id": "a" * 11}}, video_url)
+
+    def test_page_failing_mid_listing_raises(self):
+        import yt_dlp
+
+        def entries():
+            yield {"url": "aaaaaaaaaaa", "id": "aaaaaaaaaaa"}
+            raise yt_dlp.utils.ExtractorError("page 2 failed")
+
+        with self.assertRaises(views.PlaylistExtractionError):
+            self.listing({PLAYLIST_URL: {"_type": "playlist", "entries": entries()}})
+
+
+class FakeStdout(list):
+    def close(self):
+        pass
+
+
+class FakeProcess:
+    def __init__(self, lines, returncode=0):
+        self.stdout = FakeStdout(lines)
+        self.returncode = returncode
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self):
+        return self.returncode
+
+    def kill(self):
+        pass
+
+
+class SubprocessListingTests(TestCase):
+    def listing(self, process):
+        with mock.patch.object(
+            views.subprocess, "Popen", return_value=process
+        ) as popen:
+            videos = list(views._iter_playlist_videos_subprocess(PLAYLIST_URL))
+        return videos, popen.call_args.args[0]
+
+    def test_parses_printed_entries(self):
+        videos, cmd = self.listing(
+            FakeProcess(
+                [
+                    "https://www.youtube.com/watch?v=aaaaaaaaaaa\t95\tFirst\n",
+                    "garbage\n",
+                    "https://www.youtube.com/watch?v=bbbbbbbbbbb\tNA\tSecond\tpart\n",
+                ]
+            )
+        )
+
+        self.assertEqual(
+            [video["id"] for video in videos], ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+        )
+        self.assertEqual(videos[0]["duration"], 95)
+        self.assertEqual(videos[1]["title"], "Second\tpart")
+        self.assertNotIn("-i", cmd)
+
+    def test_failed_listing_raises(self):
+        with self.assertRaises(views.PlaylistExtractionError):
+            self.listing(FakeProcess(["https://youtu.be/aaaaaaaaaaa\t1\tA\n"], 1))
+
+
+class IterPlaylistVideosTests(TestCase):
+    def test_videos_are_yielded_while_the_playlist_is_listed(self):
+        listed = []
+
+        def listing(playlist_url):
+            for video in make_videos("a", "b"):
+                listed.append(video["id"])
+                yield video
+
+        with mock.patch.object(views, "iter_playlist_videos_ytdlp", listing):
+            videos = views.iter_playlist_videos(PLAYLIST_URL, max_age=0)
+            self.assertEqual(next(videos)["id"], "a")
+            self.assertEqual(listed, ["a"])
+            self.assertEqual([video["id"] for video in videos], ["b"])
+
+        snapshot = views.load_playlist_snapshot(PLAYLIST_URL)
+        self.assertEqual([video["id"] for video in snapshot["videos"]], ["a", "b"])
+
+    def test_interrupted_listing_keeps_the_saved_snapshot(self):
+        views.save_playlist_snapshot(PLAYLIST_URL, make_videos("a", "b", "c"))
+
+        def listing(playlist_url):
+            yield from make_videos("a")
+            raise views.PlaylistExtractionError("yt-dlp error: page 2 failed")
+
+        with mock.patch.object(views, "iter_playlist_videos_ytdlp", listing):
+            with self.assertRaises(views.PlaylistExtractionError):
+                list(views.iter_playlist_videos(PLAYLIST_URL, max_age=0))
+
+        snapshot = views.load_playlist_snapshot(PLAYLIST_URL)
+        self.assertEqual(
+            [video["id"] for video in snapshot["videos"]], ["a", "b", "c"]
+        )
+
+    def test_empty_listing_is_not_saved(self):
+        views.save_playlist_snapshot(PLAYLIST_URL, make_videos("a", "b"))
+
+        with mock.patch.object(
+            views, "extract_playlist_videos_ytdlp", return_value=[]
+        ):
+            changes = views.refresh_playlist_videos(PLAYLIST_URL)
+
+        self.assertIn("error", changes)
+        self.assertFalse(PlaylistMembership.objects.exclude(removed_at=None).exists())
+
+
+class PlaylistModelTests(TestCase):
+    def test_for_id_creates_each_video_once(self):
+        video = Video.objects.for_id("aaaaaaaaaaa")
+
+        self.assertEqual(video.url, "https://www.youtube.com/watch?v=aaaaaaaaaaa")
+        self.assertEqual(Video.objects.for_id("aaaaaaaaaaa", url="ignored"), video)
+        self.assertEqual(Video.objects.count(), 1)
+
+    def test_as_dict_includes_the_duration_only_when_known(self):
+        video = Video.objects.for_id("aaaaaaaaaaa")
+
+        self.assertNotIn("duration", video.as_dict())
+
+        video.duration = 95
+        self.assertEqual(video.as_dict()["duration"], 95)
+
+    def test_video_is_a_member_of_a_playlist_once(self):
+        playlist = Playlist.objects.create(playlist_id="PLtest", url=PLAYLIST_URL)
+        video = Video.objects.for_id("aaaaaaaaaaa")
+        PlaylistMembership.objects.create(playlist=playlist, video=video, position=1)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            PlaylistMembership.objects.create(
+                playlist=playlist, video=video, position=2
+            )
+
+    def test_deleting_a_playlist_keeps_its_videos(self):
+        views.save_playlist_snapshot(PLAYLIST_URL, make_videos("a", "b"))
+
+        Playlist.objects.all().delete()
 
-# Create your tests here.
+        self.assertFalse(PlaylistMembership.objects.exists())
+        self.assertEqual(Video.objects.count(), 2)
@@ -8,4 +8,5 @@ urlpatterns = [
     path(
         "as-json/", views.get_playlist_links_as_json, name="get_playlist_links_as_json"
     ),
+    path("changes/", views.get_playlist_changes, name="get_playlist_changes"),
 ]
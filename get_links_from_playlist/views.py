@@ -2,12 +2,216 @@ import os
 import json
 import subprocess
 import tempfile
+import time
 from django.shortcuts import render
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from pathlib import Path
 
+from django_project.metrics import STAGE_SECONDS
+
+from .models import Playlist, PlaylistMembership, Video
+
+
+# Number of URL results yt-dlp may hand back before a playlist is reached
+MAX_URL_REDIRECTS = 5
+
+
+class PlaylistExtractionError(Exception):
+    """
+    Raised when yt-dlp cannot list a playlist
+    """
+
+
+def _video_from_entry(url, title, duration=None):
+    # Extract video ID from URL
+    video_id = url.split("v=")[-1].split("&")[0] if "v=" in url else url.split("/")[-1]
+
+    video = {"title": title, "id": video_id, "url": url}
+
+    # Length in seconds, when the playlist listing includes it
+    try:
+        video["duration"] = int(float(duration))
+    except (TypeError, ValueError):
+        pass
+
+    return video
+
+
+def _iter_playlist_videos_in_process(playlist_url):
+    """
+    List a playlist with the yt_dlp library, fetching pages lazily
+    """
+    import yt_dlp
+
+    # Errors are not ignored: a page that fails halfway through would
+    # otherwise end the listing early and look like a complete playlist
+    options = {
+        "extract_flat": "in_playlist",
+        "lazy_playlist": True,
+        "quiet": True,
+        "no_warnings": True,
+    }
+
+    with yt_dlp.YoutubeDL(options) as ydl:
+        try:
+            # process=False leaves "entries" as a generator that requests the
+            # next page of the playlist only when it is needed
+            info = ydl.extract_info(playlist_url, download=False, process=False)
+
+            # Bare ?list= URLs, embed/videoseries URLs and youtu.be links with a
+            # list parameter resolve to the playlist page in further steps
+            for _ in range(MAX_URL_REDIRECTS):
+                if not info or info.get("_type") not in ("url", "url_transparent"):
+                    break
+                info = ydl.extract_info(info["url"], download=False, process=False)
+        except yt_dlp.utils.YoutubeDLError as e:
+            raise PlaylistExtractionError(f"yt-dlp error: {str(e)}")
+
+        if not info:
+            raise PlaylistExtractionError("yt-dlp error: playlist not found")
+
+        if "entries" not in info:
+            raise PlaylistExtractionError(
+                f"yt-dlp error: {playlist_url} is not a playlist"
+            )
+
+        entries = iter(info["entries"] or [])
+        while True:
+            try:
+                entry = next(entries)
+            except StopIteration:
+                break
+            except yt_dlp.utils.YoutubeDLError as e:
+                raise PlaylistExtractionError(f"yt-dlp error: {str(e)}")
+
+            if not entry or not entry.get("url"):
+                continue
+
+            url = entry["url"]
+            if not url.startswith("http"):
+                url = f"https://www.youtube.com/watch?v={entry.get('id', url)}"
+
+            yield _video_from_entry(
+                url, entry.get("title") or "", entry.get("duration")
+            )
+
+
+def _iter_playlist_videos_subprocess(playlist_url):
+    """
+    List a playlist with the yt-dlp command, reading its output as it is printed
+    """
+    cmd = [
+        "yt-dlp",
+        "--flat-playlist",
+        "--print",
+        "%(url)s\t%(duration)s\t%(title)s",
+        playlist_url,
+    ]
+
+    # stderr goes to a file so a chatty yt-dlp can't block on a full pipe
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as stderr_file:
+        process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True, bufsize=1
+        )
+
+        try:
+            for line in process.stdout:
+                line = line.rstrip("\n")
+                if line.count("\t") < 2:
+                    continue
+
+                url, duration, title = line.split("\t", 2)
+                yield _video_from_entry(url.strip(), title.strip(), duration.strip())
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+
+        if process.returncode != 0:
+            stderr_file.seek(0)
+            raise PlaylistExtractionError(f"yt-dlp error: {stderr_file.read()}")
+
+
+def iter_playlist_videos_ytdlp(playlist_url):
+    """
+    Yield the videos of a YouTube playlist one by one as yt-dlp lists them,
+    using the yt_dlp library in-process if it is installed and the yt-dlp
+    command otherwise
+
+    Args:
+        playlist_url (str): YouTube playlist URL
+
+    Yields:
+        dict: Video dictionary with title, id and url
+
+    Raises:
+        PlaylistExtractionError: If the playlist cannot be listed
+    """
+    try:
+        import yt_dlp  # noqa: F401
+    except ImportError:
+        videos = _iter_playlist_videos_subprocess(playlist_url)
+    else:
+        videos = _iter_playlist_videos_in_process(playlist_url)
+
+    # Only the time spent waiting on yt-dlp counts, not the time the caller
+    # spends on each video between two of them
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                video = next(videos)
+            except StopIteration:
+                break
+            finally:
+                elapsed += time.perf_counter() - start
+            yield video
+    finally:
+        videos.close()
+        STAGE_SECONDS.observe(elapsed, stage="playlist_listing")
+
+
+def get_video_duration(video_url):
+    """
+    Look up the length of a video with yt-dlp
+
+    Args:
+        video_url (str): YouTube video URL
+
+    Returns:
+        int: Duration in seconds, or None if it cannot be determined
+    """
+    try:
+        import yt_dlp
+    except ImportError:
+        try:
+            result = subprocess.run(
+                ["yt-dlp", "--skip-download", "--print", "%(duration)s", video_url],
+                capture_output=True,
+                text=True,
+                timeout=60,
+            )
+            return int(float(result.stdout.strip()))
+        except (OSError, subprocess.SubprocessError, ValueError) as e:
+            print(f"Could not get duration of {video_url}: {str(e)}")
+            return None
+
+    options = {"quiet": True, "no_warnings": True, "skip_download": True}
+
+    try:
+        with yt_dlp.YoutubeDL(options) as ydl:
+            info = ydl.extract_info(video_url, download=False, process=False)
+        return int(info["duration"])
+    except Exception as e:
+        print(f"Could not get duration of {video_url}: {str(e)}")
+        return None
+
 
 def extract_playlist_videos_ytdlp(playlist_url):
     """
@@ -21,52 +225,253 @@ def extract_playlist_videos_ytdlp(playlist_url):
         or dict: Error message if something fails
     """
     try:
-        # Create a temporary file to store the URLs
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as temp_file:
-            temp_path = temp_file.name
-
-        # Extract URLs using yt-dlp
-        cmd = [
-            "yt-dlp",
-            "--flat-playlist",
-            "-i",
-            "--print-to-file",
-            "url,title",
-            temp_path,
-            playlist_url,
-        ]
-        process = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        return list(iter_playlist_videos_ytdlp(playlist_url))
+    except PlaylistExtractionError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        return {"error": f"Error extracting playlist: {str(e)}"}
 
-        if process.returncode != 0:
-            return {"error": f"yt-dlp error: {process.stderr}"}
-
-        # Read the temporary file
-        videos = []
-        with open(temp_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        # Process in pairs (url, title)
-        for i in range(0, len(lines), 2):
-            if i + 1 < len(lines):
-                url = lines[i].strip()
-                title = lines[i + 1].strip()
-
-                # Extract video ID from URL
-                video_id = (
-                    url.split("v=")[-1].split("&")[0]
-                    if "v=" in url
-                    else url.split("/")[-1]
+
+def get_playlist_id(playlist_url):
+    """
+    Extract the playlist ID from a YouTube playlist URL
+
+    Args:
+        playlist_url (str): YouTube playlist URL
+
+    Returns:
+        str: Playlist ID, or "playlist" if the URL has none
+    """
+    if "list=" in playlist_url:
+        return playlist_url.split("list=")[1].split("&")[0]
+
+    return "playlist"
+
+
+def load_playlist_snapshot(playlist_url):
+    """
+    Load the last saved membership of a playlist
+
+    Args:
+        playlist_url (str): YouTube playlist URL
+
+    Returns:
+        dict: {"playlist_url", "fetched_at", "videos"} or None if never fetched
+    """
+    playlist = Playlist.objects.filter(
+        playlist_id=get_playlist_id(playlist_url), fetched_at__isnull=False
+    ).first()
+
+    if playlist is None:
+        return None
+
+    memberships = (
+        playlist.memberships.filter(removed_at__isnull=True)
+        .select_related("video")
+        .order_by("position")
+    )
+
+    return {
+        "playlist_url": playlist.url,
+        "fetched_at": playlist.fetched_at.timestamp(),
+        "videos": [membership.video.as_dict() for membership in memberships],
+    }
+
+
+def save_videos(videos):
+    """
+    Create or update the Video rows of a list of video dictionaries
+
+    Args:
+        videos (list): List of video dictionaries
+
+    Returns:
+        dict: Video rows by video ID
+    """
+    videos = {video["id"]: video for video in videos}
+    rows = Video.objects.in_bulk(list(videos), field_name="video_id")
+
+    new_rows = []
+    changed_rows = []
+    for video_id, video in videos.items():
+        row = rows.get(video_id)
+        if row is None:
+            new_rows.append(
+                Video(
+                    video_id=video_id,
+                    url=video["url"],
+                    title=video.get("title") or "",
+                    duration=video.get("duration"),
                 )
+            )
+        elif row.title != (video.get("title") or row.title) or (
+            video.get("duration") is not None and row.duration != video["duration"]
+        ):
+            row.title = video.get("title") or row.title
+            row.duration = video.get("duration", row.duration)
+            changed_rows.append(row)
 
-                videos.append({"title": title, "id": video_id, "url": url})
+    Video.objects.bulk_create(new_rows, ignore_conflicts=True)
+    Video.objects.bulk_update(changed_rows, ["title", "duration"])
+
+    return Video.objects.in_bulk(list(videos), field_name="video_id")
+
+
+def save_playlist_snapshot(playlist_url, videos):
+    """
+    Save the current membership of a playlist. An empty listing is not
+    saved: yt-dlp lists nothing for some URLs it cannot resolve, which can't
+    be told apart from a playlist that was emptied, and saving it would mark
+    every video as removed.
+
+    Args:
+        playlist_url (str): YouTube playlist URL
+        videos (list): List of video dictionaries
+
+    Returns:
+        bool: Whether the snapshot was saved
+    """
+    if not videos:
+        return False
 
-        # Clean up the temporary file
-        os.unlink(temp_path)
+    now = timezone.now()
 
+    with transaction.atomic():
+        playlist, _ = Playlist.objects.update_or_create(
+            playlist_id=get_playlist_id(playlist_url),
+            defaults={"url": playlist_url, "fetched_at": now},
+        )
+        rows = save_videos(videos)
+
+        memberships = {
+            membership.video_id: membership
+            for membership in playlist.memberships.all()
+        }
+
+        new_memberships = []
+        changed_memberships = []
+        current = set()
+        for position, video in enumerate(videos, 1):
+            row = rows[video["id"]]
+            if row.pk in current:
+                # A video listed twice keeps its first position
+                continue
+            current.add(row.pk)
+
+            membership = memberships.get(row.pk)
+            if membership is None:
+                new_memberships.append(
+                    PlaylistMembership(playlist=playlist, video=row, position=position)
+                )
+            elif membership.position != position or membership.removed_at is not None:
+                membership.position = position
+                membership.removed_at = None
+                changed_memberships.append(membership)
+
+        PlaylistMembership.objects.bulk_create(new_memberships)
+        PlaylistMembership.objects.bulk_update(
+            changed_memberships, ["position", "removed_at"]
+        )
+        playlist.memberships.filter(removed_at__isnull=True).exclude(
+            video_id__in=current
+        ).update(removed_at=now)
+
+    return True
+
+
+def get_playlist_videos(playlist_url, max_age=None):
+    """
+    Get the videos of a playlist, reusing the saved snapshot while it is fresh
+
+    Args:
+        playlist_url (str): YouTube playlist URL
+        max_age (float): Maximum snapshot age in seconds, defaults to
+            settings.PLAYLIST_CACHE_TTL; 0 always fetches the playlist again
+
+    Returns:
+        list: List of video dictionaries with title and url
+        or dict: Error message if something fails
+    """
+    if max_age is None:
+        max_age = settings.PLAYLIST_CACHE_TTL
+
+    snapshot = load_playlist_snapshot(playlist_url)
+    if snapshot and time.time() - snapshot["fetched_at"] < max_age:
+        return snapshot["videos"]
+
+    videos = extract_playlist_videos_ytdlp(playlist_url)
+
+    if isinstance(videos, list):
+        save_playlist_snapshot(playlist_url, videos)
+
+    return videos
+
+
+def iter_playlist_videos(playlist_url, max_age=None):
+    """
+    Yield the videos of a playlist, from the saved snapshot while it is fresh,
+    otherwise as yt-dlp lists them. A complete listing is saved as the new
+    snapshot.
+
+    Args:
+        playlist_url (str): YouTube playlist URL
+        max_age (float): Maximum snapshot age in seconds, defaults to
+            settings.PLAYLIST_CACHE_TTL
+
+    Yields:
+        dict: Video dictionary with title, id and url
+
+    Raises:
+        PlaylistExtractionError: If the playlist cannot be listed
+    """
+    if max_age is None:
+        max_age = settings.PLAYLIST_CACHE_TTL
+
+    snapshot = load_playlist_snapshot(playlist_url)
+    if snapshot and time.time() - snapshot["fetched_at"] < max_age:
+        yield from snapshot["videos"]
+        return
+
+    videos = []
+    for video in iter_playlist_videos_ytdlp(playlist_url):
+        videos.append(video)
+        yield video
+
+    save_playlist_snapshot(playlist_url, videos)
+
+
+def refresh_playlist_videos(playlist_url):
+    """
+    Fetch a playlist again and compare it with the saved snapshot
+
+    Args:
+        playlist_url (str): YouTube playlist URL
+
+    Returns:
+        dict: {"videos": [...], "added": [...], "removed": [...]} where added and
+            removed are video dictionaries, or error message if something fails
+    """
+    snapshot = load_playlist_snapshot(playlist_url)
+    videos = extract_playlist_videos_ytdlp(playlist_url)
+
+    if isinstance(videos, dict) and "error" in videos:
         return videos
 
-    except Exception as e:
-        return {"error": f"Error extracting playlist: {str(e)}"}
+    if not videos:
+        return {"error": "yt-dlp listed no videos, the saved playlist was kept"}
+
+    previous = {video["id"]: video for video in snapshot["videos"]} if snapshot else {}
+    current_ids = {video["id"] for video in videos}
+
+    save_playlist_snapshot(playlist_url, videos)
+
+    return {
+        "videos": videos,
+        "added": [video for video in videos if video["id"] not in previous],
+        "removed": [
+            video for video_id, video in previous.items() if video_id not in current_ids
+        ],
+    }
 
 
 def save_to_text_file(videos, filename):
@@ -97,7 +502,8 @@ def get_playlist_links_to_file(request):
 
     Request (POST JSON):
         {
-            "playlist_url": "https://www.youtube.com/playlist?list=PLAYLIST_ID"
+            "playlist_url": "https://www.youtube.com/playlist?list=PLAYLIST_ID",
+            "refresh": true/false (optional, default: false, ignore the cached playlist)
         }
 
     Response:
@@ -119,13 +525,12 @@ def get_playlist_links_to_file(request):
             return JsonResponse({"error": "Missing playlist_url parameter"}, status=400)
 
         # Extract playlist ID for filename
-        if "list=" in playlist_url:
-            playlist_id = playlist_url.split("list=")[1].split("&")[0]
-        else:
-            playlist_id = "playlist"
+        playlist_id = get_playlist_id(playlist_url)
 
         # Get videos from the playlist
-        videos = extract_playlist_videos_ytdlp(playlist_url)
+        videos = get_playlist_videos(
+            playlist_url, max_age=0 if data.get("refresh", False) else None
+        )
 
         if isinstance(videos, dict) and "error" in videos:
             return JsonResponse(videos, status=400)
@@ -155,7 +560,8 @@ def get_playlist_links_as_json(request):
 
     Request (POST JSON):
         {
-            "playlist_url": "https://www.youtube.com/playlist?list=PLAYLIST_ID"
+            "playlist_url": "https://www.youtube.com/playlist?list=PLAYLIST_ID",
+            "refresh": true/false (optional, default: false, ignore the cached playlist)
         }
 
     Response:
@@ -180,7 +586,9 @@ def get_playlist_links_as_json(request):
             return JsonResponse({"error": "Missing playlist_url parameter"}, status=400)
 
         # Get videos from the playlist
-        videos = extract_playlist_videos_ytdlp(playlist_url)
+        videos = get_playlist_videos(
+            playlist_url, max_age=0 if data.get("refresh", False) else None
+        )
 
         if isinstance(videos, dict) and "error" in videos:
             return JsonResponse(videos, status=400)
@@ -193,3 +601,53 @@ def get_playlist_links_as_json(request):
         return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
+
+
+@csrf_exempt
+def get_playlist_changes(request):
+    """
+    API endpoint that fetches a playlist again and reports the videos added or
+    removed since it was last fetched
+
+    Request (POST JSON):
+        {
+            "playlist_url": "https://www.youtube.com/playlist?list=PLAYLIST_ID"
+        }
+
+    Response:
+        {
+            "success": true/false,
+            "added": [{"title": "Video Title", "id": "videoId", "url": "..."}, ...],
+            "removed": [{"title": "Video Title", "id": "videoId", "url": "..."}, ...],
+            "video_count": 42,
+            "error": "Error message if any"
+        }
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Only POST method is allowed"}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        playlist_url = data.get("playlist_url")
+
+        if not playlist_url:
+            return JsonResponse({"error": "Missing playlist_url parameter"}, status=400)
+
+        changes = refresh_playlist_videos(playlist_url)
+
+        if "error" in changes:
+            return JsonResponse(changes, status=400)
+
+        return JsonResponse(
+            {
+                "success": True,
+                "added": changes["added"],
+                "removed": changes["removed"],
+                "video_count": len(changes["videos"]),
+            }
+        )
+
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
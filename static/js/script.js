@@ -113,11 +113,16 @@ document.addEventListener('DOMContentLoaded', function () {
         const requestData = {
             video_url: videoUrl,
             style: style,
-            save_to_file: true
+            save_to_file: true,
+            stream: true
         };
 
         console.log('Sending video summary request:', requestData);
 
+        // Partial output is shown as soon as the first chunk arrives
+        summaryData = { transcript: '', summary: '' };
+        let showingResults = false;
+
         fetch('/api/summarize/video/', {
             method: 'POST',
             headers: {
@@ -130,17 +135,31 @@ document.addEventListener('DOMContentLoaded', function () {
                 if (!response.ok) {
                     throw new Error('Network response was not ok');
                 }
-                return response.json();
-            })
-            .then(data => {
-                console.log('Summary data received:', data);
-                summaryData = data;
-                displayResults(data);
-                document.getElementById('loading-step').classList.remove('active');
-                document.getElementById('result-step').classList.add('active');
+                return readEventStream(response, (event, data) => {
+                    if (event === 'chunk') {
+                        summaryData[data.section] += data.text;
+                        displayResults(summaryData);
+
+                        if (!showingResults) {
+                            showingResults = true;
+                            document.getElementById('loading-step').classList.remove('active');
+                            document.getElementById('result-step').classList.add('active');
+                        }
+                    } else if (event === 'complete') {
+                        console.log('Summary data received:', data);
+                        summaryData = data;
+                        displayResults(data);
+                        document.getElementById('loading-step').classList.remove('active');
+                        document.getElementById('result-step').classList.add('active');
+                    } else if (event === 'error') {
+                        throw new Error(data.error);
+                    }
+                });
             })
             .catch(error => {
                 console.error('Error:', error);
+                document.getElementById('result-step').classList.remove('active');
+                document.getElementById('loading-step').classList.add('active');
                 document.getElementById('loading-message').textContent = 'Error: ' + error.message;
                 setTimeout(() => {
                     document.getElementById('loading-step').classList.remove('active');
@@ -160,7 +179,8 @@ document.addEventListener('DOMContentLoaded', function () {
 
         console.log('Sending playlist summary request:', requestData);
 
-        fetch('/api/summarize/playlist/', {
+        // Stream per-video results so they can be shown as soon as each one is ready
+        fetch('/api/summarize/playlist/stream/', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -172,14 +192,7 @@ document.addEventListener('DOMContentLoaded', function () {
                 if (!response.ok) {
                     throw new Error('Network response was not ok');
                 }
-                return response.json();
-            })
-            .then(data => {
-                console.log('Playlist data received:', data);
-                summaryData = data;
-                displayPlaylistResults(data);
-                document.getElementById('loading-step').classList.remove('active');
-                document.getElementById('result-step').classList.add('active');
+                return readEventStream(response, handlePlaylistEvent);
             })
             .catch(error => {
                 console.error('Error:', error);
@@ -191,6 +204,60 @@ document.addEventListener('DOMContentLoaded', function () {
             });
     }
 
+    function handlePlaylistEvent(event, data) {
+        if (event === 'start') {
+            console.log('Playlist stream started:', data);
+            summaryData = { playlist_info: data.playlist_info, summaries: [] };
+            displayPlaylistResults(summaryData);
+            document.getElementById('loading-step').classList.remove('active');
+            document.getElementById('result-step').classList.add('active');
+        } else if (event === 'listed') {
+            summaryData.playlist_info.video_count = data.video_count;
+            document.getElementById('playlist-video-count').textContent = data.video_count;
+        } else if (event === 'video') {
+            summaryData.summaries.push(data);
+            appendPlaylistVideo(data, data.index - 1, summaryData.playlist_info);
+        } else if (event === 'complete') {
+            console.log('Playlist data received:', data);
+            summaryData.combined_file = data.combined_file;
+            summaryData.summaries.sort((a, b) => a.index - b.index);
+        } else if (event === 'error') {
+            throw new Error(data.error);
+        }
+    }
+
+    // Read a text/event-stream response body, calling onEvent(event, data) for each event
+    async function readEventStream(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+
+            let separatorIndex;
+            while ((separatorIndex = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.substring(0, separatorIndex);
+                buffer = buffer.substring(separatorIndex + 2);
+
+                let event = 'message';
+                let data = '';
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event: ')) {
+                        event = line.substring(7);
+                    } else if (line.startsWith('data: ')) {
+                        data += line.substring(6);
+                    }
+                });
+
+                onEvent(event, data ? JSON.parse(data) : null);
+            }
+        }
+    }
+
     function displayResults(data) {
         // Display summary
         const summaryContent = document.getElementById('summary-content');
@@ -219,7 +286,7 @@ document.addEventListener('DOMContentLoaded', function () {
         // Display combined summary in summary tab
         const summaryContent = document.getElementById('summary-content');
         summaryContent.innerHTML = `<h3>Playlist: ${playlistInfo.url}</h3>
-                                   <p>Total videos: ${playlistInfo.video_count}</p>
+                                   <p>Total videos: <span id="playlist-video-count">${playlistInfo.video_count ?? 'counting...'}</span></p>
                                    <p>Summary style: ${playlistInfo.style}</p>
                                    <p>See individual video summaries in the "All Videos" tab.</p>`;
 
@@ -244,129 +311,137 @@ document.addEventListener('DOMContentLoaded', function () {
             fetchAllVideoSummaries(summaries);
         });
 
-        summaries.forEach((video, index) => {
-            const videoElement = document.createElement('div');
-            videoElement.className = `playlist-video-item ${video.success ? 'success' : 'error'}`;
-            videoElement.setAttribute('data-video-id', video.video_id);
-
-            let videoHtml = `
-                <h3>${index + 1}. ${video.title}</h3>
-                <p>Video ID: ${video.video_id}</p>
-            `;
-
-            if (video.success) {
-                // Check if we have the actual summary content
-                if (video.summary) {
-                    // We already have the summary content
-                    const summaryPreview = video.summary.substring(0, 100) + '...';
-                    videoHtml += `
-                        <div class="summary-preview">
-                            <p>${summaryPreview}</p>
-                            <button class="btn btn-secondary view-full-summary">View Full Summary</button>
-                        </div>
-                        <div class="full-summary" style="display: none;">
-                            <p>${formatContent(video.summary)}</p>
-                            <button class="btn btn-secondary hide-full-summary">Collapse</button>
-                        </div>
-                    `;
-                } else if (video.file_path) {
-                    // We have a file path but need to fetch content
-                    videoHtml += `
-                        <p class="summary-status">Summary available</p>
-                        <button class="btn btn-secondary load-summary" data-video-id="${video.video_id}">Load Summary</button>
-                    `;
-                } else {
-                    videoHtml += `<p class="summary-status">Summary information incomplete</p>`;
-                }
+        summaries.forEach((video, index) => appendPlaylistVideo(video, index, playlistInfo));
+    }
+
+    function appendPlaylistVideo(video, index, playlistInfo) {
+        const playlistContent = document.getElementById('playlist-content');
+        const videoElement = document.createElement('div');
+        videoElement.className = `playlist-video-item ${video.success ? 'success' : 'error'}`;
+        videoElement.setAttribute('data-video-id', video.video_id);
+
+        let videoHtml = `
+            <h3>${index + 1}. ${video.title}</h3>
+            <p>Video ID: ${video.video_id}</p>
+        `;
+
+        if (video.success) {
+            // Check if we have the actual summary content
+            if (video.summary) {
+                // We already have the summary content
+                const summaryPreview = video.summary.substring(0, 100) + '...';
+                videoHtml += `
+                    <div class="summary-preview">
+                        <p>${summaryPreview}</p>
+                        <button class="btn btn-secondary view-full-summary">View Full Summary</button>
+                    </div>
+                    <div class="full-summary" style="display: none;">
+                        <p>${formatContent(video.summary)}</p>
+                        <button class="btn btn-secondary hide-full-summary">Collapse</button>
+                    </div>
+                `;
+            } else if (video.file_path) {
+                // We have a file path but need to fetch content
+                videoHtml += `
+                    <p class="summary-status">Summary available</p>
+                    <button class="btn btn-secondary load-summary" data-video-id="${video.video_id}">Load Summary</button>
+                `;
             } else {
-                videoHtml += `<p class="error-message">Error: ${video.error || 'Unknown error'}</p>`;
+                videoHtml += `<p class="summary-status">Summary information incomplete</p>`;
             }
+        } else {
+            videoHtml += `<p class="error-message">Error: ${video.error || 'Unknown error'}</p>`;
+        }
 
-            videoElement.innerHTML = videoHtml;
-            playlistContent.appendChild(videoElement);
-            
-            // Add event listeners for summary expansion buttons
-            const viewFullBtn = videoElement.querySelector('.view-full-summary');
-            const hideFullBtn = videoElement.querySelector('.hide-full-summary');
-            const loadSummaryBtn = videoElement.querySelector('.load-summary');
-            
-            if (viewFullBtn) {
-                viewFullBtn.addEventListener('click', function() {
-                    const summaryPreview = this.parentNode;
-                    const fullSummary = summaryPreview.nextElementSibling;
-                    
-                    summaryPreview.style.display = 'none';
-                    fullSummary.style.display = 'block';
-                });
-            }
-            
-            if (hideFullBtn) {
-                hideFullBtn.addEventListener('click', function() {
-                    const fullSummary = this.parentNode;
-                    const summaryPreview = fullSummary.previousElementSibling;
-                    
-                    fullSummary.style.display = 'none';
-                    summaryPreview.style.display = 'block';
-                });
-            }
-            
-            if (loadSummaryBtn) {
-                loadSummaryBtn.addEventListener('click', function() {
-                    const videoId = this.getAttribute('data-video-id');
-                    const statusElement = this.previousElementSibling;
-                    const buttonElement = this;
-                    
-                    // Change status while loading
-                    statusElement.textContent = 'Loading summary...';
-                    buttonElement.disabled = true;
-                    
-                    // Fetch the individual video summary
-                    fetchVideoSummaryContent(videoId, playlistInfo.style)
-                        .then(summaryContent => {
-                            // Replace the entire content of the video item
-                            const videoContainer = buttonElement.closest('.playlist-video-item');
-                            const title = videoContainer.querySelector('h3').textContent;
-                            const idText = videoContainer.querySelector('p').textContent;
-                            
-                            const summaryPreview = summaryContent.substring(0, 100) + '...';
-                            videoContainer.innerHTML = `
-                                <h3>${title}</h3>
-                                <p>${idText}</p>
-                                <div class="summary-preview">
-                                    <p>${summaryPreview}</p>
-                                    <button class="btn btn-secondary view-full-summary">View Full Summary</button>
-                                </div>
-                                <div class="full-summary" style="display: none;">
-                                    <p>${formatContent(summaryContent)}</p>
-                                    <button class="btn btn-secondary hide-full-summary">Collapse</button>
-                                </div>
-                            `;
-                            
-                            // Re-attach event listeners
-                            const newViewBtn = videoContainer.querySelector('.view-full-summary');
-                            const newHideBtn = videoContainer.querySelector('.hide-full-summary');
-                            
-                            newViewBtn.addEventListener('click', function() {
-                                const preview = this.parentNode;
-                                const full = preview.nextElementSibling;
-                                preview.style.display = 'none';
-                                full.style.display = 'block';
-                            });
-                            
-                            newHideBtn.addEventListener('click', function() {
-                                const full = this.parentNode;
-                                const preview = full.previousElementSibling;
-                                full.style.display = 'none';
-                                preview.style.display = 'block';
-                            });
-                        })
-                        .catch(error => {
-                            statusElement.textContent = 'Error loading summary: ' + error.message;
-                            buttonElement.disabled = false;
+        videoElement.innerHTML = videoHtml;
+        videoElement.setAttribute('data-index', index);
+
+        // Streamed results arrive out of order, so keep the list in playlist order
+        const nextElement = Array.from(playlistContent.querySelectorAll('.playlist-video-item'))
+            .find(element => parseInt(element.getAttribute('data-index'), 10) > index);
+        playlistContent.insertBefore(videoElement, nextElement || null);
+        
+        // Add event listeners for summary expansion buttons
+        const viewFullBtn = videoElement.querySelector('.view-full-summary');
+        const hideFullBtn = videoElement.querySelector('.hide-full-summary');
+        const loadSummaryBtn = videoElement.querySelector('.load-summary');
+        
+        if (viewFullBtn) {
+            viewFullBtn.addEventListener('click', function() {
+                const summaryPreview = this.parentNode;
+                const fullSummary = summaryPreview.nextElementSibling;
+                
+                summaryPreview.style.display = 'none';
+                fullSummary.style.display = 'block';
+            });
+        }
+        
+        if (hideFullBtn) {
+            hideFullBtn.addEventListener('click', function() {
+                const fullSummary = this.parentNode;
+                const summaryPreview = fullSummary.previousElementSibling;
+                
+                fullSummary.style.display = 'none';
+                summaryPreview.style.display = 'block';
+            });
+        }
+        
+        if (loadSummaryBtn) {
+            loadSummaryBtn.addEventListener('click', function() {
+                const videoId = this.getAttribute('data-video-id');
+                const statusElement = this.previousElementSibling;
+                const buttonElement = this;
+                
+                // Change status while loading
+                statusElement.textContent = 'Loading summary...';
+                buttonElement.disabled = true;
+                
+                // Fetch the individual video summary
+                fetchVideoSummaryContent(videoId, playlistInfo.style)
+                    .then(summaryContent => {
+                        // Replace the entire content of the video item
+                        const videoContainer = buttonElement.closest('.playlist-video-item');
+                        const title = videoContainer.querySelector('h3').textContent;
+                        const idText = videoContainer.querySelector('p').textContent;
+                        
+                        const summaryPreview = summaryContent.substring(0, 100) + '...';
+                        videoContainer.innerHTML = `
+                            <h3>${title}</h3>
+                            <p>${idText}</p>
+                            <div class="summary-preview">
+                                <p>${summaryPreview}</p>
+                                <button class="btn btn-secondary view-full-summary">View Full Summary</button>
+                            </div>
+                            <div class="full-summary" style="display: none;">
+                                <p>${formatContent(summaryContent)}</p>
+                                <button class="btn btn-secondary hide-full-summary">Collapse</button>
+                            </div>
+                        `;
+                        
+                        // Re-attach event listeners
+                        const newViewBtn = videoContainer.querySelector('.view-full-summary');
+                        const newHideBtn = videoContainer.querySelector('.hide-full-summary');
+                        
+                        newViewBtn.addEventListener('click', function() {
+                            const preview = this.parentNode;
+                            const full = preview.nextElementSibling;
+                            preview.style.display = 'none';
+                            full.style.display = 'block';
                         });
-                });
-            }
-        });
+                        
+                        newHideBtn.addEventListener('click', function() {
+                            const full = this.parentNode;
+                            const preview = full.previousElementSibling;
+                            full.style.display = 'none';
+                            preview.style.display = 'block';
+                        });
+                    })
+                    .catch(error => {
+                        statusElement.textContent = 'Error loading summary: ' + error.message;
+                        buttonElement.disabled = false;
+                    });
+            });
+        }
     }
     
     // Function to fetch summary content from a file
@@ -409,75 +484,72 @@ document.addEventListener('DOMContentLoaded', function () {
     async function fetchAllVideoSummaries(videos) {
         const playlistContent = document.getElementById('playlist-content');
         const fetchAllButton = playlistContent.querySelector('.fetch-all-summaries');
-        
+
+        // Skip errors or already loaded summaries
+        const pendingVideos = videos.filter(video => video.success && !video.summary);
+        const style = (pendingVideos[0] && pendingVideos[0].style) || 'detailed';
+
+        const findVideoElement = videoId =>
+            playlistContent.querySelector(`.playlist-video-item[data-video-id="${videoId}"]`);
+
+        pendingVideos.forEach(video => {
+            const videoElement = findVideoElement(video.video_id);
+            if (!videoElement) return;
+
+            const statusElement = videoElement.querySelector('.summary-status');
+            const loadButton = videoElement.querySelector('.load-summary');
+            if (statusElement) statusElement.textContent = 'Loading summary...';
+            if (loadButton) loadButton.disabled = true;
+        });
+
         try {
-            // Process videos sequentially to avoid overwhelming the API
-            for (const video of videos) {
-                if (!video.success || video.summary) continue; // Skip errors or already loaded summaries
-                
-                const videoElement = playlistContent.querySelector(`.playlist-video-item[data-video-id="${video.video_id}"]`);
-                if (!videoElement) continue;
-                
-                const statusElement = videoElement.querySelector('.summary-status');
-                const loadButton = videoElement.querySelector('.load-summary');
-                
-                if (statusElement) statusElement.textContent = 'Loading summary...';
-                if (loadButton) loadButton.disabled = true;
-                
-                try {
-                    const summaryContent = await fetchVideoSummaryContent(video.video_id, video.style);
-                    
-                    // Update the video element with the fetched summary
-                    const title = videoElement.querySelector('h3').textContent;
-                    const idText = videoElement.querySelector('p').textContent;
-                    
-                    const summaryPreview = summaryContent.substring(0, 100) + '...';
-                    videoElement.innerHTML = `
-                        <h3>${title}</h3>
-                        <p>${idText}</p>
-                        <div class="summary-preview">
-                            <p>${summaryPreview}</p>
-                            <button class="btn btn-secondary view-full-summary">View Full Summary</button>
-                        </div>
-                        <div class="full-summary" style="display: none;">
-                            <p>${formatContent(summaryContent)}</p>
-                            <button class="btn btn-secondary hide-full-summary">Collapse</button>
-                        </div>
-                    `;
-                    
-                    // Re-attach event listeners
-                    const newViewBtn = videoElement.querySelector('.view-full-summary');
-                    const newHideBtn = videoElement.querySelector('.hide-full-summary');
-                    
-                    newViewBtn.addEventListener('click', function() {
-                        const preview = this.parentNode;
-                        const full = preview.nextElementSibling;
-                        preview.style.display = 'none';
-                        full.style.display = 'block';
-                    });
-                    
-                    newHideBtn.addEventListener('click', function() {
-                        const full = this.parentNode;
-                        const preview = full.previousElementSibling;
-                        full.style.display = 'none';
-                        preview.style.display = 'block';
-                    });
-                    
-                } catch (error) {
-                    if (statusElement) statusElement.textContent = 'Error loading summary: ' + error.message;
-                    if (loadButton) loadButton.disabled = false;
+            if (pendingVideos.length > 0) {
+                // One request for the whole playlist: the server answers cached
+                // summaries at once and generates the rest in parallel
+                const response = await fetch('/api/summarize/video/batch/', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': getCookie('csrftoken')
+                    },
+                    body: JSON.stringify({
+                        videos: pendingVideos.map(video => video.video_id),
+                        style: style,
+                        stream: true
+                    })
+                });
+
+                if (!response.ok) {
+                    throw new Error(`Failed to fetch summaries (status ${response.status})`);
                 }
-                
-                // Add a small delay between requests to avoid overwhelming the API
-                await new Promise(resolve => setTimeout(resolve, 500));
+
+                await readEventStream(response, (event, data) => {
+                    if (event !== 'video') return;
+
+                    const videoElement = findVideoElement(data.video_id);
+                    if (!videoElement) return;
+
+                    if (data.success) {
+                        const summaryContent = data.summaries[style] || 'No summary content available.';
+                        showLoadedSummary(videoElement, summaryContent);
+                        pendingVideos
+                            .filter(video => video.video_id === data.video_id)
+                            .forEach(video => { video.summary = summaryContent; });
+                    } else {
+                        const statusElement = videoElement.querySelector('.summary-status');
+                        const loadButton = videoElement.querySelector('.load-summary');
+                        if (statusElement) statusElement.textContent = 'Error loading summary: ' + Object.values(data.errors).join(', ');
+                        if (loadButton) loadButton.disabled = false;
+                    }
+                });
             }
-            
+
             // Update the fetch all button
             if (fetchAllButton) {
                 fetchAllButton.textContent = 'All Summaries Loaded';
                 fetchAllButton.disabled = true;
             }
-            
+
         } catch (error) {
             console.error('Error fetching all summaries:', error);
             if (fetchAllButton) {
@@ -487,6 +559,44 @@ document.addEventListener('DOMContentLoaded', function () {
         }
     }
 
+    // Replace a playlist video's status with its summary
+    function showLoadedSummary(videoElement, summaryContent) {
+        const title = videoElement.querySelector('h3').textContent;
+        const idText = videoElement.querySelector('p').textContent;
+
+        const summaryPreview = summaryContent.substring(0, 100) + '...';
+        videoElement.innerHTML = `
+            <h3>${title}</h3>
+            <p>${idText}</p>
+            <div class="summary-preview">
+                <p>${summaryPreview}</p>
+                <button class="btn btn-secondary view-full-summary">View Full Summary</button>
+            </div>
+            <div class="full-summary" style="display: none;">
+                <p>${formatContent(summaryContent)}</p>
+                <button class="btn btn-secondary hide-full-summary">Collapse</button>
+            </div>
+        `;
+
+        // Re-attach event listeners
+        const newViewBtn = videoElement.querySelector('.view-full-summary');
+        const newHideBtn = videoElement.querySelector('.hide-full-summary');
+
+        newViewBtn.addEventListener('click', function() {
+            const preview = this.parentNode;
+            const full = preview.nextElementSibling;
+            preview.style.display = 'none';
+            full.style.display = 'block';
+        });
+
+        newHideBtn.addEventListener('click', function() {
+            const full = this.parentNode;
+            const preview = full.previousElementSibling;
+            full.style.display = 'none';
+            preview.style.display = 'block';
+        });
+    }
+
     function formatContent(content) {
         if (!content) return '<p class="text-muted">No content available.</p>';
 
@@ -1,3 +1,25 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Run, Summary, Transcript
+
+
+@admin.register(Transcript)
+class TranscriptAdmin(admin.ModelAdmin):
+    list_display = ("video", "model_name", "updated_at")
+    raw_id_fields = ("video",)
+    search_fields = ("video__video_id", "video__title")
+
+
+@admin.register(Summary)
+class SummaryAdmin(admin.ModelAdmin):
+    list_display = ("video", "style", "model_name", "prompt_version", "updated_at")
+    list_filter = ("style", "model_name", "prompt_version")
+    raw_id_fields = ("video",)
+    search_fields = ("video__video_id", "video__title")
+
+
+@admin.register(Run)
+class RunAdmin(admin.ModelAdmin):
+    list_display = ("job_id", "playlist_url", "style", "status", "done", "failed", "created_at")
+    list_filter = ("status", "style")
+    raw_id_fields = ("playlist",)
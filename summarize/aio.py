@@ -0,0 +1,524 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from django_project.metrics import FALLBACKS, STAGE_SECONDS
+
+from .cache import get_cached_summary
+from .deadline import Deadline, DeadlineExceeded, is_retriable_error
+from .engines import summarize_degraded
+from .gemini import API_KEY_MISSING_ERROR, generate_content_async, get_model
+from .longvideo import summarize_long_video
+from .manifest import RunManifest
+from .ratelimit import get_gemini_limiter
+from .router import AUTO_TIER, route_models, run_with_escalation_async, tier_models
+from .transcripts import summarize_stored_transcript_async
+from .views import (
+    build_detailed_prompt,
+    build_simple_prompt,
+    ensure_youtube_url,
+    extract_video_id_from_url,
+    get_playlist_dir,
+    parse_transcript_and_summary,
+    playlist_video_result,
+    resolve_long_video,
+    resume_playlist_video,
+    store_summary,
+    write_combined_entry,
+    write_combined_header,
+)
+
+# Generations in progress, by (event loop, key). Like summarize/singleflight.py,
+# but for coroutines: concurrent async requests for the same video, style and
+# model tier share one generation. Sync and async requests are not coalesced
+# with each other.
+_flights = {}
+
+
+async def summarize_youtube_video_async(
+    video_input, style="detailed", retries=3, deadline=None, model_name=None
+):
+    """
+    Async version of summarize_youtube_video_with_gemini: the Gemini call and
+    the backoff between attempts don't block the event loop
+
+    Args:
+        video_input (str): YouTube video URL or ID
+        style (str): Summary style
+        retries (int): Number of retry attempts
+        deadline (Deadline): Time budget shared with the caller's other stages
+        model_name (str): Model to use, defaults to settings.GEMINI_MODEL
+
+    Returns:
+        dict: Transcript and summary data or error message
+
+    Raises:
+        DeadlineExceeded: If the time budget runs out
+    """
+    if deadline is None:
+        deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
+
+    try:
+        model = get_model(model_name)
+
+        if model is None:
+            return {"error": API_KEY_MISSING_ERROR, "retriable": False}
+
+        video_url = ensure_youtube_url(video_input)
+        video_id = extract_video_id_from_url(video_url)
+        prompt = build_detailed_prompt(video_url, style)
+
+        for attempt in range(retries):
+            stage = f"detailed prompt attempt {attempt+1}"
+            deadline.check(stage)
+
+            try:
+                print(f"Attempt {attempt+1}/{retries} for video {video_url}")
+
+                response = await generate_content_async(
+                    model, prompt, request_options={"timeout": deadline.remaining()}
+                )
+
+                generated_text = (
+                    response.text if hasattr(response, "text") else str(response)
+                )
+                transcript, summary = parse_transcript_and_summary(generated_text)
+
+                return {
+                    "title": f"Video URL: {video_url}",
+                    "video_id": video_id,
+                    "transcript": transcript,
+                    "summary": summary,
+                    "raw_response": generated_text,
+                    "style": style,
+                    "model": model.model_name,
+                }
+
+            except Exception as e:
+                print(f"Error on attempt {attempt+1}: {str(e)}")
+
+                if deadline.remaining() <= 0:
+                    raise DeadlineExceeded(stage, deadline.budget)
+
+                if not is_retriable_error(e):
+                    return {
+                        "error": f"Error summarizing video: {str(e)}",
+                        "retriable": False,
+                    }
+
+                if attempt < retries - 1:
+                    wait_time = get_gemini_limiter().backoff_delay(attempt)
+                    print(f"Waiting {wait_time:.1f} seconds before retrying...")
+                    await deadline.sleep_async(
+                        wait_time, f"backoff after attempt {attempt+1}"
+                    )
+                else:
+                    return {"error": f"Failed after {retries} attempts: {str(e)}"}
+
+        return {"error": "Failed to generate summary after multiple attempts"}
+
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        import traceback
+
+        traceback.print_exc()
+        return {"error": f"Error summarizing video: {str(e)}"}
+
+
+async def summarize_with_simple_prompt_async(
+    video_input, style="detailed", deadline=None, model_name=None
+):
+    """
+    Async version of summarize_youtube_video_with_simple_prompt
+
+    Returns:
+        dict: Summary data or error message
+
+    Raises:
+        DeadlineExceeded: If the time budget runs out
+    """
+    if deadline is None:
+        deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
+
+    with STAGE_SECONDS.time(stage="simple_prompt_fallback"):
+        try:
+            model = get_model(model_name)
+
+            if model is None:
+                return {"error": API_KEY_MISSING_ERROR, "retriable": False}
+
+            video_url = ensure_youtube_url(video_input)
+            video_id = extract_video_id_from_url(video_url)
+
+            deadline.check("simple prompt fallback")
+            response = await generate_content_async(
+                model,
+                build_simple_prompt(video_url, style),
+                request_options={"timeout": deadline.remaining()},
+            )
+
+            return {
+                "title": f"Video URL: {video_url}",
+                "video_id": video_id,
+                "summary": response.text if hasattr(response, "text") else str(response),
+                "style": style,
+                "model": model.model_name,
+            }
+
+        except Exception as e:
+            if deadline.remaining() <= 0:
+                raise DeadlineExceeded("simple prompt fallback", deadline.budget)
+            return {
+                "error": f"Error with simple prompt: {str(e)}",
+                "retriable": is_retriable_error(e),
+            }
+
+
+async def generate_video_summary_async(
+    video_input, video_id, style, deadline, duration, long_video, model_tier=None
+):
+    """
+    Async version of generate_video_summary. Long videos are still summarized
+    by the thread-based summarize_long_video, in a worker thread.
+    """
+    video_url = ensure_youtube_url(video_input)
+    degraded = sync_to_async(summarize_degraded)
+
+    if settings.DEGRADED_MODE_SECONDS and get_gemini_limiter().rate_limited_within(
+        settings.DEGRADED_MODE_SECONDS
+    ):
+        response_data = await degraded(video_id, style, "Gemini quota exceeded")
+        if response_data is not None:
+            return response_data
+
+    try:
+        models = route_models(style, duration, deadline, model_tier)
+
+        response_data = await run_with_escalation_async(
+            models,
+            style,
+            lambda model_name: summarize_stored_transcript_async(
+                video_url, video_id, style, deadline=deadline, model_name=model_name
+            ),
+        )
+
+        if response_data is not None and "error" in response_data:
+            if not response_data.get("retriable", True):
+                return response_data
+
+            print(
+                f"Summary from stored transcript failed: {response_data['error']}. Processing the video..."
+            )
+            response_data = None
+
+        if response_data is None:
+            # May look the duration up with yt-dlp
+            long_video, duration = await sync_to_async(
+                resolve_long_video, thread_sensitive=False
+            )(video_input, duration, long_video)
+
+            if long_video:
+                response_data = await run_with_escalation_async(
+                    models,
+                    style,
+                    lambda model_name: sync_to_async(
+                        summarize_long_video, thread_sensitive=False
+                    )(
+                        video_url,
+                        duration,
+                        style,
+                        deadline=deadline,
+                        model_name=model_name,
+                    ),
+                )
+            else:
+                response_data = await run_with_escalation_async(
+                    models,
+                    style,
+                    lambda model_name: summarize_youtube_video_async(
+                        video_input, style, deadline=deadline, model_name=model_name
+                    ),
+                )
+
+        if (
+            isinstance(response_data, dict)
+            and "error" in response_data
+            and response_data.get("retriable", True)
+        ):
+            print(
+                f"Detailed method failed: {response_data['error']}. Trying simple approach..."
+            )
+            FALLBACKS.inc(kind="simple_prompt")
+            response_data = await run_with_escalation_async(
+                models,
+                style,
+                lambda model_name: summarize_with_simple_prompt_async(
+                    video_input, style, deadline=deadline, model_name=model_name
+                ),
+            )
+    except DeadlineExceeded as e:
+        print(f"Deadline exceeded for video {video_id}: {str(e)}")
+        return await degraded(video_id, style, str(e)) or {
+            "error": str(e),
+            "deadline_exceeded": True,
+            "stage": e.stage,
+        }
+
+    if isinstance(response_data, dict) and "error" in response_data:
+        if not response_data.get("retriable", True):
+            return response_data
+        return await degraded(video_id, style, response_data["error"]) or response_data
+
+    if isinstance(response_data, dict):
+        await sync_to_async(store_summary)(video_id, style, response_data)
+
+    return response_data
+
+
+async def summarize_video_async(
+    video_input,
+    style="detailed",
+    use_cache=True,
+    deadline=None,
+    duration=None,
+    long_video=None,
+    model_tier=None,
+):
+    """
+    Async version of summarize_video, for async views
+
+    Args:
+        video_input (str): YouTube video URL or ID
+        style (str): Summary style
+        use_cache (bool): Whether to read cached summaries
+        deadline (Deadline): Time budget for all attempts, backoff and the
+            fallback; defaults to settings.SUMMARY_DEADLINE_SECONDS
+        duration (int): Video length in seconds, if known
+        long_video (bool): See summarize_video
+        model_tier (str): See summarize_video
+
+    Returns:
+        dict: Transcript and summary data or error message
+    """
+    if deadline is None:
+        deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
+
+    video_id = extract_video_id_from_url(ensure_youtube_url(video_input))
+
+    if use_cache:
+        cached = await sync_to_async(get_cached_summary)(
+            video_id, style, tier_models(model_tier)
+        )
+        if cached is not None:
+            print(f"Cache hit for video {video_id} ({style})")
+            return {**cached, "cached": True}
+
+    loop = asyncio.get_running_loop()
+    key = (loop, f"{video_id}|{style}|{model_tier or AUTO_TIER}")
+
+    task = _flights.get(key)
+    if task is None:
+        task = loop.create_task(
+            generate_video_summary_async(
+                video_input, video_id, style, deadline, duration, long_video, model_tier
+            )
+        )
+        _flights[key] = task
+        task.add_done_callback(lambda _: _flights.pop(key, None))
+    else:
+        print(f"Waiting for the summary of video {video_id} ({style}) in progress")
+
+    try:
+        # Shielded so a caller that goes away doesn't cancel the generation
+        # for the others waiting on it
+        return await asyncio.wait_for(asyncio.shield(task), deadline.remaining())
+    except asyncio.TimeoutError:
+        e = DeadlineExceeded("waiting for a summary in progress", deadline.budget)
+        return {"error": str(e), "deadline_exceeded": True, "stage": e.stage}
+
+
+async def summarize_playlist_video_async(
+    index, video, style, save_to_file, playlist_dir, manifest, semaphore
+):
+    """
+    Async version of summarize_playlist_video that also records the video in
+    the run manifest
+
+    Args:
+        index (int): 1-based position of the video in the playlist
+        video (dict): Video dictionary with id, url and title
+        style (str): Summary style
+        save_to_file (bool): Whether to save the individual summary
+        playlist_dir (Path): Directory for this playlist's summaries
+        manifest (RunManifest): Checkpoint of this and earlier runs
+        semaphore (asyncio.Semaphore): Limits the videos summarized at once
+
+    Returns:
+        tuple: (summary_result, summary_data)
+    """
+    async with semaphore:
+        resumed = await sync_to_async(resume_playlist_video, thread_sensitive=False)(
+            index, None, video, manifest
+        )
+        if resumed is not None:
+            return resumed
+
+        print(f"Processing video {index}: {video.get('title')}")
+
+        try:
+            summary_data = await summarize_video_async(
+                video.get("url"), style, duration=video.get("duration")
+            )
+        except Exception as e:
+            import traceback
+
+            traceback.print_exc()
+            summary_data = {"error": f"Exception in summarization: {str(e)}"}
+
+        summary_result, summary_data = await sync_to_async(
+            playlist_video_result, thread_sensitive=False
+        )(video, style, summary_data, save_to_file, playlist_dir)
+
+    if summary_result.get("degraded"):
+        # Left pending, so a later run replaces it with a Gemini summary
+        pass
+    elif summary_result["success"]:
+        await sync_to_async(manifest.mark, thread_sensitive=False)(
+            summary_result["video_id"],
+            RunManifest.COMPLETED,
+            file_path=summary_result.get("file_path"),
+            error=None,
+        )
+    else:
+        await sync_to_async(manifest.mark, thread_sensitive=False)(
+            summary_result["video_id"],
+            RunManifest.FAILED,
+            error=summary_result["error"],
+        )
+
+    return summary_result, summary_data
+
+
+def _write_combined_file(combined_file_path, playlist_url, style, results):
+    with open(combined_file_path, "w", encoding="utf-8") as combined_file:
+        write_combined_header(combined_file, playlist_url, style, len(results))
+
+        for index, (summary_result, summary_data) in enumerate(results, 1):
+            write_combined_entry(combined_file, index, summary_result, summary_data)
+
+
+async def process_playlist_async(
+    playlist_url, style="detailed", save_to_file=True, max_concurrency=None, resume=True
+):
+    """
+    Async version of process_playlist. Videos are summarized as coroutines,
+    started while yt-dlp (in a worker thread) is still listing the playlist,
+    and gathered at the end.
+
+    Args:
+        playlist_url (str): YouTube playlist URL
+        style (str): Summary style
+        save_to_file (bool): Whether to save individual summaries
+        max_concurrency (int): Number of videos summarized at once, capped at
+            settings.ASYNC_PLAYLIST_CONCURRENCY. Gemini calls are still limited
+            by the process-wide rate limiter.
+        resume (bool): Reuse videos completed by an earlier run of this playlist
+
+    Returns:
+        dict: Playlist info and per-video results in playlist order, or error message
+    """
+    from get_links_from_playlist.views import (
+        PlaylistExtractionError,
+        get_playlist_id,
+        iter_playlist_videos,
+    )
+
+    if max_concurrency is None:
+        max_concurrency = settings.ASYNC_PLAYLIST_CONCURRENCY
+    max_concurrency = max(1, min(int(max_concurrency), settings.ASYNC_PLAYLIST_CONCURRENCY))
+
+    loop = asyncio.get_running_loop()
+    listed = asyncio.Queue()
+
+    def list_videos():
+        # Hands each video (then None, or the error) to the event loop as yt-dlp lists it
+        try:
+            for video in iter_playlist_videos(playlist_url):
+                loop.call_soon_threadsafe(listed.put_nowait, video)
+        except Exception as e:
+            loop.call_soon_threadsafe(listed.put_nowait, e)
+        loop.call_soon_threadsafe(listed.put_nowait, None)
+
+    listing = asyncio.ensure_future(sync_to_async(list_videos, thread_sensitive=False)())
+
+    # An unreadable playlist is reported before starting
+    video = await listed.get()
+    if isinstance(video, PlaylistExtractionError):
+        return {"error": str(video)}
+    if isinstance(video, Exception):
+        return {"error": f"Error extracting playlist: {str(video)}"}
+
+    playlist_id = get_playlist_id(playlist_url)
+    playlist_dir = await sync_to_async(get_playlist_dir, thread_sensitive=False)(
+        playlist_id
+    )
+    manifest = await sync_to_async(RunManifest, thread_sensitive=False)(
+        playlist_dir, style, load=resume
+    )
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    tasks = []
+    listing_error = None
+
+    try:
+        while video is not None:
+            if isinstance(video, Exception):
+                # Keep the videos listed so far
+                listing_error = str(video)
+                break
+
+            manifest.mark(video["id"], RunManifest.PENDING, save=False)
+            tasks.append(
+                asyncio.ensure_future(
+                    summarize_playlist_video_async(
+                        len(tasks) + 1,
+                        video,
+                        style,
+                        save_to_file,
+                        playlist_dir,
+                        manifest,
+                        semaphore,
+                    )
+                )
+            )
+            video = await listed.get()
+
+        await listing
+        results = await asyncio.gather(*tasks)
+    finally:
+        # If the request is cancelled, don't leave videos being summarized
+        for task in tasks:
+            task.cancel()
+
+    combined_file_path = playlist_dir / f"all_summaries_{style}.txt"
+    await sync_to_async(_write_combined_file, thread_sensitive=False)(
+        combined_file_path, playlist_url, style, results
+    )
+
+    result = {
+        "success": True,
+        "playlist_info": {
+            "url": playlist_url,
+            "id": playlist_id,
+            "video_count": len(tasks),
+            "style": style,
+        },
+        "summaries": [summary_result for summary_result, _ in results],
+        "combined_file": str(combined_file_path),
+    }
+    if listing_error:
+        result["listing_error"] = listing_error
+
+    return result
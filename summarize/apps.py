@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SummarizeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'summarize'
+
+    def ready(self):
+        # Keeps the full-text index in step with deleted summaries
+        from . import search  # noqa: F401
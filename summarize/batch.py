@@ -0,0 +1,138 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+
+from .cache import get_cached_summary
+from .deadline import Deadline
+from .router import tier_models
+from .multistyle import summarize_video_styles
+
+
+def batch_video_result(video_id, results, include_transcript=False):
+    """
+    Combine the per-style results of one video into a batch result
+
+    Args:
+        video_id (str): Canonical YouTube video ID
+        results (dict): Summary data or error message per style
+        include_transcript (bool): Whether to include the transcript
+
+    Returns:
+        dict: {"video_id", "success", "summaries", "cached", "errors"}
+    """
+    errors = {style: data["error"] for style, data in results.items() if "error" in data}
+    result = {
+        "video_id": video_id,
+        "success": not errors,
+        "summaries": {
+            style: data.get("summary", "")
+            for style, data in results.items()
+            if style not in errors
+        },
+        "cached": {
+            style: data.get("cached", False)
+            for style, data in results.items()
+            if style not in errors
+        },
+    }
+
+    if errors:
+        result["errors"] = errors
+
+    if include_transcript:
+        result["transcript"] = next(
+            (data["transcript"] for data in results.values() if data.get("transcript")),
+            "",
+        )
+
+    return result
+
+
+def iter_batch_summaries(
+    video_ids,
+    styles,
+    use_cache=True,
+    max_workers=None,
+    deadline_seconds=None,
+    include_transcript=False,
+):
+    """
+    Summarize many videos in one or more styles. Cached summaries are yielded
+    straight away; the rest are generated concurrently and yielded as each
+    video finishes.
+
+    Args:
+        video_ids (list): Canonical YouTube video IDs, without duplicates
+        styles (list): Summary styles
+        use_cache (bool): Whether to read cached summaries
+        max_workers (int): Number of videos summarized in parallel
+        deadline_seconds (float): Time budget of each video, defaults to
+            settings.SUMMARY_DEADLINE_SECONDS
+        include_transcript (bool): Whether results include the transcript
+
+    Yields:
+        dict: Batch result of one video, see batch_video_result
+    """
+    if max_workers is None:
+        max_workers = settings.PLAYLIST_MAX_WORKERS
+
+    if deadline_seconds is None:
+        deadline_seconds = settings.SUMMARY_DEADLINE_SECONDS
+
+    misses = {}
+    for video_id in video_ids:
+        results = {}
+        if use_cache:
+            for style in styles:
+                cached = get_cached_summary(video_id, style, tier_models())
+                if cached is not None:
+                    results[style] = {**cached, "cached": True}
+
+        if len(results) == len(styles):
+            yield batch_video_result(video_id, results, include_transcript)
+        else:
+            misses[video_id] = results
+
+    if not misses:
+        return
+
+    print(f"Summarizing {len(misses)} uncached videos of a batch of {len(video_ids)}")
+
+    def summarize_missing(video_id, results):
+        missing = [style for style in styles if style not in results]
+        generated = summarize_video_styles(
+            video_id,
+            missing,
+            use_cache=use_cache,
+            deadline=Deadline(deadline_seconds),
+        )
+        return {**results, **generated}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(summarize_missing, video_id, results): video_id
+            for video_id, results in misses.items()
+        }
+
+        try:
+            for future in as_completed(futures):
+                video_id = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    results = {
+                        style: {"error": f"Error summarizing video: {str(e)}"}
+                        for style in styles
+                    }
+
+                # Keep the styles in the order they were asked for
+                yield batch_video_result(
+                    video_id,
+                    {style: results[style] for style in styles},
+                    include_transcript,
+                )
+        finally:
+            # If the consumer stops early (e.g. a streaming client disconnected),
+            # don't start the videos that are still queued
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,336 @@
+import asyncio
+import json
+import math
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client, override_settings
+
+from get_links_from_playlist import views as playlist_views
+
+from . import gemini, ratelimit
+
+# Words the fake model writes its transcripts and summaries from
+_WORDS = (
+    "video explains how the system works step by step with examples and the key "
+    "ideas behind each part of the design including tradeoffs limits and results"
+).split()
+
+
+class FakeUsageMetadata:
+    def __init__(self, prompt_tokens, output_tokens):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+        self.total_token_count = prompt_tokens + output_tokens
+
+
+class FakeResponse:
+    def __init__(self, text, usage_metadata):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class FakeGenerativeModel:
+    """
+    Stand-in for genai.GenerativeModel that answers after a configurable
+    latency and fails a configurable share of calls, without any network
+    access or quota
+
+    Attributes:
+        calls (int): generate_content(_async) calls made to models of this class
+    """
+
+    latency = 0.2
+    jitter = 0.2
+    error_rate = 0.0
+    rate_limit_rate = 0.0
+    transcript_words = 400
+    summary_words = 120
+
+    calls = 0
+    _calls_lock = threading.Lock()
+
+    def __init__(self, model_name, **kwargs):
+        self.model_name = f"models/{model_name}"
+
+    @classmethod
+    def configure(cls, latency, jitter, error_rate, rate_limit_rate):
+        cls.latency = latency
+        cls.jitter = jitter
+        cls.error_rate = error_rate
+        cls.rate_limit_rate = rate_limit_rate
+        cls.calls = 0
+
+    def _delay(self):
+        with self._calls_lock:
+            type(self).calls += 1
+
+        return max(0.0, random.gauss(self.latency, self.latency * self.jitter))
+
+    def _answer(self, prompt):
+        roll = random.random()
+        if roll < self.rate_limit_rate:
+            raise Exception("429 Resource has been exhausted (e.g. check quota).")
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise Exception("500 An internal error has occurred.")
+
+        transcript = " ".join(random.choices(_WORDS, k=self.transcript_words))
+        summary = " ".join(random.choices(_WORDS, k=self.summary_words))
+        text = f"TRANSCRIPT:\n{transcript}\n\nSUMMARY:\n{summary}"
+
+        return text, FakeUsageMetadata(
+            len(prompt) // 4, (self.transcript_words + self.summary_words) * 4 // 3
+        )
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        time.sleep(self._delay())
+        text, usage_metadata = self._answer(prompt)
+
+        if not stream:
+            return FakeResponse(text, usage_metadata)
+
+        # Streamed responses report the usage of the whole response on the last chunk
+        pieces = [text[i : i + 200] for i in range(0, len(text), 200)]
+        return iter(
+            [FakeResponse(piece, None) for piece in pieces[:-1]]
+            + [FakeResponse(pieces[-1], usage_metadata)]
+        )
+
+    async def generate_content_async(self, prompt, **kwargs):
+        await asyncio.sleep(self._delay())
+        text, usage_metadata = self._answer(prompt)
+        return FakeResponse(text, usage_metadata)
+
+
+def fake_playlist_url(run_id, index, video_count):
+    """
+    Returns:
+        str: URL of a fake playlist; the video count is part of its ID
+    """
+    return f"https://www.youtube.com/playlist?list={run_id}P{index}N{video_count}"
+
+
+def fake_playlist_videos(playlist_url, listing_latency):
+    """
+    Stand-in for the yt-dlp listing of a playlist made by fake_playlist_url
+
+    Yields:
+        dict: Video dictionary with title, id, url and duration
+    """
+    playlist_id = playlist_views.get_playlist_id(playlist_url)
+    video_count = int(playlist_id.rsplit("N", 1)[1])
+
+    for position in range(video_count):
+        time.sleep(listing_latency)
+        video_id = f"{playlist_id}-{position}"
+        yield {
+            "title": f"Benchmark video {position + 1}",
+            "id": video_id,
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "duration": 600,
+        }
+
+
+def _reset_gemini_state():
+    with gemini._lock:
+        gemini._configured_key = None
+        gemini._models.clear()
+        gemini._working_models.clear()
+        gemini._unavailable_models.clear()
+    ratelimit._limiter = None
+
+
+@contextmanager
+def offline_environment(listing_latency, keep_rate_limits=False, backoff_base=None):
+    """
+    Point the app at fake Gemini and yt-dlp backends and at a throwaway
+    database, cache and output directory, and undo all of it afterwards
+
+    Args:
+        listing_latency (float): Seconds the fake yt-dlp takes per video
+        keep_rate_limits (bool): Keep the configured Gemini rate limits
+            instead of lifting them
+        backoff_base (float): Overrides settings.GEMINI_BACKOFF_BASE
+    """
+    with ExitStack() as stack:
+        temp_dir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+
+        overrides = {
+            "BASE_DIR": temp_dir,
+            "ALLOWED_HOSTS": ["testserver"],
+            "GEMINI_API_KEY": "benchmark",
+            "CACHES": {
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "summaries": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": str(temp_dir / "summary_cache"),
+                },
+            },
+        }
+        if not keep_rate_limits:
+            overrides["GEMINI_REQUESTS_PER_MINUTE"] = 10**9
+            overrides["GEMINI_TOKENS_PER_MINUTE"] = 10**12
+        if backoff_base is not None:
+            overrides["GEMINI_BACKOFF_BASE"] = backoff_base
+        stack.enter_context(override_settings(**overrides))
+
+        stack.enter_context(
+            mock.patch.object(gemini.genai, "GenerativeModel", FakeGenerativeModel)
+        )
+        stack.enter_context(mock.patch.object(gemini.genai, "configure", lambda **kw: None))
+        stack.enter_context(
+            mock.patch.object(
+                playlist_views,
+                "iter_playlist_videos_ytdlp",
+                lambda playlist_url: fake_playlist_videos(playlist_url, listing_latency),
+            )
+        )
+
+        database = connections.settings["default"]
+        original_name = database["NAME"]
+        connections["default"].close()
+        database["NAME"] = str(temp_dir / "benchmark.sqlite3")
+        _reset_gemini_state()
+
+        try:
+            call_command("migrate", verbosity=0)
+            yield temp_dir
+        finally:
+            connections["default"].close()
+            database["NAME"] = original_name
+            _reset_gemini_state()
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile
+
+    Args:
+        values (list): Numbers
+        fraction (float): e.g. 0.95
+
+    Returns:
+        float: The percentile, or None for no values
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run_requests(requests, concurrency):
+    """
+    Send requests from `concurrency` clients at once
+
+    Args:
+        requests (list): (path, body) pairs to POST as JSON
+        concurrency (int): Number of clients
+
+    Returns:
+        dict: Wall time, per-request latencies and errors
+    """
+    local = threading.local()
+
+    def send(request):
+        path, body = request
+        if not hasattr(local, "client"):
+            local.client = Client()
+
+        start = time.perf_counter()
+        response = local.client.post(
+            path, data=json.dumps(body), content_type="application/json"
+        )
+        latency = time.perf_counter() - start
+
+        ok = response.status_code == 200 and response.json().get("success", False)
+        return latency, ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(send, requests))
+    wall_seconds = time.perf_counter() - start
+
+    return {
+        "wall_seconds": wall_seconds,
+        "latencies": [latency for latency, _ in outcomes],
+        "errors": sum(not ok for _, ok in outcomes),
+    }
+
+
+def run_scenario(scenario, concurrency, request_count, playlist_size, run_id):
+    """
+    Run one benchmark scenario against the fake backends
+
+    Args:
+        scenario (str): "video" (POST /api/summarize/video/) or "playlist"
+            (POST /api/summarize/playlist/)
+        concurrency (int): Number of concurrent clients
+        request_count (int): Number of requests
+        playlist_size (int): Videos per playlist
+        run_id (str): Letters and digits that make the videos and playlists of
+            this run unique, so nothing is served from an earlier run's cache
+
+    Returns:
+        dict: Throughput, latency percentiles, errors, Gemini calls and peak memory
+    """
+    if scenario == "video":
+        requests = [
+            (
+                "/api/summarize/video/",
+                {"video_id": f"{run_id}V{i}", "style": "detailed"},
+            )
+            for i in range(request_count)
+        ]
+        videos = request_count
+    else:
+        requests = [
+            (
+                "/api/summarize/playlist/",
+                {
+                    "playlist_url": fake_playlist_url(run_id, i, playlist_size),
+                    "style": "detailed",
+                    "save_to_file": True,
+                },
+            )
+            for i in range(request_count)
+        ]
+        videos = request_count * playlist_size
+
+    FakeGenerativeModel.calls = 0
+    tracemalloc.start()
+    try:
+        outcome = run_requests(requests, concurrency)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies = [latency * 1000 for latency in outcome["latencies"]]
+    wall_seconds = outcome["wall_seconds"]
+
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": request_count,
+        "playlist_size": playlist_size if scenario == "playlist" else None,
+        "wall_seconds": round(wall_seconds, 3),
+        "requests_per_second": round(request_count / wall_seconds, 3),
+        "videos_per_second": round(videos / wall_seconds, 3),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 1),
+            "p95": round(percentile(latencies, 0.95), 1),
+            "p99": round(percentile(latencies, 0.99), 1),
+            "max": round(max(latencies), 1),
+        },
+        "errors": outcome["errors"],
+        "gemini_calls": FakeGenerativeModel.calls,
+        "peak_memory_mb": round(peak_memory / 2**20, 2),
+    }
@@ -0,0 +1,146 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from django_project.metrics import CACHE_LOOKUPS
+from get_links_from_playlist.models import Video
+
+from .models import Summary
+from .search import index_video
+
+# Bump this whenever the summarization prompts change so that stale
+# summaries generated from an older prompt are no longer served.
+PROMPT_VERSION = 1
+
+
+def _model_id(model_name):
+    # The API reports models as "models/<name>", settings name them "<name>"
+    return (model_name or "").split("/", 1)[-1]
+
+
+def summary_cache_key(video_id, style, model_name, prompt_version=PROMPT_VERSION):
+    """
+    Build a content-addressed cache key for a video summary
+
+    Args:
+        video_id (str): Canonical YouTube video ID
+        style (str): Summary style
+        model_name (str): Name of the Gemini model that wrote the summary
+        prompt_version (int): Version of the prompt template
+
+    Returns:
+        str: Cache key
+    """
+    raw_key = f"{video_id}|{style}|{_model_id(model_name)}|v{prompt_version}"
+    return "summary:" + hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+
+def _summary_from_row(row):
+    """
+    Rebuild the summary data of a stored Summary row
+    """
+    transcript = getattr(row.video, "transcript", None)
+    return {
+        "title": f"Video URL: {row.video.url}",
+        "video_id": row.video.video_id,
+        "transcript": transcript.text if transcript is not None else "",
+        "summary": row.summary,
+        "style": row.style,
+        "model": row.model_name,
+    }
+
+
+def get_cached_summary(video_id, style, model_names):
+    """
+    Look up a previously generated summary, in the cache and then in the
+    database, which keeps summaries the cache has evicted
+
+    Args:
+        video_id (str): Canonical YouTube video ID
+        style (str): Summary style
+        model_names (list): Models whose summaries are acceptable, preferred
+            first (see summarize.router.tier_models)
+
+    Returns:
+        dict: Cached summary data or None on a cache miss
+    """
+    if not video_id:
+        return None
+
+    model_ids = list(dict.fromkeys(_model_id(name) for name in model_names))
+    keys = {
+        model_id: summary_cache_key(video_id, style, model_id) for model_id in model_ids
+    }
+
+    found = caches["summaries"].get_many(list(keys.values()))
+    for model_id in model_ids:
+        if keys[model_id] in found:
+            CACHE_LOOKUPS.inc(result="cache")
+            return found[keys[model_id]]
+
+    rows = {
+        row.model_name: row
+        for row in Summary.objects.filter(
+            video__video_id=video_id,
+            style=style,
+            model_name__in=model_ids,
+            prompt_version=PROMPT_VERSION,
+        ).select_related("video", "video__transcript")
+    }
+    row = next((rows[model_id] for model_id in model_ids if model_id in rows), None)
+    if row is None:
+        CACHE_LOOKUPS.inc(result="miss")
+        return None
+
+    CACHE_LOOKUPS.inc(result="database")
+    summary_data = _summary_from_row(row)
+    caches["summaries"].set(keys[row.model_name], summary_data)
+    return summary_data
+
+
+def set_cached_summary(video_id, style, summary_data):
+    """
+    Store a successfully generated summary in the cache and the database,
+    under the model that wrote it (summary_data["model"])
+
+    Args:
+        video_id (str): Canonical YouTube video ID
+        style (str): Summary style
+        summary_data (dict): Summary data to cache
+    """
+    if not video_id or "error" in summary_data:
+        return
+
+    model_id = _model_id(summary_data.get("model") or settings.GEMINI_MODEL)
+
+    caches["summaries"].set(summary_cache_key(video_id, style, model_id), summary_data)
+
+    Summary.objects.update_or_create(
+        video=Video.objects.for_id(video_id),
+        style=style,
+        model_name=model_id,
+        prompt_version=PROMPT_VERSION,
+        defaults={"summary": summary_data.get("summary", "")},
+    )
+    index_video(video_id)
+
+
+def summarized_video_ids(video_ids, style):
+    """
+    Find which videos already have a stored summary in a style, by any model
+
+    Args:
+        video_ids (list): Canonical YouTube video IDs
+        style (str): Summary style
+
+    Returns:
+        set: IDs of the videos with a summary
+    """
+    return set(
+        Summary.objects.filter(
+            video__video_id__in=video_ids,
+            style=style,
+            prompt_version=PROMPT_VERSION,
+        ).values_list("video__video_id", flat=True)
+    )
@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+from .ratelimit import is_rate_limit_error
+
+# Exception class names (from google.api_core and google.generativeai) for
+# errors that will fail the same way however often they are retried
+TERMINAL_ERROR_TYPES = {
+    "InvalidArgument",
+    "PermissionDenied",
+    "Unauthenticated",
+    "NotFound",
+    "FailedPrecondition",
+    "BlockedPromptException",
+    "StopCandidateException",
+}
+
+# Message fragments of terminal errors that are not raised with a specific type
+TERMINAL_ERROR_MESSAGES = (
+    "api key",
+    "api_key",
+    "invalid argument",
+    "permission denied",
+    "safety",
+    "blocked",
+    "not found",
+    "not supported",
+    "invalid video",
+)
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when a request's time budget runs out
+
+    Attributes:
+        stage (str): Pipeline stage that was running when the budget ran out
+    """
+
+    def __init__(self, stage, budget):
+        self.stage = stage
+        self.budget = budget
+        super().__init__(f"Time budget of {budget:g}s exceeded during {stage}")
+
+
+class Deadline:
+    """
+    End-to-end time budget shared by every attempt, backoff sleep and fallback
+    of a single summary request
+    """
+
+    def __init__(self, seconds):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        """
+        Returns:
+            float: Seconds left, never negative
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def check(self, stage):
+        """
+        Raise DeadlineExceeded if no time is left before starting a stage
+
+        Args:
+            stage (str): Name of the stage about to start
+        """
+        if self.remaining() <= 0:
+            raise DeadlineExceeded(stage, self.budget)
+
+    def sleep(self, seconds, stage):
+        """
+        Sleep unless that would use up the rest of the budget
+
+        Args:
+            seconds (float): Time to sleep
+            stage (str): Name of the stage doing the sleeping
+        """
+        if seconds >= self.remaining():
+            raise DeadlineExceeded(stage, self.budget)
+        time.sleep(seconds)
+
+    async def sleep_async(self, seconds, stage):
+        """
+        Like sleep, but waits with asyncio.sleep so the event loop keeps running
+        """
+        if seconds >= self.remaining():
+            raise DeadlineExceeded(stage, self.budget)
+        await asyncio.sleep(seconds)
+
+
+def is_retriable_error(error):
+    """
+    Classify an error from a Gemini call
+
+    Args:
+        error (Exception): Exception raised by a Gemini call
+
+    Returns:
+        bool: False for errors that can never succeed on retry (bad key,
+            invalid video or request, safety blocks), True otherwise
+    """
+    if is_rate_limit_error(error):
+        return True
+
+    if type(error).__name__ in TERMINAL_ERROR_TYPES:
+        return False
+
+    message = str(error).lower()
+    return not any(fragment in message for fragment in TERMINAL_ERROR_MESSAGES)
@@ -0,0 +1,208 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .deadline import Deadline, DeadlineExceeded
+from .gemini import API_KEY_MISSING_ERROR, GenerationError, generate_text, get_model
+
+# Bump this whenever the digest prompts change so cached group summaries
+# generated from an older prompt are no longer reused
+DIGEST_PROMPT_VERSION = 1
+
+DIGEST_STYLE_INSTRUCTIONS = {
+    "short": "Keep it concise: 5-10 bullet points with only the most important ideas.",
+    "academic": "Use formal academic language and critically relate the arguments to each other.",
+    "descriptive": "Describe how the material is presented as well as what it covers.",
+    "technical": "Focus on technical details, methodologies and processes.",
+}
+
+
+class DigestError(Exception):
+    """
+    Raised when a group of summaries cannot be summarized
+    """
+
+
+def estimate_text_tokens(text):
+    # About four characters per token for English text
+    return len(text) // 4 + 1
+
+
+def group_by_token_budget(texts, budget):
+    """
+    Split texts into consecutive groups of at most `budget` estimated tokens
+
+    A group always takes at least two texts (when two are left), so every
+    reduce round at least halves the number of texts even if some of them are
+    larger than the budget on their own.
+
+    Args:
+        texts (list): Texts in playlist order
+        budget (int): Token budget per group
+
+    Returns:
+        list: Lists of texts
+    """
+    groups = []
+    group = []
+    group_tokens = 0
+
+    for text in texts:
+        tokens = estimate_text_tokens(text)
+        if len(group) >= 2 and group_tokens + tokens > budget:
+            groups.append(group)
+            group = []
+            group_tokens = 0
+
+        group.append(text)
+        group_tokens += tokens
+
+    if group:
+        groups.append(group)
+
+    return groups
+
+
+def build_digest_prompt(texts, style="detailed", final=False):
+    """
+    Build the prompt combining a group of summaries
+
+    Args:
+        texts (list): Summaries of videos or of earlier groups
+        style (str): Summary style
+        final (bool): Whether this is the last round, producing the course-level summary
+
+    Returns:
+        str: Prompt text
+    """
+    style_instruction = DIGEST_STYLE_INSTRUCTIONS.get(
+        style,
+        "Capture all key points, arguments, examples and conclusions.",
+    )
+
+    if final:
+        task = (
+            "Write one summary of the whole playlist as a course: its overall "
+            "goal, the main topics in the order they are covered, and the key "
+            "takeaways."
+        )
+    else:
+        task = (
+            "Combine them into one summary of this part of the playlist, keeping "
+            "the order of the videos and every important point."
+        )
+
+    sections = "\n\n---\n\n".join(texts)
+
+    return f"""
+    Below are summaries of consecutive videos from one YouTube playlist.
+    {task}
+    {style_instruction}
+
+    {sections}
+    """
+
+
+def digest_cache_key(prompt, model_name):
+    raw_key = f"{model_name}|v{DIGEST_PROMPT_VERSION}|{prompt}"
+    return "digest:" + hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+
+def summarize_group(texts, style="detailed", final=False, retries=3):
+    """
+    Summarize one group of summaries, reusing a cached result for the same input
+
+    Args:
+        texts (list): Summaries to combine
+        style (str): Summary style
+        final (bool): Whether this is the last round
+        retries (int): Number of retry attempts
+
+    Returns:
+        str: Combined summary
+
+    Raises:
+        DigestError: If the group cannot be summarized
+    """
+    model = get_model()
+    if model is None:
+        raise DigestError(API_KEY_MISSING_ERROR)
+
+    prompt = build_digest_prompt(texts, style, final)
+    cache_key = digest_cache_key(prompt, model.model_name)
+
+    cached = caches["summaries"].get(cache_key)
+    if cached is not None:
+        return cached
+
+    deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
+
+    try:
+        summary = generate_text(model, prompt, deadline, "digest", retries=retries)
+    except (GenerationError, DeadlineExceeded) as e:
+        raise DigestError(str(e))
+
+    caches["summaries"].set(cache_key, summary)
+    return summary
+
+
+def build_playlist_digest(summaries, style="detailed", max_workers=None):
+    """
+    Summarize a whole playlist from its per-video summaries, map-reduce style
+
+    The summaries are packed into groups that fit settings.DIGEST_GROUP_TOKENS
+    and the groups are summarized in parallel. The group summaries are then
+    grouped and summarized again, until everything fits in a single prompt
+    for the final course-level summary. The number of rounds therefore grows
+    with the logarithm of the playlist size.
+
+    Args:
+        summaries (list): (title, summary) tuples in playlist order
+        style (str): Summary style
+        max_workers (int): Number of groups summarized in parallel, capped at
+            settings.PLAYLIST_MAX_WORKERS
+
+    Returns:
+        dict: Digest text, number of rounds and Gemini calls, or error message
+    """
+    if not summaries:
+        return {"error": "No video summaries to build a digest from"}
+
+    if max_workers is None:
+        max_workers = settings.PLAYLIST_MAX_WORKERS
+    max_workers = max(1, min(int(max_workers), settings.PLAYLIST_MAX_WORKERS))
+
+    texts = [
+        f"Video {index}: {title}\n{summary}"
+        for index, (title, summary) in enumerate(summaries, 1)
+    ]
+    budget = settings.DIGEST_GROUP_TOKENS
+    rounds = 0
+    calls = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while len(texts) > 1:
+                groups = group_by_token_budget(texts, budget)
+                if len(groups) == 1:
+                    # Everything fits in the final prompt
+                    break
+
+                rounds += 1
+                calls += len(groups)
+                print(f"Digest round {rounds}: {len(texts)} summaries in {len(groups)} groups")
+
+                texts = list(
+                    executor.map(lambda group: summarize_group(group, style), groups)
+                )
+
+            rounds += 1
+            calls += 1
+            digest = summarize_group(texts, style, final=True)
+
+    except DigestError as e:
+        return {"error": str(e)}
+
+    return {"digest": digest, "rounds": rounds, "calls": calls, "style": style}
@@ -0,0 +1,259 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from django.conf import settings
+
+from django_project.metrics import FALLBACKS, STAGE_SECONDS
+
+from .textrank import caption_text, extract_key_sentences
+from .transcripts import _is_valid_video_id, get_transcript
+
+# Number of sentences the extractive engine picks for each summary style
+EXTRACTIVE_SENTENCES = {"short": 5, "detailed": 12}
+DEFAULT_EXTRACTIVE_SENTENCES = 8
+
+# Sentences per paragraph of a longer extractive summary
+SENTENCES_PER_PARAGRAPH = 4
+
+
+class SummaryEngine(ABC):
+    """
+    A summarization backend, selected with the "engine" request option
+
+    Attributes:
+        name (str): Name used in requests and responses
+        cacheable (bool): Whether summaries go through the summary cache and
+            are coalesced across concurrent requests
+    """
+
+    name = None
+    cacheable = True
+
+    @abstractmethod
+    def summarize(
+        self,
+        video_input,
+        video_id,
+        style,
+        deadline,
+        duration=None,
+        long_video=None,
+        model_tier=None,
+    ):
+        """
+        Summarize a video
+
+        Args:
+            video_input (str): YouTube video URL or ID
+            video_id (str): Canonical YouTube video ID
+            style (str): Summary style
+            deadline (Deadline): Time budget of the request
+            duration (int): Video length in seconds, if known
+            long_video (bool): See summarize_video
+            model_tier (str): See summarize/router.py, for engines with
+                several models
+
+        Returns:
+            dict: Transcript and summary data or error message
+        """
+
+
+class GeminiEngine(SummaryEngine):
+    """
+    Has Gemini watch the video (or summarize its stored transcript)
+    """
+
+    name = "gemini"
+
+    def summarize(
+        self,
+        video_input,
+        video_id,
+        style,
+        deadline,
+        duration=None,
+        long_video=None,
+        model_tier=None,
+    ):
+        from .views import generate_video_summary
+
+        return generate_video_summary(
+            video_input, video_id, style, deadline, duration, long_video, model_tier
+        )
+
+
+def find_caption_file(video_id):
+    """
+    Find a caption file of a video in settings.CAPTIONS_DIR, e.g. one written by
+    `yt-dlp --write-auto-subs --skip-download -o "captions/%(id)s" URL`
+
+    Args:
+        video_id (str): Canonical YouTube video ID
+
+    Returns:
+        Path: {video_id}.vtt, {video_id}.en.vtt, {video_id}.srt, ... or None
+    """
+    captions_dir = Path(settings.CAPTIONS_DIR)
+    if not _is_valid_video_id(video_id) or not captions_dir.is_dir():
+        return None
+
+    for pattern in (f"{video_id}.vtt", f"{video_id}.*.vtt", f"{video_id}.srt", f"{video_id}.*.srt"):
+        matches = sorted(captions_dir.glob(pattern))
+        if matches:
+            return matches[0]
+
+    return None
+
+
+def get_local_transcript(video_id):
+    """
+    Get a video's text without any network access: its stored transcript, or
+    else the text of its caption file
+
+    Args:
+        video_id (str): Canonical YouTube video ID
+
+    Returns:
+        tuple: (text, source) with source "transcript" or "captions", or
+            (None, None) if neither is available
+    """
+    transcript = get_transcript(video_id)
+    if transcript:
+        return transcript, "transcript"
+
+    caption_file = find_caption_file(video_id)
+    if caption_file is not None:
+        try:
+            with open(caption_file, "r", encoding="utf-8") as f:
+                text = caption_text(f.read())
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Could not read caption file {caption_file}: {str(e)}")
+        else:
+            if text:
+                return text, "captions"
+
+    return None, None
+
+
+def format_extractive_summary(sentences, style):
+    """
+    Lay out extracted sentences as a summary: bullet points for the short
+    style, short paragraphs otherwise
+
+    Args:
+        sentences (list): Sentences in their original order
+        style (str): Summary style
+
+    Returns:
+        str: Summary text
+    """
+    if style == "short":
+        return "\n".join(f"- {sentence}" for sentence in sentences)
+
+    return "\n\n".join(
+        " ".join(sentences[start : start + SENTENCES_PER_PARAGRAPH])
+        for start in range(0, len(sentences), SENTENCES_PER_PARAGRAPH)
+    )
+
+
+class ExtractiveEngine(SummaryEngine):
+    """
+    Picks the key sentences of the stored transcript or caption file with
+    TextRank (see summarize/textrank.py). Runs in-process in milliseconds,
+    without network access or API quota, but only for videos whose text is
+    available locally.
+    """
+
+    name = "extractive"
+    # Summaries are cheap to make again, and must not take the place of a
+    # Gemini summary in the cache
+    cacheable = False
+
+    def summarize(
+        self,
+        video_input,
+        video_id,
+        style,
+        deadline=None,
+        duration=None,
+        long_video=None,
+        model_tier=None,
+    ):
+        text, source = get_local_transcript(video_id)
+        if text is None:
+            return {
+                "error": f"No stored transcript or caption file for video {video_id}",
+                "retriable": False,
+            }
+
+        with STAGE_SECONDS.time(stage="extractive_summary"):
+            sentences = extract_key_sentences(
+                text, EXTRACTIVE_SENTENCES.get(style, DEFAULT_EXTRACTIVE_SENTENCES)
+            )
+
+        if not sentences:
+            return {
+                "error": f"The {source} of video {video_id} is too short to summarize",
+                "retriable": False,
+            }
+
+        return {
+            "title": f"Video ID: {video_id}",
+            "video_id": video_id,
+            "transcript": text,
+            "summary": format_extractive_summary(sentences, style),
+            "style": style,
+            "model": self.name,
+            "engine": self.name,
+            "source": source,
+        }
+
+
+ENGINES = {engine.name: engine for engine in (GeminiEngine(), ExtractiveEngine())}
+
+DEFAULT_ENGINE = GeminiEngine.name
+
+
+def get_engine(name=None):
+    """
+    Args:
+        name (str): Engine name, defaults to DEFAULT_ENGINE
+
+    Returns:
+        SummaryEngine: The engine
+
+    Raises:
+        ValueError: If no engine has that name
+    """
+    engine = ENGINES.get(name or DEFAULT_ENGINE)
+    if engine is None:
+        raise ValueError(f"engine must be one of: {', '.join(ENGINES)}")
+    return engine
+
+
+def summarize_degraded(video_id, style, reason):
+    """
+    Summarize a video with the extractive engine because Gemini could not,
+    if settings.EXTRACTIVE_FALLBACK allows it and the video's text is
+    available locally. Only for failures that another attempt could get
+    past (retriable errors, quota, the deadline); terminal errors are
+    reported to the client instead.
+
+    Args:
+        video_id (str): Canonical YouTube video ID
+        style (str): Summary style
+        reason (str): Why Gemini was not used, reported to the client
+
+    Returns:
+        dict: Summary data marked "degraded": true, or None
+    """
+    if not settings.EXTRACTIVE_FALLBACK:
+        return None
+
+    response_data = ENGINES[ExtractiveEngine.name].summarize(video_id, video_id, style)
+    if "error" in response_data:
+        return None
+
+    print(f"Serving an extractive summary of video {video_id} ({style}): {reason}")
+    FALLBACKS.inc(kind="extractive")
+    return {**response_data, "degraded": True, "degraded_reason": reason}
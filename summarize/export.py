@@ -0,0 +1,132 @@
+import json
+import zipfile
+
+from django.db.models import Case, Exists, OuterRef, Subquery, Value, When
+
+from .cache import PROMPT_VERSION
+from .models import Summary
+from .router import tier_models
+
+# Videos read from the database per query while exporting
+EXPORT_BATCH_SIZE = 100
+
+EXPORT_FORMATS = ("ndjson", "zip")
+
+
+def iter_export_records(playlist, style, cursor=0, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Read the summarized videos of a playlist in playlist order, one batch at a
+    time, so memory use does not grow with the playlist
+
+    Args:
+        playlist (Playlist): Playlist to export
+        style (str): Summary style
+        cursor (int): Only export videos after this playlist position
+        batch_size (int): Videos read per query
+
+    Yields:
+        dict: Video, transcript and summary; "cursor" resumes after this video
+    """
+    models = tier_models()
+    # A video summarized by several models is exported with the most capable one's
+    summaries = Summary.objects.filter(
+        video=OuterRef("video"),
+        style=style,
+        model_name__in=models,
+        prompt_version=PROMPT_VERSION,
+    ).order_by(
+        Case(*[When(model_name=name, then=Value(i)) for i, name in enumerate(models)])
+    )
+    memberships = (
+        playlist.memberships.filter(removed_at__isnull=True)
+        .filter(Exists(summaries))
+        .annotate(
+            summary=Subquery(summaries.values("summary")[:1]),
+            summary_model=Subquery(summaries.values("model_name")[:1]),
+        )
+        .select_related("video", "video__transcript")
+        .order_by("position")
+    )
+
+    while True:
+        # Keyset pagination: each batch starts after the last position sent,
+        # which stays fast however deep into the playlist the export is
+        batch = list(memberships.filter(position__gt=cursor)[:batch_size])
+
+        for membership in batch:
+            video = membership.video
+            transcript = getattr(video, "transcript", None)
+            cursor = membership.position
+
+            yield {
+                "cursor": cursor,
+                "position": membership.position,
+                "video_id": video.video_id,
+                "title": video.title,
+                "url": video.url,
+                "style": style,
+                "model": membership.summary_model,
+                "transcript": transcript.text if transcript is not None else "",
+                "summary": membership.summary,
+            }
+
+        if len(batch) < batch_size:
+            return
+
+
+def iter_ndjson(records):
+    """
+    Yields:
+        bytes: One JSON document per line
+    """
+    for record in records:
+        yield (json.dumps(record) + "\n").encode("utf-8")
+
+
+class _ZipStream:
+    """
+    Write-only file object that hands what zipfile writes to a generator.
+    zipfile falls back to data descriptors when it cannot seek, so the archive
+    can be sent while it is being written.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_zip(records):
+    """
+    Stream records as a ZIP archive with one JSON file per video, named
+    "{position}_{video_id}.json". The position of the last complete file is
+    the cursor to resume an interrupted download from.
+
+    Yields:
+        bytes: Parts of the archive
+    """
+    stream = _ZipStream()
+
+    with zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for record in records:
+            name = f"{record['position']:05d}_{record['video_id']}.json"
+            archive.writestr(name, json.dumps(record, indent=2))
+            yield stream.pop()
+
+    # The central directory is written when the archive is closed
+    yield stream.pop()
@@ -0,0 +1,346 @@
+import os
+import threading
+
+from django.conf import settings
+
+from django_project.metrics import GEMINI_REQUESTS, GEMINI_TOKENS, STAGE_SECONDS
+
+from .deadline import DeadlineExceeded, is_retriable_error
+from .ratelimit import estimate_tokens, get_gemini_limiter
+
+# Import Google's Generative AI library
+import google.generativeai as genai
+
+API_KEY_MISSING_ERROR = (
+    "Gemini API key not configured. Please set GEMINI_API_KEY in your .env file."
+)
+
+
+class GenerationError(Exception):
+    """
+    Raised when a prompt could not be answered
+
+    Attributes:
+        retriable (bool): Whether another attempt or prompt could succeed
+    """
+
+    def __init__(self, message, retriable=True):
+        self.retriable = retriable
+        super().__init__(message)
+
+
+# Model used when a call does not name one, and the most capable router tier
+DEFAULT_MODEL = settings.GEMINI_MODEL
+
+# genai.configure() replaces module-global client state, so it is called once
+# per process and the models built on top of it are shared by all threads.
+_lock = threading.Lock()
+_configured_key = None
+_models = {}
+
+# Models that have produced a response / that the API rejected in this process
+_working_models = set()
+_unavailable_models = set()
+
+
+def _configure():
+    """
+    Configure the Gemini client once per process
+
+    Returns:
+        bool: False if no API key is configured
+    """
+    global _configured_key
+
+    api_key = os.environ.get("GEMINI_API_KEY") or settings.GEMINI_API_KEY
+    if not api_key:
+        return False
+
+    if _configured_key != api_key:
+        genai.configure(api_key=api_key)
+        _configured_key = api_key
+        _models.clear()
+
+    return True
+
+
+def get_model(model_name=None):
+    """
+    Get a shared Gemini model, falling back to the next configured model if the
+    preferred one is known to be unavailable or cannot be initialized
+
+    Args:
+        model_name (str): Preferred model, defaults to settings.GEMINI_MODEL
+
+    Returns:
+        GenerativeModel: Shared model instance, or None if no API key is configured
+    """
+    preferred = model_name or DEFAULT_MODEL
+    candidates = [preferred] + [
+        name for name in settings.GEMINI_FALLBACK_MODELS if name != preferred
+    ]
+
+    with _lock:
+        if not _configure():
+            return None
+
+        available = [name for name in candidates if name not in _unavailable_models]
+        # If every model has failed at some point, try them all again
+        for name in available or candidates:
+            if name in _models:
+                return _models[name]
+
+            try:
+                _models[name] = genai.GenerativeModel(name)
+                return _models[name]
+            except Exception as e:
+                print(f"Error initializing model {name}: {str(e)}, trying fallback model")
+                _unavailable_models.add(name)
+
+    raise RuntimeError(f"No Gemini model could be initialized from {candidates}")
+
+
+def _model_key(model):
+    # model.model_name is "models/<name>"
+    return model.model_name.split("/", 1)[-1]
+
+
+def mark_model_working(model):
+    """
+    Remember that a model produced a response
+    """
+    name = _model_key(model)
+
+    with _lock:
+        _working_models.add(name)
+        _unavailable_models.discard(name)
+
+
+def report_model_error(model, error):
+    """
+    Remember a model as unavailable if the API says it does not exist or
+    does not support content generation, so later requests skip it
+
+    Args:
+        model (GenerativeModel): Model that raised the error
+        error (Exception): The error
+    """
+    message = str(error).lower()
+    if "404" in message or "not found" in message or "not supported" in message:
+        name = _model_key(model)
+
+        with _lock:
+            _unavailable_models.add(name)
+            _working_models.discard(name)
+            _models.pop(name, None)
+
+
+def get_model_status():
+    """
+    Get the models known to work or to be unavailable in this process
+
+    Returns:
+        dict: {"working": [...], "unavailable": [...]}
+    """
+    with _lock:
+        return {
+            "working": sorted(_working_models),
+            "unavailable": sorted(_unavailable_models),
+        }
+
+
+def record_token_usage(usage_metadata):
+    """
+    Add a response's token counts to the metrics
+
+    Args:
+        usage_metadata: usage_metadata of a Gemini response
+    """
+    GEMINI_TOKENS.inc(
+        getattr(usage_metadata, "prompt_token_count", 0) or 0, direction="input"
+    )
+    GEMINI_TOKENS.inc(
+        getattr(usage_metadata, "candidates_token_count", 0) or 0, direction="output"
+    )
+
+
+def record_request(model, succeeded):
+    """
+    Count a Gemini call in the metrics
+
+    Args:
+        model (GenerativeModel): Model that was called
+        succeeded (bool): Whether the call succeeded
+    """
+    GEMINI_REQUESTS.inc(
+        model=_model_key(model), outcome="success" if succeeded else "error"
+    )
+
+
+def _estimate_call_tokens(prompt, kwargs):
+    # A capped output needs less of the token budget
+    generation_config = kwargs.get("generation_config") or {}
+    output_tokens = (
+        generation_config.get("max_output_tokens")
+        if isinstance(generation_config, dict)
+        else getattr(generation_config, "max_output_tokens", None)
+    )
+    return estimate_tokens(prompt, output_tokens)
+
+
+def _record_usage(response, usage):
+    # Correct the limiter's token estimate and count the tokens in the metrics
+    usage_metadata = getattr(response, "usage_metadata", None)
+    if usage_metadata is not None:
+        usage["total_tokens"] = getattr(usage_metadata, "total_token_count", 0)
+        record_token_usage(usage_metadata)
+
+
+def generate_content(model, prompt, **kwargs):
+    """
+    Call model.generate_content through the process-wide rate limiter and
+    record whether the model works
+
+    Args:
+        model (GenerativeModel): Model from get_model
+        prompt (str): Prompt text
+        **kwargs: Passed on to generate_content
+
+    Returns:
+        GenerateContentResponse: Model response
+    """
+    try:
+        with get_gemini_limiter().slot(_estimate_call_tokens(prompt, kwargs)) as usage:
+            with STAGE_SECONDS.time(stage="generate_content"):
+                response = model.generate_content(prompt, **kwargs)
+
+            _record_usage(response, usage)
+    except Exception as e:
+        record_request(model, succeeded=False)
+        report_model_error(model, e)
+        raise
+
+    record_request(model, succeeded=True)
+    mark_model_working(model)
+    return response
+
+
+def generate_text(model, prompt, deadline, stage, retries=3, **kwargs):
+    """
+    Run a prompt with jittered retries on retriable errors
+
+    Args:
+        model (GenerativeModel): Model from get_model
+        prompt (str): Prompt text
+        deadline (Deadline): Time budget for all attempts and backoff
+        stage (str): Name of the call, for logs and deadline errors
+        retries (int): Number of attempts
+        **kwargs: Passed on to generate_content, e.g. generation_config
+
+    Returns:
+        str: Generated text
+
+    Raises:
+        GenerationError: If the prompt failed for good
+        DeadlineExceeded: If the time budget runs out
+    """
+    for attempt in range(retries):
+        deadline.check(f"{stage} attempt {attempt+1}")
+
+        try:
+            response = generate_content(
+                model,
+                prompt,
+                request_options={"timeout": deadline.remaining()},
+                **kwargs,
+            )
+            return response.text if hasattr(response, "text") else str(response)
+
+        except Exception as e:
+            print(f"Error on {stage} attempt {attempt+1}: {str(e)}")
+
+            if deadline.remaining() <= 0:
+                raise DeadlineExceeded(stage, deadline.budget)
+
+            if not is_retriable_error(e):
+                raise GenerationError(f"Error in {stage}: {str(e)}", retriable=False)
+
+            if attempt == retries - 1:
+                raise GenerationError(f"{stage} failed after {retries} attempts: {str(e)}")
+
+            deadline.sleep(
+                get_gemini_limiter().backoff_delay(attempt),
+                f"backoff after {stage} attempt {attempt+1}",
+            )
+
+
+async def generate_content_async(model, prompt, **kwargs):
+    """
+    Async version of generate_content, using model.generate_content_async so
+    the event loop keeps running while the call is in flight
+
+    Args:
+        model (GenerativeModel): Model from get_model
+        prompt (str): Prompt text
+        **kwargs: Passed on to generate_content_async
+
+    Returns:
+        AsyncGenerateContentResponse: Model response
+    """
+    try:
+        async with get_gemini_limiter().slot_async(
+            _estimate_call_tokens(prompt, kwargs)
+        ) as usage:
+            with STAGE_SECONDS.time(stage="generate_content"):
+                response = await model.generate_content_async(prompt, **kwargs)
+
+            _record_usage(response, usage)
+    except Exception as e:
+        record_request(model, succeeded=False)
+        report_model_error(model, e)
+        raise
+
+    record_request(model, succeeded=True)
+    mark_model_working(model)
+    return response
+
+
+async def generate_text_async(model, prompt, deadline, stage, retries=3, **kwargs):
+    """
+    Async version of generate_text; backoff waits with asyncio.sleep
+
+    Returns:
+        str: Generated text
+
+    Raises:
+        GenerationError: If the prompt failed for good
+        DeadlineExceeded: If the time budget runs out
+    """
+    for attempt in range(retries):
+        deadline.check(f"{stage} attempt {attempt+1}")
+
+        try:
+            response = await generate_content_async(
+                model,
+                prompt,
+                request_options={"timeout": deadline.remaining()},
+                **kwargs,
+            )
+            return response.text if hasattr(response, "text") else str(response)
+
+        except Exception as e:
+            print(f"Error on {stage} attempt {attempt+1}: {str(e)}")
+
+            if deadline.remaining() <= 0:
+                raise DeadlineExceeded(stage, deadline.budget)
+
+            if not is_retriable_error(e):
+                raise GenerationError(f"Error in {stage}: {str(e)}", retriable=False)
+
+            if attempt == retries - 1:
+                raise GenerationError(f"{stage} failed after {retries} attempts: {str(e)}")
+
+            await deadline.sleep_async(
+                get_gemini_limiter().backoff_delay(attempt),
+                f"backoff after {stage} attempt {attempt+1}",
+            )
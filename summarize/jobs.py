@@ -0,0 +1,347 @@
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+
+from get_links_from_playlist.views import get_playlist_id
+from get_links_from_playlist.models import Playlist
+
+from .models import Run
+
+# Background workers shared by all playlist jobs in this process. Each job
+# still summarizes its videos with its own bounded pool (see process_playlist).
+# The queue is per process: only the state of its jobs is stored, as Run rows
+# that any process can report on. A job doesn't survive its process; it is
+# marked as failed once found orphaned (see fail_orphaned_runs) and can be
+# started again with "resume" to skip the videos it already summarized.
+_executor = None
+_executor_lock = threading.Lock()
+
+# Jobs started by this process; other processes read them from the database
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+# Error of a job whose process stopped before it finished
+ORPHANED_RUN_ERROR = "The server process running this job stopped before it finished"
+
+
+def _worker_id():
+    # Looked up each time, since the process may have been forked since import
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _get_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            # Jobs left behind by stopped processes, such as this server
+            # before a restart, will never be picked up again
+            fail_orphaned_runs()
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PLAYLIST_JOB_WORKERS,
+                thread_name_prefix="playlist-job",
+            )
+        return _executor
+
+
+def _to_datetime(timestamp):
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
+
+
+def _to_timestamp(value):
+    return value.timestamp() if value is not None else None
+
+
+def _save_job(job):
+    """
+    Persist a job's state so any web process can report on it
+    """
+    progress = job["progress"]
+    Run.objects.update_or_create(
+        job_id=job["job_id"],
+        defaults={
+            "playlist": Playlist.objects.filter(
+                playlist_id=get_playlist_id(job["playlist_url"])
+            ).first(),
+            "playlist_url": job["playlist_url"],
+            "style": job["style"],
+            "status": job["status"],
+            "total": progress["total"],
+            "done": progress["done"],
+            "failed": progress["failed"],
+            "eta_seconds": job["eta_seconds"],
+            "summaries": job["summaries"],
+            "playlist_info": job.get("playlist_info"),
+            "combined_file": job.get("combined_file") or "",
+            "error": job.get("error", ""),
+            "worker": _worker_id(),
+            "started_at": _to_datetime(job["started_at"]),
+            "finished_at": _to_datetime(job["finished_at"]),
+        },
+    )
+
+
+def _job_from_run(run):
+    """
+    Rebuild the job dictionary of a stored Run
+    """
+    pending = None
+    if run.total is not None:
+        pending = run.total - run.done - run.failed
+
+    job = {
+        "job_id": run.job_id,
+        "status": run.status,
+        "playlist_url": run.playlist_url,
+        "style": run.style,
+        "progress": {
+            "total": run.total,
+            "done": run.done,
+            "failed": run.failed,
+            "pending": pending,
+        },
+        "eta_seconds": run.eta_seconds,
+        "summaries": run.summaries,
+        "created_at": _to_timestamp(run.created_at),
+        "started_at": _to_timestamp(run.started_at),
+        "finished_at": _to_timestamp(run.finished_at),
+    }
+
+    if run.playlist_info is not None:
+        job["playlist_info"] = run.playlist_info
+    if run.combined_file:
+        job["combined_file"] = run.combined_file
+    if run.error:
+        job["error"] = run.error
+
+    return job
+
+
+def _update_job(job_id, **changes):
+    with _jobs_lock:
+        job = _jobs[job_id]
+        job.update(changes)
+        _save_job(job)
+
+
+def _run_playlist_job(
+    job_id, playlist_url, style, save_to_file, max_workers, only_new, resume
+):
+    from .views import process_playlist
+
+    results = {}
+
+    def on_start(video_count):
+        # The count is None until the whole playlist has been listed
+        if video_count is None:
+            return
+
+        with _jobs_lock:
+            job = _jobs[job_id]
+            progress = job["progress"]
+            progress["total"] = video_count
+            progress["pending"] = video_count - progress["done"] - progress["failed"]
+            _save_job(job)
+
+    def on_result(index, summary_result):
+        with _jobs_lock:
+            job = _jobs[job_id]
+            results[index] = summary_result
+
+            progress = job["progress"]
+            if summary_result["success"]:
+                progress["done"] += 1
+            else:
+                progress["failed"] += 1
+
+            if progress["total"] is not None:
+                progress["pending"] = (
+                    progress["total"] - progress["done"] - progress["failed"]
+                )
+
+                # Estimate the remaining time from the average rate so far
+                finished = progress["done"] + progress["failed"]
+                elapsed = time.time() - job["started_at"]
+                job["eta_seconds"] = round(elapsed / finished * progress["pending"], 1)
+
+            job["summaries"] = [results[i] for i in sorted(results)]
+            _save_job(job)
+
+    _update_job(job_id, status="running", started_at=time.time())
+
+    try:
+        result = process_playlist(
+            playlist_url,
+            style,
+            save_to_file,
+            max_workers,
+            only_new,
+            on_start=on_start,
+            on_result=on_result,
+            resume=resume,
+        )
+    except Exception as e:
+        import traceback
+
+        traceback.print_exc()
+        result = {"error": f"Error processing playlist: {str(e)}"}
+
+    if "error" in result:
+        _update_job(
+            job_id, status="failed", error=result["error"], finished_at=time.time()
+        )
+    else:
+        _update_job(
+            job_id,
+            status="completed",
+            playlist_info=result["playlist_info"],
+            summaries=result["summaries"],
+            combined_file=result["combined_file"],
+            eta_seconds=0,
+            finished_at=time.time(),
+        )
+
+
+def enqueue_playlist_job(
+    playlist_url,
+    style="detailed",
+    save_to_file=True,
+    max_workers=None,
+    only_new=False,
+    resume=True,
+):
+    """
+    Queue a playlist summarization run on the background workers
+
+    Args:
+        playlist_url (str): YouTube playlist URL
+        style (str): Summary style
+        save_to_file (bool): Whether to save individual summaries
+        max_workers (int): Number of videos summarized in parallel
+        only_new (bool): Only summarize videos with no summary in this style yet
+        resume (bool): Skip videos completed by an earlier run of this playlist
+
+    Returns:
+        str: Job ID to poll with get_playlist_job
+    """
+    job_id = uuid.uuid4().hex
+    job = {
+        "job_id": job_id,
+        "status": "queued",
+        "playlist_url": playlist_url,
+        "style": style,
+        "progress": {"total": None, "done": 0, "failed": 0, "pending": None},
+        "eta_seconds": None,
+        "summaries": [],
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+    }
+
+    with _jobs_lock:
+        _jobs[job_id] = job
+        _save_job(job)
+
+    _get_executor().submit(
+        _run_playlist_job,
+        job_id,
+        playlist_url,
+        style,
+        save_to_file,
+        max_workers,
+        only_new,
+        resume,
+    )
+
+    return job_id
+
+
+def get_playlist_job(job_id):
+    """
+    Get the current state of a playlist job
+
+    Args:
+        job_id (str): Job ID returned by enqueue_playlist_job
+
+    Returns:
+        dict: Job state or None if the job does not exist
+    """
+    with _jobs_lock:
+        if job_id in _jobs:
+            return json.loads(json.dumps(_jobs[job_id]))
+
+    # The job may have been started by another worker process
+    run = Run.objects.filter(job_id=job_id).first()
+    if run is None:
+        return None
+
+    if _is_orphaned(run):
+        _fail_orphaned_run(run)
+
+    return _job_from_run(run)
+
+
+def _is_orphaned(run):
+    """
+    Check whether an unfinished Run's process has stopped. Runs owned by
+    processes on other hosts can't be checked and are assumed to be alive.
+    """
+    if run.status not in ("queued", "running") or not run.worker:
+        return False
+
+    host, _, pid = run.worker.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+
+    if int(pid) == os.getpid():
+        with _jobs_lock:
+            return run.job_id not in _jobs
+
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        # The process exists but belongs to another user
+        return False
+
+    return False
+
+
+def _fail_orphaned_run(run):
+    run.status = "failed"
+    run.error = ORPHANED_RUN_ERROR
+    run.finished_at = datetime.now(tz=dt_timezone.utc)
+    Run.objects.filter(pk=run.pk, status__in=["queued", "running"]).update(
+        status=run.status, error=run.error, finished_at=run.finished_at
+    )
+
+
+def fail_orphaned_runs():
+    """
+    Mark the queued and running jobs of stopped processes on this host as
+    failed, since nothing will ever run them
+
+    Returns:
+        int: Number of jobs marked as failed
+    """
+    orphaned = [
+        run
+        for run in Run.objects.filter(status__in=["queued", "running"])
+        if _is_orphaned(run)
+    ]
+
+    for run in orphaned:
+        print(f"Marking job {run.job_id} as failed: it is no longer running in {run.worker}")
+        _fail_orphaned_run(run)
+
+    return len(orphaned)
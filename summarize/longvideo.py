@@ -0,0 +1,176 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .deadline import Deadline
+from .gemini import API_KEY_MISSING_ERROR, GenerationError, generate_text, get_model
+
+
+def format_timestamp(seconds):
+    """
+    Format seconds as H:MM:SS
+    """
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def split_time_windows(duration, chunk_seconds):
+    """
+    Split a video into consecutive time windows
+
+    A short remainder at the end is added to the last window instead of
+    becoming a window of its own.
+
+    Args:
+        duration (int): Video length in seconds
+        chunk_seconds (int): Length of each window in seconds
+
+    Returns:
+        list: (start, end) tuples in seconds
+    """
+    windows = []
+    start = 0
+
+    while start < duration:
+        end = min(start + chunk_seconds, duration)
+        if duration - end < chunk_seconds / 4:
+            end = duration
+
+        windows.append((start, end))
+        start = end
+
+    return windows
+
+
+def build_chunk_prompt(video_url, start, end, style="detailed"):
+    """
+    Build the prompt for one time window of a long video
+
+    Args:
+        video_url (str): YouTube video URL
+        start (int): Start of the window in seconds
+        end (int): End of the window in seconds
+        style (str): Summary style
+
+    Returns:
+        str: Prompt text
+    """
+    from .views import build_detailed_prompt
+
+    # Same instructions and format as a whole video, limited to the window
+    return build_detailed_prompt(
+        video_url,
+        style,
+        window=f"from {format_timestamp(start)} to {format_timestamp(end)}",
+    )
+
+
+def build_merge_prompt(partial_summaries, style="detailed"):
+    """
+    Build the prompt that merges the summaries of a video's time windows
+
+    Args:
+        partial_summaries (list): (start, end, summary) tuples in video order
+        style (str): Summary style
+
+    Returns:
+        str: Prompt text
+    """
+    sections = "\n\n".join(
+        f"[{format_timestamp(start)} - {format_timestamp(end)}]\n{summary}"
+        for start, end, summary in partial_summaries
+    )
+
+    return f"""
+    Below are summaries of consecutive parts of one YouTube video, in order.
+    Merge them into a single summary of the whole video in the "{style}" style,
+    removing repetition between parts and keeping the order of the content.
+
+    {sections}
+    """
+
+
+def summarize_long_video(
+    video_url, duration, style="detailed", deadline=None, model_name=None
+):
+    """
+    Summarize a long video in time windows that are processed concurrently
+
+    Each window gets its own transcript and summary, and is retried on its own
+    if it fails, so a failure late in a long lecture doesn't repeat the whole
+    video. The partial summaries are then merged into one. With enough
+    workers, latency is that of the slowest window rather than of the whole
+    video.
+
+    Args:
+        video_url (str): YouTube video URL
+        duration (int): Video length in seconds
+        style (str): Summary style
+        deadline (Deadline): Time budget shared by every window and the merge
+        model_name (str): Model to use, defaults to settings.GEMINI_MODEL
+
+    Returns:
+        dict: Transcript and summary data or error message
+
+    Raises:
+        DeadlineExceeded: If the time budget runs out
+    """
+    from .views import extract_video_id_from_url, parse_transcript_and_summary
+
+    if deadline is None:
+        deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
+
+    model = get_model(model_name)
+    if model is None:
+        return {"error": API_KEY_MISSING_ERROR, "retriable": False}
+
+    windows = split_time_windows(duration, settings.LONG_VIDEO_CHUNK_SECONDS)
+    print(f"Summarizing {video_url} in {len(windows)} parts")
+
+    def summarize_window(window):
+        start, end = window
+        prompt = build_chunk_prompt(video_url, start, end, style)
+        text = generate_text(
+            model, prompt, deadline, f"part {format_timestamp(start)}-{format_timestamp(end)}"
+        )
+        return parse_transcript_and_summary(text)
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=min(len(windows), settings.LONG_VIDEO_MAX_WORKERS)
+        ) as executor:
+            parts = list(executor.map(summarize_window, windows))
+    except GenerationError as e:
+        return {"error": str(e), "retriable": e.retriable}
+
+    transcript = "\n\n".join(
+        f"[{format_timestamp(start)} - {format_timestamp(end)}]\n{part_transcript}"
+        for (start, end), (part_transcript, _) in zip(windows, parts)
+    )
+    partial_summaries = [
+        (start, end, part_summary)
+        for (start, end), (_, part_summary) in zip(windows, parts)
+    ]
+
+    try:
+        summary = generate_text(
+            model, build_merge_prompt(partial_summaries, style), deadline, "merge"
+        )
+    except GenerationError as e:
+        # The per-part summaries are still useful on their own
+        print(f"Could not merge partial summaries: {str(e)}")
+        summary = "\n\n".join(
+            f"[{format_timestamp(start)} - {format_timestamp(end)}]\n{part_summary}"
+            for start, end, part_summary in partial_summaries
+        )
+
+    return {
+        "title": f"Video URL: {video_url}",
+        "video_id": extract_video_id_from_url(video_url),
+        "transcript": transcript,
+        "summary": summary,
+        "style": style,
+        "model": model.model_name,
+        "parts": len(windows),
+    }
@@ -0,0 +1,232 @@
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from summarize.benchmark import FakeGenerativeModel, offline_environment, run_scenario
+
+
+def _int_list(value):
+    try:
+        return [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise CommandError(f"Expected comma-separated numbers, got {value!r}")
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the video and playlist endpoints against fake Gemini and yt-dlp "
+        "backends, without network access or API quota. Results are saved as JSON "
+        "so runs from different commits can be compared."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            choices=["video", "playlist", "all"],
+            default="all",
+            help="Endpoint to benchmark (default: all)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=_int_list,
+            default=[1, 4, 16],
+            help="Comma-separated numbers of concurrent clients (default: 1,4,16)",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=32,
+            help="Video requests per concurrency level (default: 32)",
+        )
+        parser.add_argument(
+            "--playlist-sizes",
+            type=_int_list,
+            default=[10, 50],
+            help="Comma-separated numbers of videos per playlist (default: 10,50)",
+        )
+        parser.add_argument(
+            "--playlist-requests",
+            type=int,
+            default=4,
+            help="Playlist requests per concurrency level and size (default: 4)",
+        )
+        parser.add_argument(
+            "--latency-ms",
+            type=float,
+            default=200,
+            help="Mean latency of a fake Gemini call (default: 200)",
+        )
+        parser.add_argument(
+            "--jitter",
+            type=float,
+            default=0.2,
+            help="Standard deviation of the latency, as a share of the mean (default: 0.2)",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0.0,
+            help="Share of fake Gemini calls failing with a 500 error (default: 0)",
+        )
+        parser.add_argument(
+            "--rate-limit-rate",
+            type=float,
+            default=0.0,
+            help="Share of fake Gemini calls failing with a 429 error (default: 0)",
+        )
+        parser.add_argument(
+            "--listing-latency-ms",
+            type=float,
+            default=5,
+            help="Time the fake yt-dlp takes to list each playlist video (default: 5)",
+        )
+        parser.add_argument(
+            "--backoff-base",
+            type=float,
+            default=None,
+            help="Override GEMINI_BACKOFF_BASE, e.g. to keep error benchmarks short",
+        )
+        parser.add_argument(
+            "--keep-rate-limits",
+            action="store_true",
+            help="Keep the configured Gemini request and token limits",
+        )
+        parser.add_argument(
+            "--output-dir",
+            default=str(Path(settings.BASE_DIR) / "benchmark_results"),
+            help="Directory the results are saved to (default: benchmark_results/)",
+        )
+        parser.add_argument(
+            "--compare",
+            help="Earlier results file to compare this run with",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["compare"]:
+            try:
+                with open(options["compare"], "r", encoding="utf-8") as f:
+                    baseline = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                raise CommandError(f"Cannot read {options['compare']}: {str(e)}")
+
+        FakeGenerativeModel.configure(
+            latency=options["latency_ms"] / 1000,
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            rate_limit_rate=options["rate_limit_rate"],
+        )
+
+        runs = []
+        for concurrency in options["concurrency"]:
+            if options["scenario"] in ("video", "all"):
+                runs.append(("video", concurrency, options["requests"], None))
+            if options["scenario"] in ("playlist", "all"):
+                for size in options["playlist_sizes"]:
+                    runs.append(("playlist", concurrency, options["playlist_requests"], size))
+
+        results = []
+        with offline_environment(
+            options["listing_latency_ms"] / 1000,
+            keep_rate_limits=options["keep_rate_limits"],
+            backoff_base=options["backoff_base"],
+        ):
+            for scenario, concurrency, request_count, size in runs:
+                label = f"{scenario} c={concurrency}" + (f" size={size}" if size else "")
+                self.stdout.write(f"Running {label}...")
+
+                # The pipeline's own progress prints would drown the results
+                with contextlib.redirect_stdout(
+                    sys.stdout if options["verbosity"] > 1 else io.StringIO()
+                ):
+                    result = run_scenario(
+                        scenario, concurrency, request_count, size, uuid.uuid4().hex[:8]
+                    )
+                results.append(result)
+                self.stdout.write(self._format_result(label, result, baseline))
+
+        report = {
+            "commit": _git_commit(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "options": {
+                key: options[key]
+                for key in (
+                    "latency_ms",
+                    "jitter",
+                    "error_rate",
+                    "rate_limit_rate",
+                    "listing_latency_ms",
+                    "backoff_base",
+                    "keep_rate_limits",
+                )
+            },
+            "results": results,
+        }
+
+        output_dir = Path(options["output_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_file = output_dir / (
+            f"{time.strftime('%Y%m%d-%H%M%S')}_{report['commit'] or 'unknown'}.json"
+        )
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(f"Results saved to {output_file}"))
+
+    @staticmethod
+    def _format_result(label, result, baseline):
+        latency = result["latency_ms"]
+        line = (
+            f"  {result['videos_per_second']:.2f} videos/s, "
+            f"p50 {latency['p50']:.0f} ms, p95 {latency['p95']:.0f} ms, "
+            f"p99 {latency['p99']:.0f} ms, {result['errors']} errors, "
+            f"{result['gemini_calls']} Gemini calls, peak {result['peak_memory_mb']:.1f} MB"
+        )
+
+        if baseline is None:
+            return line
+
+        previous = next(
+            (
+                other
+                for other in baseline.get("results", [])
+                if (other["scenario"], other["concurrency"], other["playlist_size"])
+                == (result["scenario"], result["concurrency"], result["playlist_size"])
+            ),
+            None,
+        )
+        if previous is None:
+            return line + f"\n  (no {label} run in the baseline)"
+
+        def change(new, old):
+            return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+        return line + (
+            f"\n  vs {baseline.get('commit') or 'baseline'}: "
+            f"throughput {change(result['videos_per_second'], previous['videos_per_second'])}, "
+            f"p95 {change(latency['p95'], previous['latency_ms']['p95'])}"
+        )
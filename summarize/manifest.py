@@ -0,0 +1,89 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from django_project.metrics import STAGE_SECONDS
+
+
+class RunManifest:
+    """
+    Checkpoint of a playlist run for one summary style, stored as
+    manifest_{style}.json next to the playlist's summary files. It records
+    whether each video is pending, completed or failed so an interrupted run
+    can be resumed without summarizing finished videos again.
+    """
+
+    PENDING = "pending"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    def __init__(self, playlist_dir, style, load=True):
+        self.path = Path(playlist_dir) / f"manifest_{style}.json"
+        self.lock = threading.Lock()
+        self.videos = {}
+
+        if load and self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.videos = json.load(f).get("videos", {})
+            except (OSError, ValueError):
+                print(f"Ignoring unreadable run manifest {self.path}")
+
+    def completed_file(self, video_id):
+        """
+        Get the saved summary file of a video completed by an earlier run
+
+        Args:
+            video_id (str): YouTube video ID
+
+        Returns:
+            Path: Summary file, or None if the video must be (re)summarized
+        """
+        with self.lock:
+            entry = self.videos.get(video_id)
+
+        if not entry or entry["status"] != self.COMPLETED or not entry.get("file_path"):
+            return None
+
+        file_path = Path(entry["file_path"])
+        return file_path if file_path.exists() else None
+
+    def mark(self, video_id, status, save=True, **details):
+        """
+        Record the status of a video
+
+        Args:
+            video_id (str): YouTube video ID
+            status (str): PENDING, COMPLETED or FAILED
+            save (bool): Whether to write the manifest to disk right away
+            **details: Extra fields to store, e.g. file_path or error
+        """
+        with self.lock:
+            entry = self.videos.get(video_id, {})
+            if status == self.PENDING and entry.get("status") == self.COMPLETED:
+                # Listing a finished video again doesn't undo its checkpoint
+                return
+
+            entry.update(details)
+            entry["status"] = status
+            entry["updated_at"] = time.time()
+            self.videos[video_id] = entry
+
+        if save:
+            self.save()
+
+    @STAGE_SECONDS.time(stage="artifact_write")
+    def save(self):
+        """
+        Write the manifest to disk atomically
+        """
+        with self.lock:
+            data = json.dumps({"videos": self.videos})
+
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+
+            os.replace(temp_path, self.path)
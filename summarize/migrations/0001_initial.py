@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('get_links_from_playlist', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Transcript',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField()),
+                ('model_name', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('video', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='transcript', to='get_links_from_playlist.video')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Run',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.CharField(max_length=32, unique=True)),
+                ('playlist_url', models.URLField(max_length=500)),
+                ('style', models.CharField(max_length=32)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=16)),
+                ('total', models.PositiveIntegerField(blank=True, null=True)),
+                ('done', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('eta_seconds', models.FloatField(blank=True, null=True)),
+                ('summaries', models.JSONField(default=list)),
+                ('playlist_info', models.JSONField(blank=True, null=True)),
+                ('combined_file', models.CharField(blank=True, max_length=500)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('playlist', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='runs', to='get_links_from_playlist.playlist')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='run_status_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Summary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('style', models.CharField(max_length=32)),
+                ('model_name', models.CharField(max_length=100)),
+                ('prompt_version', models.PositiveIntegerField()),
+                ('summary', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='summaries', to='get_links_from_playlist.video')),
+            ],
+            options={
+                'verbose_name_plural': 'summaries',
+                'indexes': [models.Index(fields=['style', 'video'], name='summary_style_video_idx')],
+                'constraints': [models.UniqueConstraint(fields=('video', 'style', 'model_name', 'prompt_version'), name='unique_video_summary')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Create the FTS5 index of summaries and fill it from the stored rows.
+    Databases other than SQLite, or SQLite builds without FTS5, go without
+    full-text search.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        if "ENABLE_FTS5" not in {row[0] for row in cursor.fetchall()}:
+            return
+
+        # Prefix indexes keep short "word*" searches from scanning every term
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS summarize_search_index "
+            "USING fts5(title, summary, transcript, tokenize = 'porter unicode61', prefix = '2 3')"
+        )
+        # The default ranking of the index, see summarize/search.py
+        cursor.execute(
+            "INSERT INTO summarize_search_index (summarize_search_index, rank) "
+            "VALUES ('rank', 'bm25(5.0, 2.0, 1.0)')"
+        )
+        cursor.execute(
+            """
+            INSERT INTO summarize_search_index (rowid, title, summary, transcript)
+            SELECT s.id, v.title, s.summary, COALESCE(t.text, '')
+            FROM summarize_summary s
+            JOIN get_links_from_playlist_video v ON v.id = s.video_id
+            LEFT JOIN summarize_transcript t ON t.video_id = s.video_id
+            """
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS summarize_search_index")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("summarize", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
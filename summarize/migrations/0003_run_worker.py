@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summarize', '0002_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='run',
+            name='worker',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
@@ -1,3 +1,92 @@
 from django.db import models
 
-# Create your models here.
+from get_links_from_playlist.models import Playlist, Video
+
+
+class Transcript(models.Model):
+    """
+    The transcript of a video, stored once and reused for every summary style
+    """
+
+    video = models.OneToOneField(
+        Video, on_delete=models.CASCADE, related_name="transcript"
+    )
+    text = models.TextField()
+    model_name = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Transcript of {self.video}"
+
+
+class Summary(models.Model):
+    """
+    A video summary in one style, generated by one model and prompt version
+    """
+
+    video = models.ForeignKey(Video, on_delete=models.CASCADE, related_name="summaries")
+    style = models.CharField(max_length=32)
+    model_name = models.CharField(max_length=100)
+    prompt_version = models.PositiveIntegerField()
+    summary = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["video", "style", "model_name", "prompt_version"],
+                name="unique_video_summary",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["style", "video"], name="summary_style_video_idx"),
+        ]
+        verbose_name_plural = "summaries"
+
+    def __str__(self):
+        return f"{self.style} summary of {self.video}"
+
+
+class Run(models.Model):
+    """
+    A background playlist summarization job and its progress
+    """
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    job_id = models.CharField(max_length=32, unique=True)
+    playlist = models.ForeignKey(
+        Playlist, on_delete=models.SET_NULL, null=True, blank=True, related_name="runs"
+    )
+    playlist_url = models.URLField(max_length=500)
+    style = models.CharField(max_length=32)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default="queued")
+    total = models.PositiveIntegerField(null=True, blank=True)
+    done = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    eta_seconds = models.FloatField(null=True, blank=True)
+    # Per-video results in playlist order, as returned by process_playlist
+    summaries = models.JSONField(default=list)
+    playlist_info = models.JSONField(null=True, blank=True)
+    combined_file = models.CharField(max_length=500, blank=True)
+    error = models.TextField(blank=True)
+    # Process whose in-memory queue holds the job, as "host:pid"
+    worker = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="run_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"Run {self.job_id} ({self.status})"
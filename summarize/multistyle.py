@@ -0,0 +1,247 @@
+import re
+
+from django.conf import settings
+
+from .cache import get_cached_summary, set_cached_summary
+from .deadline import Deadline, DeadlineExceeded
+from .gemini import (
+    API_KEY_MISSING_ERROR,
+    GenerationError,
+    generate_text,
+    get_model,
+)
+from .router import tier_models
+from .singleflight import run_once
+from .transcripts import get_transcript, save_transcript, summarize_transcript_text
+
+
+def build_multi_style_prompt(video_url, styles):
+    """
+    Build a prompt asking for the transcript and one summary per style
+
+    Args:
+        video_url (str): YouTube video URL
+        styles (list): Summary styles
+
+    Returns:
+        str: Prompt text
+    """
+    from .views import get_style_instruction
+
+    instructions = "\n".join(
+        f"    - SUMMARY ({style.upper()}): {get_style_instruction(style)}"
+        for style in styles
+    )
+    sections = "\n\n".join(
+        f"    SUMMARY ({style.upper()}):\n    [Your {style} summary here]"
+        for style in styles
+    )
+
+    return f"""
+    You're analyzing a YouTube video: {video_url}
+
+    First, provide a complete transcript of the video in a section titled "TRANSCRIPT".
+
+    Then summarize the video content once for each of the following sections:
+{instructions}
+
+    Format your response exactly like this:
+
+    TRANSCRIPT:
+    [Full transcript text here]
+
+{sections}
+    """
+
+
+def parse_multi_style_response(generated_text, styles):
+    """
+    Split a response to the multi-style prompt into transcript and summaries
+
+    Args:
+        generated_text (str): Text generated by the model
+        styles (list): Styles that were asked for
+
+    Returns:
+        tuple: (transcript, {style: summary}); styles the model left out are missing
+    """
+    pattern = re.compile(
+        r"^[\s*#]*SUMMARY \((%s)\)[\s*]*:[\s*]*$"
+        % "|".join(re.escape(style) for style in styles),
+        re.IGNORECASE | re.MULTILINE,
+    )
+    markers = list(pattern.finditer(generated_text))
+
+    transcript_end = markers[0].start() if markers else len(generated_text)
+    transcript = re.sub(
+        r"^[\s*#]*TRANSCRIPT[\s*]*:[\s*]*",
+        "",
+        generated_text[:transcript_end],
+        count=1,
+        flags=re.IGNORECASE,
+    ).strip()
+
+    summaries = {}
+    for i, marker in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(generated_text)
+        summary = generated_text[marker.end() : end].strip()
+        if summary:
+            summaries[marker.group(1).lower()] = summary
+
+    return transcript, summaries
+
+
+def generate_video_styles(video_input, video_id, styles, deadline):
+    """
+    Generate several summary styles of a video from one model call and cache
+    each style separately
+
+    Styles missing from the response are derived from its transcript; if the
+    combined call fails, each style is summarized on its own.
+
+    Returns:
+        dict: Summary data or error message per style
+    """
+    from .views import ensure_youtube_url, summarize_video
+
+    model = get_model()
+    if model is None:
+        return {
+            style: {"error": API_KEY_MISSING_ERROR, "retriable": False}
+            for style in styles
+        }
+
+    video_url = ensure_youtube_url(video_input)
+
+    try:
+        generated_text = generate_text(
+            model, build_multi_style_prompt(video_url, styles), deadline, "multi-style prompt"
+        )
+    except GenerationError as e:
+        print(f"Multi-style prompt failed: {str(e)}. Summarizing each style separately...")
+        return {
+            style: summarize_video(video_input, style, use_cache=False, deadline=deadline)
+            for style in styles
+        }
+
+    transcript, summaries = parse_multi_style_response(generated_text, styles)
+    results = {}
+
+    for style in styles:
+        summary = summaries.get(style)
+
+        if not summary and transcript:
+            print(f"No {style} summary in the response, deriving it from the transcript")
+            try:
+                summary = summarize_transcript_text(model, transcript, style, deadline)
+            except GenerationError as e:
+                print(f"Could not derive {style} summary: {str(e)}")
+
+        if not summary:
+            results[style] = summarize_video(
+                video_input, style, use_cache=False, deadline=deadline
+            )
+            continue
+
+        results[style] = {
+            "title": f"Video URL: {video_url}",
+            "video_id": video_id,
+            "transcript": transcript,
+            "summary": summary,
+            "style": style,
+            "model": model.model_name,
+        }
+        set_cached_summary(video_id, style, results[style])
+
+    save_transcript(video_id, transcript, model.model_name)
+
+    return results
+
+
+def summarize_video_styles(
+    video_input, styles, use_cache=True, deadline=None, duration=None, long_video=None
+):
+    """
+    Summarize a video in several styles, paying for a single pass over the
+    video for all styles that are not cached yet
+
+    Videos with a stored transcript are summarized style by style from it, and
+    long videos style by style in time windows (see summarize/longvideo.py).
+
+    Args:
+        video_input (str): YouTube video URL or ID
+        styles (list): Summary styles
+        use_cache (bool): Whether to read cached summaries
+        deadline (Deadline): Time budget shared by every style
+        duration (int): Video length in seconds, if known
+        long_video (bool): Long-video mode, see resolve_long_video
+
+    Returns:
+        dict: Summary data or error message per style, in the order of `styles`
+    """
+    from .views import (
+        ensure_youtube_url,
+        extract_video_id_from_url,
+        resolve_long_video,
+        summarize_video,
+    )
+
+    if deadline is None:
+        deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
+
+    styles = list(dict.fromkeys(styles))
+    video_id = extract_video_id_from_url(ensure_youtube_url(video_input))
+    results = {}
+
+    if use_cache:
+        for style in styles:
+            cached = get_cached_summary(video_id, style, tier_models())
+            if cached is not None:
+                results[style] = {**cached, "cached": True}
+
+    missing = [style for style in styles if style not in results]
+    if missing:
+        long_video, duration = resolve_long_video(video_input, duration, long_video)
+
+    # With a stored transcript each style is a cheap text-only summary, so
+    # there is no video pass to share
+    if len(missing) == 1 or (missing and (long_video or get_transcript(video_id))):
+        for style in missing:
+            results[style] = summarize_video(
+                video_input,
+                style,
+                use_cache=use_cache,
+                deadline=deadline,
+                duration=duration,
+                long_video=long_video,
+            )
+    elif missing:
+        print(f"Summarizing video {video_id} in styles {', '.join(missing)} at once")
+
+        def recheck_cache():
+            # Another process may have generated them while we waited
+            cached = {
+                style: get_cached_summary(video_id, style, tier_models())
+                for style in missing
+            }
+            if all(data is not None for data in cached.values()):
+                return {style: {**data, "cached": True} for style, data in cached.items()}
+            return None
+
+        def generate():
+            try:
+                return generate_video_styles(video_input, video_id, missing, deadline)
+            except DeadlineExceeded as e:
+                print(f"Deadline exceeded for video {video_id}: {str(e)}")
+                error = {"error": str(e), "deadline_exceeded": True, "stage": e.stage}
+                return {style: error for style in missing}
+
+        generated = run_once(
+            f"{video_id}|{'+'.join(sorted(missing))}",
+            generate,
+            recheck=recheck_cache if use_cache else None,
+            timeout=deadline.remaining(),
+        )
+        results.update(generated)
+
+    return {style: results[style] for style in styles}
@@ -0,0 +1,353 @@
+import asyncio
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from django.conf import settings
+
+from django_project.metrics import RETRIES, STAGE_SECONDS
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that refills continuously up to its capacity
+    """
+
+    def __init__(self, capacity, refill_per_second):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second
+        )
+        self.updated_at = now
+
+    def try_take(self, amount):
+        """
+        Take tokens from the bucket if enough are available, without waiting
+
+        Args:
+            amount (float): Number of tokens; capped at the bucket capacity so
+                oversized requests still go through once the bucket is full
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the seconds until
+                enough tokens will be available
+        """
+        amount = min(amount, self.capacity)
+
+        with self.lock:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.refill_per_second
+
+    def take(self, amount):
+        """
+        Take tokens from the bucket, waiting until enough are available
+
+        Args:
+            amount (float): Number of tokens, see try_take
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+
+        while True:
+            wait_time = self.try_take(amount)
+            if not wait_time:
+                return waited
+
+            time.sleep(wait_time)
+            waited += wait_time
+
+    async def take_async(self, amount):
+        """
+        Like take, but waits with asyncio.sleep so the event loop keeps running
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+
+        while True:
+            wait_time = self.try_take(amount)
+            if not wait_time:
+                return waited
+
+            await asyncio.sleep(wait_time)
+            waited += wait_time
+
+    def adjust(self, amount):
+        """
+        Charge (positive) or refund (negative) tokens without waiting, e.g. once
+        the real usage of a request is known
+        """
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+def is_rate_limit_error(error):
+    """
+    Check whether an exception means the API quota was exceeded
+
+    Args:
+        error (Exception): Exception raised by a Gemini call
+
+    Returns:
+        bool: True for 429 / resource-exhausted errors
+    """
+    if getattr(error, "code", None) == 429:
+        return True
+
+    message = str(error).lower()
+    return (
+        "429" in message
+        or "resource exhausted" in message
+        or "resource_exhausted" in message
+        or "quota" in message
+    )
+
+
+def _wake(waiter):
+    # A waiter that was cancelled meanwhile is already done
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class GeminiRateLimiter:
+    """
+    Process-wide limiter for Gemini calls.
+
+    Requests-per-minute and tokens-per-minute budgets are enforced with token
+    buckets. The number of concurrent calls adapts AIMD-style: it is halved
+    whenever the API reports that the quota was exceeded and grows by one
+    slot for every `limit` successful calls.
+
+    Threads (acquire/slot) and coroutines (acquire_async/slot_async) share the
+    same budgets and slots.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute, max_concurrency):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.max_concurrency = max_concurrency
+        self.concurrency_limit = float(max_concurrency)
+        self.in_flight = 0
+        self.condition = threading.Condition()
+        # (event loop, future) of coroutines waiting for a slot
+        self.async_waiters = []
+        # time.monotonic() of the last call that hit the quota
+        self.rate_limited_at = None
+
+    def acquire(self, estimated_tokens):
+        """
+        Wait for a concurrency slot and for request and token budget
+
+        Args:
+            estimated_tokens (int): Expected total tokens of the call
+        """
+        with self.condition:
+            while self.in_flight >= int(self.concurrency_limit):
+                self.condition.wait()
+            self.in_flight += 1
+
+        try:
+            self.requests.take(1)
+            self.tokens.take(estimated_tokens)
+        except BaseException:
+            self.release()
+            raise
+
+    async def acquire_async(self, estimated_tokens):
+        """
+        Wait for a concurrency slot and for request and token budget without
+        blocking the event loop
+
+        Args:
+            estimated_tokens (int): Expected total tokens of the call
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            with self.condition:
+                if self.in_flight < int(self.concurrency_limit):
+                    self.in_flight += 1
+                    break
+                waiter = loop.create_future()
+                self.async_waiters.append((loop, waiter))
+
+            # Woken by release(); the slot may be taken again by then, so check again
+            await waiter
+
+        try:
+            await self.requests.take_async(1)
+            await self.tokens.take_async(estimated_tokens)
+        except BaseException:
+            self.release()
+            raise
+
+    def release(self, rate_limited=False, succeeded=False):
+        """
+        Free a concurrency slot and adapt the concurrency limit
+
+        Args:
+            rate_limited (bool): Whether the call failed because of the quota
+            succeeded (bool): Whether the call succeeded
+        """
+        with self.condition:
+            self.in_flight -= 1
+
+            if rate_limited:
+                self.rate_limited_at = time.monotonic()
+                self.concurrency_limit = max(1.0, self.concurrency_limit / 2)
+                print(
+                    f"Gemini quota exceeded, concurrency limit lowered to {int(self.concurrency_limit)}"
+                )
+            elif succeeded:
+                self.concurrency_limit = min(
+                    float(self.max_concurrency),
+                    self.concurrency_limit + 1 / self.concurrency_limit,
+                )
+
+            self.condition.notify_all()
+            async_waiters, self.async_waiters = self.async_waiters, []
+
+        for loop, waiter in async_waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # The waiter's event loop has been closed
+                pass
+
+    def rate_limited_within(self, seconds):
+        """
+        Check whether a call hit the quota in the last `seconds` seconds
+
+        Returns:
+            bool: True if it did
+        """
+        with self.condition:
+            rate_limited_at = self.rate_limited_at
+
+        return rate_limited_at is not None and time.monotonic() - rate_limited_at < seconds
+
+    @contextmanager
+    def slot(self, estimated_tokens):
+        """
+        Context manager around a Gemini call. The yielded dict can be given the
+        call's real token usage as "total_tokens" to correct the estimate.
+        """
+        with STAGE_SECONDS.time(stage="rate_limit_wait"):
+            self.acquire(estimated_tokens)
+        usage = {}
+
+        try:
+            yield usage
+        except Exception as e:
+            self.release(rate_limited=is_rate_limit_error(e))
+            raise
+        except BaseException:
+            self.release()
+            raise
+        else:
+            if usage.get("total_tokens"):
+                self.tokens.adjust(usage["total_tokens"] - estimated_tokens)
+            self.release(succeeded=True)
+
+    @asynccontextmanager
+    async def slot_async(self, estimated_tokens):
+        """
+        Async version of slot, for calls made from coroutines
+        """
+        with STAGE_SECONDS.time(stage="rate_limit_wait"):
+            await self.acquire_async(estimated_tokens)
+        usage = {}
+
+        try:
+            yield usage
+        except Exception as e:
+            self.release(rate_limited=is_rate_limit_error(e))
+            raise
+        except BaseException:
+            self.release()
+            raise
+        else:
+            if usage.get("total_tokens"):
+                self.tokens.adjust(usage["total_tokens"] - estimated_tokens)
+            self.release(succeeded=True)
+
+    @staticmethod
+    def backoff_delay(attempt):
+        """
+        Jittered exponential backoff before the next attempt
+
+        Args:
+            attempt (int): 0-based number of the attempt that just failed
+
+        Returns:
+            float: Seconds to wait
+        """
+        delay = min(
+            settings.GEMINI_BACKOFF_MAX,
+            settings.GEMINI_BACKOFF_BASE * (2**attempt),
+        )
+        # "Equal jitter": wait at least half the delay, spread the rest randomly
+        delay = delay / 2 + random.uniform(0, delay / 2)
+
+        # Every retry waits for a backoff delay first, so this counts them
+        RETRIES.inc()
+        STAGE_SECONDS.observe(delay, stage="backoff_sleep")
+        return delay
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_gemini_limiter():
+    """
+    Get the process-wide Gemini rate limiter
+
+    Returns:
+        GeminiRateLimiter: Shared limiter configured from settings
+    """
+    global _limiter
+
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = GeminiRateLimiter(
+                settings.GEMINI_REQUESTS_PER_MINUTE,
+                settings.GEMINI_TOKENS_PER_MINUTE,
+                settings.GEMINI_MAX_CONCURRENCY,
+            )
+        return _limiter
+
+
+def estimate_tokens(prompt, output_tokens=None):
+    """
+    Rough token estimate for a Gemini call made with the given prompt
+
+    Args:
+        prompt (str): Prompt text
+        output_tokens (int): Output limit of the call, defaults to
+            settings.GEMINI_EXPECTED_OUTPUT_TOKENS
+
+    Returns:
+        int: Expected prompt plus output tokens
+    """
+    if output_tokens is None:
+        output_tokens = settings.GEMINI_EXPECTED_OUTPUT_TOKENS
+
+    # About four characters per token for English text
+    return len(prompt) // 4 + output_tokens
+
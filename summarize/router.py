@@ -0,0 +1,240 @@
+from django.conf import settings
+
+from django_project.metrics import MODEL_ESCALATIONS, MODEL_ROUTES
+
+from .transcripts import MIN_TRANSCRIPT_CHARS
+
+# Values of the "model_tier" request option besides the tier names: "auto"
+# lets the router pick the tier and escalate
+AUTO_TIER = "auto"
+
+# Minimum summary length per style; shorter output is treated as a failed answer
+MIN_SUMMARY_CHARS = {"short": 80}
+DEFAULT_MIN_SUMMARY_CHARS = 300
+
+# Phrases of a model explaining that it could not watch or summarize the video
+REFUSAL_PHRASES = (
+    "i'm unable to",
+    "i am unable to",
+    "i cannot access",
+    "i can't access",
+    "i'm not able to",
+    "unable to watch",
+    "unable to access",
+    "don't have access",
+    "do not have access",
+    "as an ai",
+)
+
+
+def tier_names():
+    """
+    Returns:
+        list: Configured tiers, from the cheapest to the most capable model
+    """
+    return list(settings.GEMINI_MODEL_TIERS)
+
+
+def validate_model_tier(tier):
+    """
+    Check a "model_tier" request option
+
+    Args:
+        tier (str): "auto", None or a tier name
+
+    Raises:
+        ValueError: If the tier is unknown
+    """
+    if tier not in (None, AUTO_TIER) and tier not in settings.GEMINI_MODEL_TIERS:
+        raise ValueError(
+            f"model_tier must be one of: {', '.join([AUTO_TIER] + tier_names())}"
+        )
+
+
+def estimate_video_tokens(duration):
+    """
+    Estimate the input tokens of having the model watch a video
+
+    Args:
+        duration (int): Video length in seconds
+
+    Returns:
+        int: Estimated tokens
+    """
+    return int(duration * settings.GEMINI_VIDEO_TOKENS_PER_SECOND)
+
+
+def choose_tier(style, duration=None, deadline=None):
+    """
+    Pick the cheapest tier suited to a request
+
+    The most capable tier is used for styles listed in
+    settings.ROUTER_CAPABLE_STYLES and for videos estimated to need more than
+    settings.ROUTER_FAST_MAX_INPUT_TOKENS input tokens, unless the time budget
+    is shorter than settings.ROUTER_FAST_DEADLINE_SECONDS.
+
+    Args:
+        style (str): Summary style
+        duration (int): Video length in seconds, if known
+        deadline (Deadline): Time budget of the request
+
+    Returns:
+        tuple: (tier, reason)
+    """
+    tiers = tier_names()
+    cheapest, most_capable = tiers[0], tiers[-1]
+
+    if (
+        deadline is not None
+        and deadline.remaining() < settings.ROUTER_FAST_DEADLINE_SECONDS
+    ):
+        return cheapest, "short time budget"
+
+    if style in settings.ROUTER_CAPABLE_STYLES:
+        return most_capable, f"{style} style"
+
+    if (
+        duration is not None
+        and estimate_video_tokens(duration) > settings.ROUTER_FAST_MAX_INPUT_TOKENS
+    ):
+        return most_capable, "long video"
+
+    return cheapest, "default"
+
+
+def route_models(style, duration=None, deadline=None, tier=None):
+    """
+    Get the models to try for a request, in escalation order
+
+    Args:
+        style (str): Summary style
+        duration (int): Video length in seconds, if known
+        deadline (Deadline): Time budget of the request
+        tier (str): "auto" (default) to let the router decide and escalate,
+            or a tier name to use that tier only
+
+    Returns:
+        list: Model names; each one after the first is only tried if the
+            previous model's output fails validate_summary
+
+    Raises:
+        ValueError: If the tier is unknown
+    """
+    validate_model_tier(tier)
+    tiers = tier_names()
+
+    if tier in (None, AUTO_TIER):
+        tier, reason = choose_tier(style, duration, deadline)
+        escalate = True
+    else:
+        reason = "requested"
+        escalate = False
+
+    MODEL_ROUTES.inc(tier=tier, reason=reason)
+
+    chosen = tiers[tiers.index(tier) :] if escalate else [tier]
+    # Tiers may share a model; trying it twice would not help
+    return list(dict.fromkeys(settings.GEMINI_MODEL_TIERS[name] for name in chosen))
+
+
+def tier_models(tier=None):
+    """
+    Get the models whose cached summaries can answer a request for a tier
+
+    Args:
+        tier (str): Requested tier, "auto" or None
+
+    Returns:
+        list: Model names, preferred first: the tier's model, or for "auto"
+            every tier's model from the most capable down, then the
+            fallback models
+    """
+    if tier not in (None, AUTO_TIER):
+        return [settings.GEMINI_MODEL_TIERS[tier]]
+
+    models = [settings.GEMINI_MODEL_TIERS[name] for name in reversed(tier_names())]
+    return list(dict.fromkeys(models + list(settings.GEMINI_FALLBACK_MODELS)))
+
+
+def validate_summary(response_data, style):
+    """
+    Check that a model's answer is a usable summary
+
+    Args:
+        response_data (dict): Transcript and summary data
+        style (str): Summary style
+
+    Returns:
+        str: What is wrong with the answer, or None if it is usable
+    """
+    summary = (response_data.get("summary") or "").strip()
+
+    if len(summary) < MIN_SUMMARY_CHARS.get(style, DEFAULT_MIN_SUMMARY_CHARS):
+        return "summary too short"
+
+    if any(phrase in summary[:500].lower() for phrase in REFUSAL_PHRASES):
+        return "model could not process the video"
+
+    # The detailed prompt also asks for the transcript, which later summaries reuse
+    if "raw_response" in response_data and (
+        len((response_data.get("transcript") or "").lstrip(":*").strip())
+        < MIN_TRANSCRIPT_CHARS
+    ):
+        return "transcript missing"
+
+    return None
+
+
+def _next_model(models, index, response_data, style):
+    """
+    Decide whether to escalate after the model at `index` answered
+
+    Returns:
+        bool: True if the next model should be tried
+    """
+    if response_data is None or index == len(models) - 1:
+        return False
+
+    if "error" in response_data:
+        # Errors have their own retries and fallbacks
+        return False
+
+    problem = validate_summary(response_data, style)
+    if problem is None:
+        return False
+
+    print(
+        f"Output of {models[index]} failed validation ({problem}), trying {models[index + 1]}"
+    )
+    MODEL_ESCALATIONS.inc(reason=problem)
+    return True
+
+
+def run_with_escalation(models, style, summarize):
+    """
+    Summarize with the first model, moving on to the next one while the
+    output fails validation
+
+    Args:
+        models (list): Model names from route_models
+        style (str): Summary style
+        summarize (callable): Called with a model name, returns summary data,
+            an error message, or None if the method does not apply
+
+    Returns:
+        dict: The last model's summary data or error message, or None
+    """
+    for index, model_name in enumerate(models):
+        response_data = summarize(model_name)
+        if not _next_model(models, index, response_data, style):
+            return response_data
+
+
+async def run_with_escalation_async(models, style, summarize):
+    """
+    Async version of run_with_escalation; `summarize` returns an awaitable
+    """
+    for index, model_name in enumerate(models):
+        response_data = await summarize(model_name)
+        if not _next_model(models, index, response_data, style):
+            return response_data
@@ -0,0 +1,209 @@
+import re
+
+from django.db import DatabaseError, connection
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Summary, Transcript
+
+# SQLite FTS5 table holding one row per Summary (rowid = Summary.id), created
+# by migration 0002_search_index
+SEARCH_TABLE = "summarize_search_index"
+
+# bm25 weights of the title, summary and transcript columns: a match in the
+# title or summary says more about the video than one in the transcript.
+# Changing them needs a migration that sets the index's "rank" option again.
+COLUMN_WEIGHTS = (5.0, 2.0, 1.0)
+
+MAX_SEARCH_RESULTS = 100
+
+# Set once the index has been found, so writes don't look it up every time
+_index_found = False
+
+
+class SearchUnavailable(Exception):
+    """
+    The database has no full-text index (not SQLite, or SQLite without FTS5)
+    """
+
+
+def search_available():
+    """
+    Returns:
+        bool: Whether the full-text index exists in the database
+    """
+    global _index_found
+
+    if not _index_found and connection.vendor == "sqlite":
+        _index_found = SEARCH_TABLE in connection.introspection.table_names()
+    return _index_found
+
+
+def index_video(video_id):
+    """
+    Bring the index entries of a video's summaries up to date. Called whenever
+    a summary or the video's transcript is stored.
+
+    Args:
+        video_id (str): Canonical YouTube video ID
+    """
+    if not search_available():
+        return
+
+    rows = Summary.objects.filter(video__video_id=video_id).select_related(
+        "video", "video__transcript"
+    )
+
+    try:
+        with connection.cursor() as cursor:
+            for row in rows:
+                transcript = getattr(row.video, "transcript", None)
+                cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [row.pk])
+                cursor.execute(
+                    f"INSERT INTO {SEARCH_TABLE} (rowid, title, summary, transcript) "
+                    "VALUES (%s, %s, %s, %s)",
+                    [
+                        row.pk,
+                        row.video.title,
+                        row.summary,
+                        transcript.text if transcript is not None else "",
+                    ],
+                )
+    except DatabaseError as e:
+        # The summary itself is stored; only searching for it is affected
+        print(f"Could not index video {video_id} for search: {str(e)}")
+
+
+@receiver(post_delete, sender=Summary, dispatch_uid="summarize_search_unindex")
+def unindex_summary(sender, instance, **kwargs):
+    """
+    Remove a deleted summary from the index, including summaries deleted
+    along with their video
+    """
+    if not search_available():
+        return
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [instance.pk])
+    except DatabaseError as e:
+        print(f"Could not remove summary {instance.pk} from search: {str(e)}")
+
+
+@receiver(post_delete, sender=Transcript, dispatch_uid="summarize_search_transcript")
+def unindex_transcript(sender, instance, **kwargs):
+    """
+    Drop a deleted transcript's text from the index entries of its video
+    """
+    if not search_available():
+        return
+
+    rows = Summary.objects.filter(video_id=instance.video_id).values_list(
+        "pk", flat=True
+    )
+
+    try:
+        with connection.cursor() as cursor:
+            for pk in rows:
+                cursor.execute(
+                    f"UPDATE {SEARCH_TABLE} SET transcript = '' WHERE rowid = %s", [pk]
+                )
+    except DatabaseError as e:
+        print(f"Could not remove a transcript from search: {str(e)}")
+
+
+def build_match_query(query):
+    """
+    Turn free text into an FTS5 query matching all of its words. Words are
+    quoted so that FTS5 operators and punctuation in user input are literal;
+    a trailing "*" keeps its prefix-search meaning.
+
+    Args:
+        query (str): Search text
+
+    Returns:
+        str: FTS5 MATCH expression, or "" if the text has no words
+    """
+    terms = []
+    for word, prefix in re.findall(r"(\w+)(\*?)", query):
+        terms.append(f'"{word}"{prefix}')
+
+    return " ".join(terms)
+
+
+def search_summaries(query, style=None, playlist_id=None, limit=20):
+    """
+    Rank stored summaries and transcripts by how well they match a query
+
+    Args:
+        query (str): Search text
+        style (str): Only search summaries of this style
+        playlist_id (str): Only search videos currently in this playlist
+        limit (int): Maximum number of results
+
+    Returns:
+        list: Result dictionaries, best match first
+
+    Raises:
+        SearchUnavailable: If the database has no full-text index
+    """
+    if not search_available():
+        raise SearchUnavailable(
+            "Full-text search needs the SQLite database with FTS5 support"
+        )
+
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    filters = ""
+    params = [match]
+
+    if style:
+        filters += " AND s.style = %s"
+        params.append(style)
+
+    if playlist_id:
+        filters += """
+            AND s.video_id IN (
+                SELECT m.video_id
+                FROM get_links_from_playlist_playlistmembership m
+                JOIN get_links_from_playlist_playlist p ON p.id = m.playlist_id
+                WHERE p.playlist_id = %s AND m.removed_at IS NULL
+            )
+        """
+        params.append(playlist_id)
+
+    params.append(max(1, min(limit, MAX_SEARCH_RESULTS)))
+
+    # Ranking by the table's "rank" column (bm25 with COLUMN_WEIGHTS, set by
+    # the migration) lets FTS5 sort the matches itself; snippets are only
+    # built for the rows that make the limit
+    sql = f"""
+        SELECT v.video_id, v.title, v.url, s.style, s.model_name,
+               snippet({SEARCH_TABLE}, -1, '[', ']', '...', 16), {SEARCH_TABLE}.rank
+        FROM {SEARCH_TABLE}
+        JOIN summarize_summary s ON s.id = {SEARCH_TABLE}.rowid
+        JOIN get_links_from_playlist_video v ON v.id = s.video_id
+        WHERE {SEARCH_TABLE} MATCH %s {filters}
+        ORDER BY {SEARCH_TABLE}.rank
+        LIMIT %s
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    return [
+        {
+            "video_id": video_id,
+            "title": title,
+            "url": url,
+            "style": summary_style,
+            "model": model_name,
+            "snippet": snippet,
+            # bm25 scores are negative; flip them so higher is better
+            "score": round(-score, 6),
+        }
+        for video_id, title, url, summary_style, model_name, snippet, score in rows
+    ]
@@ -0,0 +1,165 @@
+import hashlib
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:
+    # No file locks on Windows: requests are only coalesced within a process
+    fcntl = None
+
+# Generations in progress in this process, by key
+_flights = {}
+_flights_lock = threading.Lock()
+
+# How often (seconds) a process waiting for another process's lock checks it again
+LOCK_POLL_INTERVAL = 0.2
+
+
+class Flight:
+    """
+    One generation of a key. The leader does the work; followers that asked
+    for the same key meanwhile wait for the leader's result.
+
+    Attributes:
+        leader (bool): Whether this caller has to do the work
+        result: The leader's result, for followers; None if the leader failed
+            to produce one in time and the follower has to do the work itself
+    """
+
+    def __init__(self, key, leader):
+        self.key = key
+        self.leader = leader
+        self.result = None
+        self.done = threading.Event()
+        self.lock_file = None
+
+
+def _lock_path(key):
+    lock_dir = Path(settings.CACHES["summaries"]["LOCATION"]) / "locks"
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    return lock_dir / (hashlib.sha256(key.encode("utf-8")).hexdigest() + ".lock")
+
+
+def _lock_across_processes(flight, timeout):
+    """
+    Take the key's file lock, waiting at most `timeout` seconds for another
+    process that holds it. After a timeout the work is done without the lock.
+    """
+    if fcntl is None:
+        return
+
+    lock_file = open(_lock_path(flight.key), "a")
+    give_up_at = time.monotonic() + timeout
+
+    while True:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            flight.lock_file = lock_file
+            return
+        except BlockingIOError:
+            if time.monotonic() >= give_up_at:
+                print(f"Gave up waiting for another process generating {flight.key}")
+                lock_file.close()
+                return
+            time.sleep(LOCK_POLL_INTERVAL)
+
+
+def begin(key, timeout):
+    """
+    Join the generation of `key` in progress, or start one
+
+    A follower waits (at most `timeout` seconds) for the leader in this process
+    and gets its result. A leader also waits for any other process working on
+    the same key, so it should look the result up again (e.g. in the cache)
+    before doing the work itself.
+
+    Args:
+        key (str): Identifies the work, e.g. "video_id|style"
+        timeout (float): Maximum seconds to wait for another caller
+
+    Returns:
+        Flight: Call finish() on it when leader is True
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = Flight(key, leader=True)
+            _flights[key] = flight
+
+    if not leader:
+        follower = Flight(key, leader=False)
+        if flight.done.wait(timeout):
+            follower.result = flight.result
+        return follower
+
+    _lock_across_processes(flight, timeout)
+    return flight
+
+
+def finish(flight, result, share=True):
+    """
+    Hand the leader's result to its followers and release the key
+
+    Args:
+        flight (Flight): Flight returned by begin() with leader True
+        result: Result of the work
+        share (bool): False if the result is specific to the leader (e.g. it ran
+            out of its own time budget) and followers should do the work instead
+    """
+    if flight.lock_file is not None:
+        fcntl.flock(flight.lock_file, fcntl.LOCK_UN)
+        flight.lock_file.close()
+        flight.lock_file = None
+
+    with _flights_lock:
+        if _flights.get(flight.key) is flight:
+            del _flights[flight.key]
+
+    flight.result = result if share else None
+    flight.done.set()
+
+
+def run_once(key, work, recheck=None, timeout=None):
+    """
+    Run `work` for a key once, however many callers ask for it at the same time
+
+    Args:
+        key (str): Identifies the work, e.g. "video_id|style"
+        work (callable): Produces the result
+        recheck (callable): Looks up a result stored by another process in the
+            meantime; returns None if there is none
+        timeout (float): Maximum seconds to wait for another caller, defaults
+            to settings.SUMMARY_DEADLINE_SECONDS
+
+    Returns:
+        The result of `work`, or of the same work done by another caller
+    """
+    if timeout is None:
+        timeout = settings.SUMMARY_DEADLINE_SECONDS
+
+    flight = begin(key, timeout)
+
+    if not flight.leader:
+        if flight.result is not None:
+            print(f"Reusing in-flight result for {key}")
+            return flight.result
+        return work()
+
+    result = None
+    try:
+        if recheck is not None:
+            result = recheck()
+        if result is None:
+            result = work()
+        return result
+    finally:
+        finish(
+            flight,
+            result,
+            share=not (isinstance(result, dict) and result.get("deadline_exceeded")),
+        )
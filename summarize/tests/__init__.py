@@ -0,0 +1,28 @@
+import os
+import tempfile
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+TEST_TIERS = {"fast": "gemini-1.5-flash", "capable": "gemini-1.5-pro"}
+
+TEST_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "summaries": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        # Also where summarize/singleflight.py keeps its lock files
+        "LOCATION": os.path.join(tempfile.gettempdir(), "summarize-tests"),
+    },
+}
+
+
+def summary_data(
+    model, text="A usable summary. " * 30, video_id=VIDEO_ID, style="short"
+):
+    return {
+        "title": f"Video ID: {video_id}",
+        "video_id": video_id,
+        "transcript": "",
+        "summary": text,
+        "style": style,
+        "model": model,
+    }
@@ -0,0 +1,186 @@
+import asyncio
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from .. import aio
+from ..cache import set_cached_summary
+from ..deadline import Deadline
+from . import TEST_CACHES, TEST_TIERS, VIDEO_ID, summary_data
+
+ROUTER_SETTINGS = {
+    "GEMINI_MODEL_TIERS": TEST_TIERS,
+    "GEMINI_FALLBACK_MODELS": [],
+    "ROUTER_CAPABLE_STYLES": ["academic", "technical"],
+    "ROUTER_FAST_MAX_INPUT_TOKENS": 300_000,
+    "ROUTER_FAST_DEADLINE_SECONDS": 60,
+    "GEMINI_VIDEO_TOKENS_PER_SECOND": 300,
+    "DEGRADED_MODE_SECONDS": 0,
+}
+
+
+# Transactional: the cache lookup falls back to the database from a worker thread
+@override_settings(CACHES=TEST_CACHES, **ROUTER_SETTINGS)
+class SummarizeVideoAsyncTests(TransactionTestCase):
+    def setUp(self):
+        caches["summaries"].clear()
+        self.calls = []
+
+    async def slow_generation(self, video_input, video_id, style, *args):
+        self.calls.append((video_id, style))
+        await asyncio.sleep(0.05)
+        return summary_data(TEST_TIERS["fast"], video_id=video_id, style=style)
+
+    def test_cache_hit_skips_generation(self):
+        set_cached_summary(VIDEO_ID, "short", summary_data(TEST_TIERS["fast"]))
+
+        with mock.patch.object(aio, "generate_video_summary_async") as generate:
+            result = asyncio.run(aio.summarize_video_async(VIDEO_ID, "short"))
+
+        self.assertTrue(result["cached"])
+        generate.assert_not_called()
+
+    def test_concurrent_requests_share_one_generation(self):
+        async def summarize_twice():
+            return await asyncio.gather(
+                aio.summarize_video_async(VIDEO_ID, "short"),
+                aio.summarize_video_async(f"https://youtu.be/{VIDEO_ID}", "short"),
+                aio.summarize_video_async(VIDEO_ID, "detailed"),
+            )
+
+        with mock.patch.object(
+            aio, "generate_video_summary_async", self.slow_generation
+        ):
+            short, same_short, detailed = asyncio.run(summarize_twice())
+
+        self.assertEqual(short, same_short)
+        self.assertEqual(detailed["style"], "detailed")
+        self.assertEqual(self.calls, [(VIDEO_ID, "short"), (VIDEO_ID, "detailed")])
+        self.assertEqual(aio._flights, {})
+
+    def test_waiting_past_the_deadline_is_reported(self):
+        with mock.patch.object(
+            aio, "generate_video_summary_async", self.slow_generation
+        ):
+            result = asyncio.run(
+                aio.summarize_video_async(VIDEO_ID, "short", deadline=Deadline(0.01))
+            )
+
+        self.assertTrue(result["deadline_exceeded"])
+
+
+@override_settings(CACHES=TEST_CACHES, **ROUTER_SETTINGS)
+@mock.patch.object(aio, "store_summary")
+@mock.patch.object(aio, "resolve_long_video", return_value=(False, 60))
+@mock.patch.object(aio, "summarize_stored_transcript_async")
+class GenerateVideoSummaryAsyncTests(SimpleTestCase):
+    def setUp(self):
+        self.models = []
+
+    def generate(self, stored_transcript, answers, style="short", model_tier=None):
+        async def no_stored_transcript(*args, **kwargs):
+            return None
+
+        async def summarize_youtube_video(video_input, style, **kwargs):
+            self.models.append(kwargs["model_name"])
+            return answers[kwargs["model_name"]]
+
+        stored_transcript.side_effect = no_stored_transcript
+        with mock.patch.object(
+            aio, "summarize_youtube_video_async", summarize_youtube_video
+        ):
+            return asyncio.run(
+                aio.generate_video_summary_async(
+                    VIDEO_ID, VIDEO_ID, style, Deadline(120), 60, None, model_tier
+                )
+            )
+
+    def test_poor_output_escalates_to_the_capable_model(
+        self, stored_transcript, resolve, store
+    ):
+        result = self.generate(
+            stored_transcript,
+            {
+                TEST_TIERS["fast"]: summary_data(TEST_TIERS["fast"], "Too short."),
+                TEST_TIERS["capable"]: summary_data(TEST_TIERS["capable"]),
+            },
+        )
+
+        self.assertEqual(self.models, [TEST_TIERS["fast"], TEST_TIERS["capable"]])
+        self.assertEqual(result["model"], TEST_TIERS["capable"])
+        store.assert_called_once_with(VIDEO_ID, "short", result)
+
+    def test_fixed_tier_does_not_escalate(self, stored_transcript, resolve, store):
+        result = self.generate(
+            stored_transcript,
+            {TEST_TIERS["fast"]: summary_data(TEST_TIERS["fast"], "Too short.")},
+            model_tier="fast",
+        )
+
+        self.assertEqual(self.models, [TEST_TIERS["fast"]])
+        self.assertEqual(result["model"], TEST_TIERS["fast"])
+
+    def test_simple_prompt_fallback_uses_the_routed_model(
+        self, stored_transcript, resolve, store
+    ):
+        fallback_models = []
+
+        async def simple_prompt(video_input, style, **kwargs):
+            fallback_models.append(kwargs["model_name"])
+            return summary_data(kwargs["model_name"], style=style)
+
+        with mock.patch.object(
+            aio, "summarize_with_simple_prompt_async", simple_prompt
+        ):
+            result = self.generate(
+                stored_transcript,
+                {TEST_TIERS["capable"]: {"error": "Service unavailable"}},
+                style="technical",
+            )
+
+        self.assertEqual(self.models, [TEST_TIERS["capable"]])
+        self.assertEqual(fallback_models, [TEST_TIERS["capable"]])
+        self.assertEqual(result["model"], TEST_TIERS["capable"])
+
+
+@override_settings(CACHES=TEST_CACHES, **ROUTER_SETTINGS)
+class AsyncVideoSummaryViewTests(SimpleTestCase):
+    def post(self, data):
+        return self.client.post(
+            reverse("get_video_summary_async"), data, content_type="application/json"
+        )
+
+    def test_summary_is_returned(self):
+        async def summarize(video_input, style, **kwargs):
+            self.assertEqual(kwargs["model_tier"], "fast")
+            self.assertEqual(kwargs["duration"], 60)
+            return summary_data(TEST_TIERS["fast"], style=style)
+
+        with mock.patch.object(aio, "summarize_video_async", summarize):
+            response = self.post(
+                {
+                    "video_id": VIDEO_ID,
+                    "style": "short",
+                    "duration_seconds": "60",
+                    "model_tier": "fast",
+                }
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["model"], TEST_TIERS["fast"])
+
+    def test_deadline_exceeded_is_a_gateway_timeout(self):
+        async def summarize(video_input, style, **kwargs):
+            return {"error": "Time budget exceeded", "deadline_exceeded": True}
+
+        with mock.patch.object(aio, "summarize_video_async", summarize):
+            response = self.post({"video_id": VIDEO_ID})
+
+        self.assertEqual(response.status_code, 504)
+
+    def test_bad_requests_are_rejected(self):
+        for data in ({"style": "short"}, {"video_id": VIDEO_ID, "model_tier": "huge"}):
+            with self.subTest(data=data):
+                self.assertEqual(self.post(data).status_code, 400)
@@ -0,0 +1,113 @@
+import json
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..batch import iter_batch_summaries
+from ..cache import set_cached_summary
+from . import TEST_CACHES, summary_data
+
+CACHED_ID = "aaaaaaaaaaa"
+NEW_ID = "bbbbbbbbbbb"
+FAILING_ID = "ccccccccccc"
+
+
+def fake_summarize_video_styles(video_id, styles, **kwargs):
+    if video_id == FAILING_ID:
+        return {style: {"error": "Invalid video"} for style in styles}
+    return {
+        style: summary_data("gemini-1.5-pro", f"{style} of {video_id}", video_id, style)
+        for style in styles
+    }
+
+
+@override_settings(CACHES=TEST_CACHES, GEMINI_MODEL="gemini-1.5-pro")
+@mock.patch(
+    "summarize.batch.summarize_video_styles", side_effect=fake_summarize_video_styles
+)
+class BatchSummaryTests(TestCase):
+    def setUp(self):
+        caches["summaries"].clear()
+        cached = summary_data("gemini-1.5-pro", "cached short", CACHED_ID)
+        set_cached_summary(CACHED_ID, "short", cached)
+
+    def test_cached_videos_come_first_and_only_misses_are_generated(self, generate):
+        results = list(iter_batch_summaries([NEW_ID, CACHED_ID], ["short"]))
+
+        self.assertEqual(
+            [result["video_id"] for result in results], [CACHED_ID, NEW_ID]
+        )
+        self.assertEqual(results[0]["cached"], {"short": True})
+        self.assertEqual(results[1]["summaries"], {"short": f"short of {NEW_ID}"})
+        generate.assert_called_once()
+        self.assertEqual(generate.call_args.args, (NEW_ID, ["short"]))
+
+    def test_only_missing_styles_are_generated(self, generate):
+        results = list(iter_batch_summaries([CACHED_ID], ["short", "detailed"]))
+
+        self.assertEqual(generate.call_args.args, (CACHED_ID, ["detailed"]))
+        self.assertEqual(list(results[0]["summaries"]), ["short", "detailed"])
+        self.assertEqual(results[0]["cached"], {"short": True, "detailed": False})
+
+    def test_refresh_ignores_the_cache(self, generate):
+        results = list(iter_batch_summaries([CACHED_ID], ["short"], use_cache=False))
+
+        self.assertEqual(results[0]["summaries"], {"short": f"short of {CACHED_ID}"})
+
+    def test_endpoint_reports_each_video(self, generate):
+        response = self.client.post(
+            reverse("get_video_summaries_batch"),
+            {
+                "videos": [f"https://youtu.be/{CACHED_ID}", NEW_ID, FAILING_ID, NEW_ID],
+                "style": "short",
+            },
+            content_type="application/json",
+        )
+
+        body = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(body["success"])
+        self.assertEqual((body["succeeded"], body["failed"]), (2, 1))
+        self.assertEqual(
+            body["results"][FAILING_ID]["errors"], {"short": "Invalid video"}
+        )
+        # Repeated videos are summarized once
+        self.assertEqual(generate.call_count, 2)
+
+    def test_endpoint_streams_results(self, generate):
+        response = self.client.post(
+            reverse("get_video_summaries_batch"),
+            {"videos": [CACHED_ID, NEW_ID], "style": "short", "stream": True},
+            content_type="application/json",
+        )
+
+        events = b"".join(response.streaming_content).decode().strip().split("\n\n")
+        self.assertEqual(
+            [event.split("\n")[0] for event in events],
+            ["event: video", "event: video", "event: complete"],
+        )
+        self.assertEqual(
+            json.loads(events[-1].split("data: ", 1)[1]), {"succeeded": 2, "failed": 0}
+        )
+
+    def test_endpoint_rejects_bad_input(self, generate):
+        url = reverse("get_video_summaries_batch")
+
+        for body in (
+            {},
+            {"videos": []},
+            {"videos": ["https://www.youtube.com/@channel"]},
+            {"videos": [CACHED_ID], "max_workers": "many"},
+        ):
+            with self.subTest(body=body):
+                response = self.client.post(url, body, content_type="application/json")
+                self.assertEqual(response.status_code, 400)
+
+        with override_settings(BATCH_MAX_VIDEOS=1):
+            response = self.client.post(
+                url, {"videos": [CACHED_ID, NEW_ID]}, content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 400)
+        generate.assert_not_called()
@@ -0,0 +1,149 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from ..cache import (
+    PROMPT_VERSION,
+    get_cached_summary,
+    set_cached_summary,
+    summarized_video_ids,
+    summary_cache_key,
+)
+from ..engines import GeminiEngine
+from ..models import Summary
+from ..router import tier_models
+from ..views import summarize_video
+from . import TEST_CACHES, TEST_TIERS, VIDEO_ID, summary_data
+
+MODEL = "gemini-1.5-pro"
+
+
+@override_settings(CACHES=TEST_CACHES, GEMINI_MODEL=MODEL)
+class SummaryCacheTests(TestCase):
+    def setUp(self):
+        caches["summaries"].clear()
+
+    def test_cache_key_depends_on_video_style_and_prompt_version(self):
+        key = summary_cache_key(VIDEO_ID, "short", MODEL)
+
+        self.assertEqual(key, summary_cache_key(VIDEO_ID, "short", MODEL))
+        self.assertNotEqual(key, summary_cache_key("aaaaaaaaaaa", "short", MODEL))
+        self.assertNotEqual(key, summary_cache_key(VIDEO_ID, "detailed", MODEL))
+        self.assertNotEqual(
+            key,
+            summary_cache_key(
+                VIDEO_ID, "short", MODEL, prompt_version=PROMPT_VERSION + 1
+            ),
+        )
+
+    def test_stored_summary_is_served_from_the_cache(self):
+        set_cached_summary(VIDEO_ID, "short", summary_data(MODEL))
+
+        with self.assertNumQueries(0):
+            cached = get_cached_summary(VIDEO_ID, "short", [MODEL])
+
+        self.assertEqual(cached, summary_data(MODEL))
+
+    def test_database_keeps_summaries_the_cache_evicted(self):
+        set_cached_summary(VIDEO_ID, "short", summary_data(MODEL))
+        caches["summaries"].clear()
+
+        cached = get_cached_summary(VIDEO_ID, "short", [MODEL])
+
+        self.assertEqual(cached["summary"], summary_data(MODEL)["summary"])
+        # The database hit is put back in the cache
+        with self.assertNumQueries(0):
+            self.assertIsNotNone(get_cached_summary(VIDEO_ID, "short", [MODEL]))
+
+    def test_summaries_of_an_older_prompt_are_not_served(self):
+        set_cached_summary(VIDEO_ID, "short", summary_data(MODEL))
+        Summary.objects.update(prompt_version=PROMPT_VERSION - 1)
+        caches["summaries"].clear()
+
+        self.assertIsNone(get_cached_summary(VIDEO_ID, "short", [MODEL]))
+
+    def test_errors_are_not_cached(self):
+        set_cached_summary(VIDEO_ID, "short", {"error": "boom"})
+
+        self.assertIsNone(get_cached_summary(VIDEO_ID, "short", [MODEL]))
+        self.assertFalse(Summary.objects.exists())
+
+    def test_summarized_video_ids(self):
+        set_cached_summary(VIDEO_ID, "short", summary_data(MODEL))
+
+        self.assertEqual(
+            summarized_video_ids([VIDEO_ID, "aaaaaaaaaaa"], "short"), {VIDEO_ID}
+        )
+        self.assertEqual(summarized_video_ids([VIDEO_ID], "detailed"), set())
+
+
+@override_settings(
+    CACHES=TEST_CACHES,
+    GEMINI_MODEL=MODEL,
+    GEMINI_MODEL_TIERS=TEST_TIERS,
+    GEMINI_FALLBACK_MODELS=["gemini-1.0-pro"],
+    DEGRADED_MODE_SECONDS=0,
+)
+class ModelKeyedCacheTests(TestCase):
+    def setUp(self):
+        caches["summaries"].clear()
+
+    def test_cache_key_depends_on_the_model(self):
+        self.assertNotEqual(
+            summary_cache_key(VIDEO_ID, "short", "gemini-1.5-pro"),
+            summary_cache_key(VIDEO_ID, "short", "gemini-1.5-flash"),
+        )
+        self.assertEqual(
+            summary_cache_key(VIDEO_ID, "short", "models/gemini-1.5-pro"),
+            summary_cache_key(VIDEO_ID, "short", "gemini-1.5-pro"),
+        )
+
+    def test_summary_is_stored_under_the_model_that_wrote_it(self):
+        set_cached_summary(VIDEO_ID, "short", summary_data("models/gemini-1.5-flash"))
+
+        self.assertIsNone(get_cached_summary(VIDEO_ID, "short", tier_models("capable")))
+        self.assertIsNotNone(get_cached_summary(VIDEO_ID, "short", tier_models("fast")))
+        self.assertEqual(
+            list(Summary.objects.values_list("model_name", flat=True)),
+            ["gemini-1.5-flash"],
+        )
+
+    def test_database_fallback_reports_the_real_model(self):
+        set_cached_summary(VIDEO_ID, "short", summary_data("models/gemini-1.5-flash"))
+        caches["summaries"].clear()
+
+        self.assertIsNone(get_cached_summary(VIDEO_ID, "short", tier_models("capable")))
+        cached = get_cached_summary(VIDEO_ID, "short", tier_models("auto"))
+
+        self.assertEqual(cached["model"], "gemini-1.5-flash")
+
+    def test_tiers_do_not_overwrite_each_other(self):
+        set_cached_summary(
+            VIDEO_ID, "short", summary_data("models/gemini-1.5-flash", "fast " * 100)
+        )
+        set_cached_summary(
+            VIDEO_ID, "short", summary_data("models/gemini-1.5-pro", "capable " * 100)
+        )
+        caches["summaries"].clear()
+
+        fast = get_cached_summary(VIDEO_ID, "short", tier_models("fast"))
+        capable = get_cached_summary(VIDEO_ID, "short", tier_models("capable"))
+        auto = get_cached_summary(VIDEO_ID, "short", tier_models("auto"))
+
+        self.assertTrue(fast["summary"].startswith("fast"))
+        self.assertTrue(capable["summary"].startswith("capable"))
+        self.assertEqual(auto["model"], "gemini-1.5-pro")
+
+    def test_fixed_tier_request_skips_other_tiers_summary(self):
+        set_cached_summary(VIDEO_ID, "short", summary_data("models/gemini-1.5-flash"))
+
+        with mock.patch.object(
+            GeminiEngine, "summarize", return_value=summary_data("gemini-1.5-pro")
+        ) as generate:
+            auto = summarize_video(VIDEO_ID, "short")
+            capable = summarize_video(VIDEO_ID, "short", model_tier="capable")
+
+        self.assertTrue(auto["cached"])
+        self.assertEqual(capable["model"], "gemini-1.5-pro")
+        self.assertEqual(generate.call_count, 1)
@@ -0,0 +1,100 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..deadline import Deadline, DeadlineExceeded, is_retriable_error
+from ..gemini import GenerationError, generate_text
+
+
+class InvalidArgument(Exception):
+    """
+    Stands in for google.api_core.exceptions.InvalidArgument
+    """
+
+
+class DeadlineTests(SimpleTestCase):
+    def test_remaining_counts_down_and_never_goes_negative(self):
+        self.assertGreater(Deadline(60).remaining(), 59)
+        self.assertEqual(Deadline(-5).remaining(), 0.0)
+
+    def test_check_raises_once_the_budget_is_used_up(self):
+        Deadline(60).check("transcript")
+
+        with self.assertRaises(DeadlineExceeded) as raised:
+            Deadline(0).check("transcript")
+
+        self.assertEqual(raised.exception.stage, "transcript")
+        self.assertEqual(raised.exception.budget, 0)
+        self.assertIn("during transcript", str(raised.exception))
+
+    def test_sleep_that_would_use_up_the_budget_raises_at_once(self):
+        deadline = Deadline(5)
+
+        with mock.patch("time.sleep") as sleep:
+            deadline.sleep(1, "backoff")
+            with self.assertRaises(DeadlineExceeded):
+                deadline.sleep(10, "backoff")
+
+        sleep.assert_called_once_with(1)
+
+    def test_async_sleep_checks_the_budget_too(self):
+        with self.assertRaises(DeadlineExceeded):
+            asyncio.run(Deadline(1).sleep_async(10, "backoff"))
+
+
+class ErrorClassificationTests(SimpleTestCase):
+    def test_transient_and_quota_errors_are_retriable(self):
+        for error in (
+            Exception("503 Service Unavailable"),
+            Exception("429 Resource has been exhausted"),
+            TimeoutError("read timed out"),
+        ):
+            with self.subTest(error=error):
+                self.assertTrue(is_retriable_error(error))
+
+    def test_terminal_errors_are_not_retriable(self):
+        for error in (
+            InvalidArgument("400 request contains an invalid argument"),
+            Exception("API key not valid. Please pass a valid API key."),
+            Exception("Response blocked for safety reasons"),
+            Exception("Invalid video URL"),
+        ):
+            with self.subTest(error=error):
+                self.assertFalse(is_retriable_error(error))
+
+
+@mock.patch("summarize.gemini.get_gemini_limiter")
+class GenerateTextTests(SimpleTestCase):
+    def test_retriable_errors_are_retried(self, limiter):
+        limiter.return_value.backoff_delay.return_value = 0
+        responses = [Exception("503 Service Unavailable"), mock.Mock(text="Done.")]
+
+        with mock.patch("summarize.gemini.generate_content", side_effect=responses):
+            text = generate_text(None, "prompt", Deadline(60), "merge")
+
+        self.assertEqual(text, "Done.")
+
+    def test_terminal_errors_are_not_retried(self, limiter):
+        with mock.patch(
+            "summarize.gemini.generate_content",
+            side_effect=InvalidArgument("400 invalid argument"),
+        ) as generate:
+            with self.assertRaises(GenerationError) as raised:
+                generate_text(None, "prompt", Deadline(60), "merge")
+
+        self.assertFalse(raised.exception.retriable)
+        self.assertEqual(generate.call_count, 1)
+
+    def test_backoff_past_the_deadline_gives_up(self, limiter):
+        limiter.return_value.backoff_delay.return_value = 30
+
+        with mock.patch(
+            "summarize.gemini.generate_content",
+            side_effect=Exception("503 Service Unavailable"),
+        ) as generate:
+            with self.assertRaises(DeadlineExceeded) as raised:
+                generate_text(None, "prompt", Deadline(10), "merge")
+
+        self.assertEqual(raised.exception.stage, "backoff after merge attempt 1")
+        self.assertEqual(generate.call_count, 1)
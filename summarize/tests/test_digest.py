@@ -0,0 +1,25 @@
+from django.test import SimpleTestCase
+
+from ..digest import estimate_text_tokens, group_by_token_budget
+
+
+class DigestGroupingTests(SimpleTestCase):
+    def test_groups_fit_the_budget_and_keep_the_order(self):
+        texts = [f"summary {i} " + "word " * 40 for i in range(20)]
+        budget = estimate_text_tokens(texts[0]) * 3
+
+        groups = group_by_token_budget(texts, budget)
+
+        self.assertEqual([text for group in groups for text in group], texts)
+        for group in groups:
+            self.assertLessEqual(sum(map(estimate_text_tokens, group)), budget)
+
+    def test_oversized_texts_are_still_paired(self):
+        texts = ["word " * 1000 for _ in range(8)]
+
+        groups = group_by_token_budget(texts, budget=10)
+
+        self.assertEqual([len(group) for group in groups], [2, 2, 2, 2])
+
+    def test_everything_fits_in_one_group(self):
+        self.assertEqual(group_by_token_budget(["a", "b", "c"], 1000), [["a", "b", "c"]])
@@ -0,0 +1,121 @@
+import io
+import json
+import zipfile
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from get_links_from_playlist.models import Playlist
+from get_links_from_playlist.views import save_playlist_snapshot
+
+from ..cache import set_cached_summary
+from ..export import iter_export_records, iter_ndjson, iter_zip
+from . import TEST_CACHES, TEST_TIERS, summary_data
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLtest"
+
+VIDEO_IDS = ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc", "ddddddddddd", "eeeeeeeeeee"]
+
+
+def record(position, video_id):
+    return {"cursor": position, "position": position, "video_id": video_id}
+
+
+class ExportFormatTests(SimpleTestCase):
+    def test_ndjson_is_one_document_per_line(self):
+        records = [record(1, "aaaaaaaaaaa"), record(2, "bbbbbbbbbbb")]
+
+        lines = b"".join(iter_ndjson(records)).decode().splitlines()
+
+        self.assertEqual([json.loads(line) for line in lines], records)
+
+    def test_zip_is_streamed_one_file_at_a_time(self):
+        records = [record(1, "aaaaaaaaaaa"), record(12, "bbbbbbbbbbb")]
+
+        parts = list(iter_zip(records))
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(parts)))
+
+        # A part per video, then the central directory
+        self.assertEqual(len(parts), 3)
+        self.assertTrue(all(parts))
+        self.assertEqual(
+            archive.namelist(), ["00001_aaaaaaaaaaa.json", "00012_bbbbbbbbbbb.json"]
+        )
+        self.assertEqual(
+            json.loads(archive.read("00012_bbbbbbbbbbb.json")), records[1]
+        )
+
+    def test_empty_zip_is_still_an_archive(self):
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(iter_zip([]))))
+
+        self.assertEqual(archive.namelist(), [])
+
+
+@override_settings(
+    CACHES=TEST_CACHES,
+    GEMINI_MODEL_TIERS=TEST_TIERS,
+    GEMINI_FALLBACK_MODELS=[],
+)
+class ExportRecordsTests(TestCase):
+    def setUp(self):
+        caches["summaries"].clear()
+        save_playlist_snapshot(
+            PLAYLIST_URL,
+            [
+                {"id": video_id, "url": f"https://youtu.be/{video_id}"}
+                for video_id in VIDEO_IDS
+            ],
+        )
+        # The third video has no summary yet
+        for video_id in VIDEO_IDS[:2] + VIDEO_IDS[3:]:
+            set_cached_summary(
+                video_id,
+                "short",
+                summary_data("gemini-1.5-flash", f"Fast {video_id}", video_id=video_id),
+            )
+        self.playlist = Playlist.objects.get()
+
+    def test_summarized_videos_in_playlist_order(self):
+        records = list(iter_export_records(self.playlist, "short", batch_size=2))
+
+        self.assertEqual([r["position"] for r in records], [1, 2, 4, 5])
+        self.assertEqual(
+            [r["video_id"] for r in records], VIDEO_IDS[:2] + VIDEO_IDS[3:]
+        )
+        self.assertEqual(records[0]["summary"], f"Fast {VIDEO_IDS[0]}")
+
+    def test_cursor_resumes_after_a_position(self):
+        records = list(iter_export_records(self.playlist, "short", cursor=2))
+
+        self.assertEqual([r["video_id"] for r in records], VIDEO_IDS[3:])
+
+    def test_most_capable_models_summary_is_exported(self):
+        set_cached_summary(
+            VIDEO_IDS[0],
+            "short",
+            summary_data("gemini-1.5-pro", "Capable", video_id=VIDEO_IDS[0]),
+        )
+
+        first = next(iter_export_records(self.playlist, "short"))
+
+        self.assertEqual(first["model"], "gemini-1.5-pro")
+        self.assertEqual(first["summary"], "Capable")
+
+    def test_export_endpoint(self):
+        url = reverse("export_playlist")
+
+        ndjson = self.client.get(url, {"playlist_url": PLAYLIST_URL, "style": "short"})
+        archive = self.client.get(
+            url, {"playlist_url": PLAYLIST_URL, "style": "short", "format": "zip"}
+        )
+        unknown = self.client.get(
+            url, {"playlist_url": "https://www.youtube.com/playlist?list=PLnone"}
+        )
+
+        lines = b"".join(ndjson.streaming_content).decode().splitlines()
+        self.assertEqual(ndjson["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(lines), 4)
+        data = io.BytesIO(b"".join(archive.streaming_content))
+        self.assertEqual(len(zipfile.ZipFile(data).namelist()), 4)
+        self.assertEqual(unknown.status_code, 404)
@@ -0,0 +1,116 @@
+import os
+import socket
+from unittest import mock
+
+from django.test import TestCase
+
+from .. import jobs
+from ..models import Run
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLtest"
+
+
+class InlineExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+def fake_process_playlist(playlist_url, style, *args, **kwargs):
+    kwargs["on_start"](3)
+    kwargs["on_result"](0, {"video_id": "aaaaaaaaaaa", "success": True})
+    kwargs["on_result"](1, {"video_id": "bbbbbbbbbbb", "success": False})
+    kwargs["on_result"](2, {"video_id": "ccccccccccc", "success": True})
+    return {
+        "playlist_info": {"url": playlist_url, "video_count": 3},
+        "summaries": [],
+        "combined_file": "/tmp/combined.txt",
+    }
+
+
+@mock.patch.object(jobs, "_get_executor", return_value=InlineExecutor())
+class PlaylistJobTests(TestCase):
+    def setUp(self):
+        jobs._jobs.clear()
+
+    def test_job_reports_progress_and_result(self, _):
+        with mock.patch("summarize.views.process_playlist", fake_process_playlist):
+            job_id = jobs.enqueue_playlist_job(PLAYLIST_URL, "short")
+
+        job = jobs.get_playlist_job(job_id)
+
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(
+            job["progress"], {"total": 3, "done": 2, "failed": 1, "pending": 0}
+        )
+        self.assertEqual(job["combined_file"], "/tmp/combined.txt")
+        self.assertEqual(job["eta_seconds"], 0)
+
+    def test_other_processes_read_the_job_from_the_database(self, _):
+        with mock.patch("summarize.views.process_playlist", fake_process_playlist):
+            job_id = jobs.enqueue_playlist_job(PLAYLIST_URL, "short")
+        expected = jobs.get_playlist_job(job_id)
+        jobs._jobs.clear()
+
+        job = jobs.get_playlist_job(job_id)
+
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(job["progress"], expected["progress"])
+        self.assertEqual(Run.objects.get(job_id=job_id).worker, jobs._worker_id())
+
+    def test_errors_fail_the_job(self, _):
+        with mock.patch(
+            "summarize.views.process_playlist",
+            return_value={"error": "yt-dlp error: playlist not found"},
+        ):
+            job_id = jobs.enqueue_playlist_job(PLAYLIST_URL, "short")
+
+        job = jobs.get_playlist_job(job_id)
+
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["error"], "yt-dlp error: playlist not found")
+
+    def test_unknown_job(self, _):
+        self.assertIsNone(jobs.get_playlist_job("0" * 32))
+
+
+class OrphanedRunTests(TestCase):
+    def setUp(self):
+        jobs._jobs.clear()
+
+    def make_run(self, job_id, worker, status="running"):
+        return Run.objects.create(
+            job_id=job_id,
+            playlist_url=PLAYLIST_URL,
+            style="short",
+            status=status,
+            worker=worker,
+        )
+
+    def test_run_of_a_stopped_process_is_failed_when_read(self):
+        self.make_run("stopped", f"{socket.gethostname()}:99999")
+
+        with mock.patch.object(jobs.os, "kill", side_effect=ProcessLookupError):
+            job = jobs.get_playlist_job("stopped")
+
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["error"], jobs.ORPHANED_RUN_ERROR)
+        self.assertEqual(Run.objects.get(job_id="stopped").status, "failed")
+
+    def test_run_of_a_live_process_is_left_alone(self):
+        self.make_run("alive", f"{socket.gethostname()}:99999", status="queued")
+
+        with mock.patch.object(jobs.os, "kill", return_value=None):
+            job = jobs.get_playlist_job("alive")
+
+        self.assertEqual(job["status"], "queued")
+
+    def test_sweep_fails_runs_this_process_no_longer_holds(self):
+        self.make_run("restarted", f"{socket.gethostname()}:{os.getpid()}")
+        self.make_run("elsewhere", "another-host:1")
+        self.make_run("finished", f"{socket.gethostname()}:{os.getpid()}", "completed")
+
+        self.assertEqual(jobs.fail_orphaned_runs(), 1)
+        self.assertEqual(
+            dict(Run.objects.values_list("job_id", "status")),
+            {"restarted": "failed", "elsewhere": "running", "finished": "completed"},
+        )
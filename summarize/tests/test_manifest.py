@@ -0,0 +1,119 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from ..manifest import RunManifest
+from ..views import process_playlist
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLtest"
+
+
+class RunManifestTests(SimpleTestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.playlist_dir = Path(temp_dir.name)
+
+    def test_checkpoint_survives_a_new_run(self):
+        summary_file = self.playlist_dir / "summary_aaaaaaaaaaa.txt"
+        summary_file.write_text("Summary:\n\nDone.", encoding="utf-8")
+
+        manifest = RunManifest(self.playlist_dir, "short")
+        manifest.mark("aaaaaaaaaaa", RunManifest.COMPLETED, file_path=str(summary_file))
+        manifest.mark("bbbbbbbbbbb", RunManifest.FAILED, error="boom")
+
+        resumed = RunManifest(self.playlist_dir, "short")
+
+        self.assertEqual(resumed.completed_file("aaaaaaaaaaa"), summary_file)
+        self.assertIsNone(resumed.completed_file("bbbbbbbbbbb"))
+        self.assertEqual(resumed.videos["bbbbbbbbbbb"]["error"], "boom")
+        self.assertEqual(RunManifest(self.playlist_dir, "short", load=False).videos, {})
+
+    def test_completed_video_without_its_file_is_summarized_again(self):
+        manifest = RunManifest(self.playlist_dir, "short")
+        manifest.mark(
+            "aaaaaaaaaaa",
+            RunManifest.COMPLETED,
+            file_path=str(self.playlist_dir / "missing.txt"),
+        )
+
+        self.assertIsNone(manifest.completed_file("aaaaaaaaaaa"))
+
+    def test_listing_a_completed_video_again_keeps_its_checkpoint(self):
+        manifest = RunManifest(self.playlist_dir, "short")
+        manifest.mark("aaaaaaaaaaa", RunManifest.COMPLETED, file_path="a.txt")
+
+        manifest.mark("aaaaaaaaaaa", RunManifest.PENDING)
+
+        self.assertEqual(
+            manifest.videos["aaaaaaaaaaa"]["status"], RunManifest.COMPLETED
+        )
+
+    def test_manifests_are_kept_per_style(self):
+        RunManifest(self.playlist_dir, "short").mark("aaaaaaaaaaa", RunManifest.FAILED)
+
+        self.assertEqual(RunManifest(self.playlist_dir, "detailed").videos, {})
+
+    def test_unreadable_manifest_is_ignored(self):
+        (self.playlist_dir / "manifest_short.json").write_text("{", encoding="utf-8")
+
+        self.assertEqual(RunManifest(self.playlist_dir, "short").videos, {})
+
+
+class ResumePlaylistTests(SimpleTestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        override = override_settings(BASE_DIR=Path(temp_dir.name))
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def run_playlist(self, failing, resume=True):
+        videos = [
+            {"id": video_id, "url": f"https://youtu.be/{video_id}", "title": video_id}
+            for video_id in ("aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc")
+        ]
+
+        def summarize(video_url, style, **kwargs):
+            video_id = video_url.rsplit("/", 1)[-1]
+            if video_id in failing:
+                return {"error": "503 Service Unavailable"}
+            return {"summary": f"Summary of {video_id}.", "style": style}
+
+        with mock.patch(
+            "get_links_from_playlist.views.iter_playlist_videos",
+            return_value=iter(videos),
+        ), mock.patch(
+            "summarize.views.summarize_video", side_effect=summarize
+        ) as calls:
+            result = process_playlist(
+                PLAYLIST_URL, "short", max_workers=1, resume=resume
+            )
+
+        summarized = [call.args[0].rsplit("/", 1)[-1] for call in calls.call_args_list]
+        return result, summarized
+
+    def test_resumed_run_only_summarizes_unfinished_videos(self):
+        self.run_playlist(failing={"bbbbbbbbbbb"})
+
+        result, summarized = self.run_playlist(failing=set())
+
+        self.assertEqual(summarized, ["bbbbbbbbbbb"])
+        self.assertEqual(
+            [summary["success"] for summary in result["summaries"]], [True, True, True]
+        )
+        self.assertEqual(
+            [bool(summary.get("resumed")) for summary in result["summaries"]],
+            [True, False, True],
+        )
+        combined = Path(result["combined_file"]).read_text(encoding="utf-8")
+        self.assertIn("Summary of aaaaaaaaaaa.", combined)
+
+    def test_run_without_resume_starts_over(self):
+        self.run_playlist(failing=set())
+
+        _, summarized = self.run_playlist(failing=set(), resume=False)
+
+        self.assertEqual(len(summarized), 3)
@@ -0,0 +1,127 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..cache import get_cached_summary
+from ..deadline import Deadline
+from ..multistyle import (
+    build_multi_style_prompt,
+    generate_video_styles,
+    parse_multi_style_response,
+)
+from . import TEST_CACHES, VIDEO_ID
+
+RESPONSE = """TRANSCRIPT:
+Hello and welcome. Today we talk about summaries.
+
+SUMMARY (SHORT):
+A talk about summaries.
+
+SUMMARY (DETAILED):
+The speaker welcomes the audience.
+
+They then talk about summaries at length.
+"""
+
+
+class ParseMultiStyleResponseTests(SimpleTestCase):
+    def test_splits_transcript_and_each_style(self):
+        transcript, summaries = parse_multi_style_response(
+            RESPONSE, ["short", "detailed"]
+        )
+
+        self.assertEqual(
+            transcript, "Hello and welcome. Today we talk about summaries."
+        )
+        self.assertEqual(
+            summaries,
+            {
+                "short": "A talk about summaries.",
+                "detailed": "The speaker welcomes the audience.\n\n"
+                "They then talk about summaries at length.",
+            },
+        )
+
+    def test_markdown_headings_and_case_are_accepted(self):
+        text = (
+            "**Transcript:**\nHello.\n\n"
+            "## Summary (Short):\nShort one.\n\n"
+            "**SUMMARY (technical):**\nTechnical one."
+        )
+
+        transcript, summaries = parse_multi_style_response(
+            text, ["short", "technical"]
+        )
+
+        self.assertEqual(transcript, "Hello.")
+        self.assertEqual(
+            summaries, {"short": "Short one.", "technical": "Technical one."}
+        )
+
+    def test_missing_and_empty_styles_are_left_out(self):
+        text = "TRANSCRIPT:\nHello.\n\nSUMMARY (SHORT):\n\nSUMMARY (ACADEMIC):\nStudy."
+
+        _, summaries = parse_multi_style_response(
+            text, ["short", "academic", "detailed"]
+        )
+
+        self.assertEqual(summaries, {"academic": "Study."})
+
+    def test_unrequested_styles_stay_in_the_previous_section(self):
+        text = "TRANSCRIPT:\nHi.\n\nSUMMARY (SHORT):\nShort one.\nSUMMARY (OTHER):\nx"
+
+        _, summaries = parse_multi_style_response(text, ["short"])
+
+        self.assertEqual(summaries, {"short": "Short one.\nSUMMARY (OTHER):\nx"})
+
+    def test_response_without_markers_is_all_transcript(self):
+        transcript, summaries = parse_multi_style_response("Just text.", ["short"])
+
+        self.assertEqual((transcript, summaries), ("Just text.", {}))
+
+    def test_prompt_asks_for_every_style(self):
+        prompt = build_multi_style_prompt(
+            "https://youtu.be/" + VIDEO_ID, ["short", "detailed"]
+        )
+
+        self.assertIn("SUMMARY (SHORT):", prompt)
+        self.assertIn("SUMMARY (DETAILED):", prompt)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class GenerateVideoStylesTests(TestCase):
+    def setUp(self):
+        caches["summaries"].clear()
+        model = mock.Mock(model_name="models/gemini-1.5-pro")
+        patcher = mock.patch("summarize.multistyle.get_model", return_value=model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_call_caches_every_style(self):
+        with mock.patch(
+            "summarize.multistyle.generate_text", return_value=RESPONSE
+        ) as generate:
+            results = generate_video_styles(
+                VIDEO_ID, VIDEO_ID, ["short", "detailed"], Deadline(60)
+            )
+
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(results["short"]["summary"], "A talk about summaries.")
+        for style in ("short", "detailed"):
+            cached = get_cached_summary(VIDEO_ID, style, ["gemini-1.5-pro"])
+            self.assertEqual(cached["summary"], results[style]["summary"])
+
+    def test_missing_style_is_derived_from_the_transcript(self):
+        with mock.patch(
+            "summarize.multistyle.generate_text", return_value=RESPONSE
+        ), mock.patch(
+            "summarize.multistyle.summarize_transcript_text",
+            return_value="An academic summary.",
+        ) as derive:
+            results = generate_video_styles(
+                VIDEO_ID, VIDEO_ID, ["short", "academic"], Deadline(60)
+            )
+
+        self.assertEqual(results["academic"]["summary"], "An academic summary.")
+        self.assertEqual(derive.call_args.args[2], "academic")
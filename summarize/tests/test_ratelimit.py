@@ -0,0 +1,99 @@
+from django.test import SimpleTestCase, override_settings
+
+from ..ratelimit import GeminiRateLimiter, TokenBucket
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_takes_available_tokens_without_waiting(self):
+        bucket = TokenBucket(capacity=10, refill_per_second=1)
+
+        self.assertEqual(bucket.try_take(4), 0.0)
+        self.assertEqual(bucket.try_take(6), 0.0)
+
+    def test_reports_wait_until_enough_tokens(self):
+        bucket = TokenBucket(capacity=10, refill_per_second=2)
+        bucket.try_take(10)
+
+        wait_time = bucket.try_take(4)
+
+        self.assertGreater(wait_time, 1.9)
+        self.assertLessEqual(wait_time, 2.0)
+
+    def test_oversized_request_is_capped_at_capacity(self):
+        bucket = TokenBucket(capacity=10, refill_per_second=1)
+
+        self.assertEqual(bucket.try_take(1000), 0.0)
+        self.assertGreater(bucket.try_take(1), 0.0)
+
+    def test_adjust_refunds_unused_tokens(self):
+        bucket = TokenBucket(capacity=10, refill_per_second=0.001)
+        bucket.try_take(10)
+
+        bucket.adjust(-5)
+
+        self.assertEqual(bucket.try_take(5), 0.0)
+
+
+class GeminiRateLimiterTests(SimpleTestCase):
+    def make_limiter(self, max_concurrency=8):
+        return GeminiRateLimiter(
+            requests_per_minute=1000,
+            tokens_per_minute=1_000_000,
+            max_concurrency=max_concurrency,
+        )
+
+    def test_quota_error_halves_concurrency(self):
+        limiter = self.make_limiter()
+
+        with self.assertRaises(Exception):
+            with limiter.slot(100):
+                raise Exception("429 Resource exhausted")
+
+        self.assertEqual(limiter.concurrency_limit, 4)
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertTrue(limiter.rate_limited_within(60))
+
+    def test_other_errors_keep_concurrency(self):
+        limiter = self.make_limiter()
+
+        with self.assertRaises(ValueError):
+            with limiter.slot(100):
+                raise ValueError("400 invalid argument")
+
+        self.assertEqual(limiter.concurrency_limit, 8)
+        self.assertFalse(limiter.rate_limited_within(60))
+
+    def test_successes_grow_concurrency_up_to_maximum(self):
+        limiter = self.make_limiter(max_concurrency=4)
+        limiter.concurrency_limit = 1.0
+
+        for _ in range(50):
+            with limiter.slot(100):
+                pass
+
+        self.assertEqual(limiter.concurrency_limit, 4)
+
+    def test_concurrency_never_drops_below_one(self):
+        limiter = self.make_limiter(max_concurrency=2)
+
+        for _ in range(5):
+            limiter.acquire(100)
+            limiter.release(rate_limited=True)
+
+        self.assertEqual(limiter.concurrency_limit, 1)
+
+    def test_real_usage_corrects_the_estimate(self):
+        limiter = self.make_limiter()
+        before = limiter.tokens.tokens
+
+        with limiter.slot(10_000) as usage:
+            usage["total_tokens"] = 1_000
+
+        self.assertAlmostEqual(limiter.tokens.tokens, before - 1_000, delta=100)
+
+    @override_settings(GEMINI_BACKOFF_BASE=2, GEMINI_BACKOFF_MAX=10)
+    def test_backoff_delay_is_jittered_and_capped(self):
+        for attempt, full_delay in ((0, 2), (1, 4), (5, 10)):
+            delay = GeminiRateLimiter.backoff_delay(attempt)
+            self.assertGreaterEqual(delay, full_delay / 2)
+            self.assertLessEqual(delay, full_delay)
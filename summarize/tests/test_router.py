@@ -0,0 +1,138 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from .. import views
+from ..deadline import Deadline
+from ..router import (
+    choose_tier,
+    route_models,
+    run_with_escalation,
+    tier_models,
+    validate_summary,
+)
+from . import TEST_TIERS, VIDEO_ID, summary_data
+
+
+@override_settings(
+    GEMINI_MODEL_TIERS=TEST_TIERS,
+    GEMINI_FALLBACK_MODELS=["gemini-1.0-pro"],
+    ROUTER_CAPABLE_STYLES=["academic", "technical"],
+    ROUTER_FAST_MAX_INPUT_TOKENS=300_000,
+    ROUTER_FAST_DEADLINE_SECONDS=60,
+    GEMINI_VIDEO_TOKENS_PER_SECOND=300,
+    DEGRADED_MODE_SECONDS=0,
+)
+class RouterTests(SimpleTestCase):
+    def test_default_requests_start_on_the_fast_tier(self):
+        self.assertEqual(choose_tier("short", 600, Deadline(300)), ("fast", "default"))
+
+    def test_capable_styles_and_long_videos_start_on_the_capable_tier(self):
+        self.assertEqual(choose_tier("academic")[0], "capable")
+        self.assertEqual(choose_tier("detailed", 3 * 3600), ("capable", "long video"))
+
+    def test_short_time_budget_uses_the_fast_tier(self):
+        tier, reason = choose_tier("technical", 3 * 3600, Deadline(10))
+
+        self.assertEqual((tier, reason), ("fast", "short time budget"))
+
+    def test_auto_routes_escalate_and_fixed_tiers_do_not(self):
+        self.assertEqual(
+            route_models("short"), ["gemini-1.5-flash", "gemini-1.5-pro"]
+        )
+        self.assertEqual(route_models("short", tier="fast"), ["gemini-1.5-flash"])
+        self.assertEqual(route_models("academic"), ["gemini-1.5-pro"])
+
+    def test_unknown_tier_is_rejected(self):
+        with self.assertRaises(ValueError):
+            route_models("short", tier="huge")
+
+    def test_tier_models(self):
+        self.assertEqual(tier_models("fast"), ["gemini-1.5-flash"])
+        self.assertEqual(tier_models("capable"), ["gemini-1.5-pro"])
+        self.assertEqual(
+            tier_models("auto"),
+            ["gemini-1.5-pro", "gemini-1.5-flash", "gemini-1.0-pro"],
+        )
+
+    def test_validate_summary(self):
+        self.assertIsNone(validate_summary(summary_data("m"), "short"))
+        self.assertEqual(
+            validate_summary(summary_data("m", "Too short."), "short"),
+            "summary too short",
+        )
+        self.assertEqual(
+            validate_summary(
+                summary_data("m", "I'm unable to watch videos. " * 20), "short"
+            ),
+            "model could not process the video",
+        )
+        self.assertEqual(
+            validate_summary({**summary_data("m"), "raw_response": "..."}, "short"),
+            "transcript missing",
+        )
+
+    def test_escalates_only_while_output_is_invalid(self):
+        answers = {
+            "gemini-1.5-flash": summary_data("gemini-1.5-flash", "Too short."),
+            "gemini-1.5-pro": summary_data("gemini-1.5-pro"),
+        }
+        summarize = mock.Mock(side_effect=answers.get)
+
+        result = run_with_escalation(route_models("short"), "short", summarize)
+
+        self.assertEqual(result["model"], "gemini-1.5-pro")
+        self.assertEqual(summarize.call_count, 2)
+
+    def test_errors_are_not_escalated(self):
+        summarize = mock.Mock(return_value={"error": "503 Service Unavailable"})
+
+        result = run_with_escalation(route_models("short"), "short", summarize)
+
+        self.assertIn("error", result)
+        self.assertEqual(summarize.call_count, 1)
+
+    @mock.patch.object(views, "store_summary")
+    @mock.patch.object(views, "summarize_stored_transcript", return_value=None)
+    def test_long_videos_are_summarized_with_the_routed_model(
+        self, stored_transcript, store
+    ):
+        with mock.patch.object(
+            views,
+            "summarize_long_video",
+            side_effect=lambda video_url, duration, style, **kwargs: summary_data(
+                kwargs["model_name"], style=style
+            ),
+        ) as long_video:
+            result = views.generate_video_summary(
+                VIDEO_ID, VIDEO_ID, "short", Deadline(300), 3 * 3600, True
+            )
+
+        self.assertEqual(long_video.call_args.kwargs["model_name"], "gemini-1.5-pro")
+        self.assertEqual(result["model"], "gemini-1.5-pro")
+        store.assert_called_once_with(VIDEO_ID, "short", result)
+
+    @mock.patch.object(views, "store_summary")
+    @mock.patch.object(views, "summarize_stored_transcript", return_value=None)
+    @mock.patch.object(
+        views,
+        "summarize_youtube_video_with_gemini",
+        return_value={"error": "503 Service Unavailable"},
+    )
+    def test_simple_prompt_fallback_uses_the_routed_model(
+        self, detailed, stored_transcript, store
+    ):
+        with mock.patch.object(
+            views,
+            "summarize_youtube_video_with_simple_prompt",
+            side_effect=lambda video_input, style, **kwargs: summary_data(
+                kwargs["model_name"], style=style
+            ),
+        ) as simple:
+            result = views.generate_video_summary(
+                VIDEO_ID, VIDEO_ID, "technical", Deadline(300), 600, False
+            )
+
+        self.assertEqual(detailed.call_args.kwargs["model_name"], "gemini-1.5-pro")
+        self.assertEqual(simple.call_args.kwargs["model_name"], "gemini-1.5-pro")
+        self.assertEqual(result["model"], "gemini-1.5-pro")
@@ -0,0 +1,147 @@
+import importlib
+from types import SimpleNamespace
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from get_links_from_playlist.models import Video
+from get_links_from_playlist.views import save_playlist_snapshot
+
+from ..cache import set_cached_summary
+from ..models import Summary, Transcript
+from ..search import (
+    SEARCH_TABLE,
+    build_match_query,
+    search_available,
+    search_summaries,
+)
+from ..transcripts import save_transcript
+from . import TEST_CACHES, summary_data
+
+
+class BuildMatchQueryTests(SimpleTestCase):
+    def test_words_are_quoted_and_prefixes_kept(self):
+        self.assertEqual(build_match_query("neural net*"), '"neural" "net"*')
+
+    def test_fts_syntax_in_user_input_is_literal(self):
+        self.assertEqual(
+            build_match_query('title:"gradient" OR -descent'),
+            '"title" "gradient" "OR" "descent"',
+        )
+        self.assertEqual(build_match_query("*** ()"), "")
+
+
+@override_settings(CACHES=TEST_CACHES, GEMINI_MODEL="gemini-1.5-pro")
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        if not search_available():
+            self.skipTest("SQLite has no FTS5 support")
+        caches["summaries"].clear()
+
+    def store(self, video_id, title, summary, style="short", transcript=None):
+        Video.objects.for_id(video_id)
+        Video.objects.filter(video_id=video_id).update(title=title)
+        if transcript is not None:
+            save_transcript(video_id, transcript)
+        set_cached_summary(
+            video_id,
+            style,
+            summary_data("gemini-1.5-pro", summary, video_id=video_id, style=style),
+        )
+
+    def indexed_rows(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT rowid FROM {SEARCH_TABLE} ORDER BY rowid")
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_finds_matches_in_titles_summaries_and_transcripts(self):
+        self.store("aaaaaaaaaaa", "Backpropagation explained", "Gradients flow back.")
+        self.store(
+            "bbbbbbbbbbb",
+            "Cooking pasta",
+            "Boil water first.",
+            transcript="We talk about backpropagation of flavour. " * 5,
+        )
+        # bm25 needs videos without the word to weigh it
+        for video_id in ("ccccccccccc", "ddddddddddd", "eeeeeeeeeee"):
+            self.store(video_id, "Unrelated", "Nothing to see here.")
+
+        results = search_summaries("backpropagation")
+
+        # A title match ranks above a transcript match
+        self.assertEqual(
+            [result["video_id"] for result in results], ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+        )
+        self.assertIn("[Backpropagation]", results[0]["snippet"])
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+    def test_prefix_style_and_playlist_filters(self):
+        self.store("aaaaaaaaaaa", "Transformers", "Attention is all you need.")
+        self.store("aaaaaaaaaaa", "Transformers", "Attention, at length.", "detailed")
+        self.store("bbbbbbbbbbb", "Attention spans", "Focus tips.")
+        save_playlist_snapshot(
+            "https://www.youtube.com/playlist?list=PLtest",
+            [Video.objects.get(video_id="bbbbbbbbbbb").as_dict()],
+        )
+
+        self.assertEqual(len(search_summaries("atten*")), 3)
+        self.assertEqual(len(search_summaries("attention", style="detailed")), 1)
+        in_playlist = search_summaries("attention", playlist_id="PLtest")
+        self.assertEqual([r["video_id"] for r in in_playlist], ["bbbbbbbbbbb"])
+
+    def test_rewriting_a_summary_replaces_its_row(self):
+        self.store("aaaaaaaaaaa", "Video", "First version about llamas.")
+        self.store("aaaaaaaaaaa", "Video", "Second version about alpacas.")
+
+        self.assertEqual(search_summaries("llamas"), [])
+        self.assertEqual(len(search_summaries("alpacas")), 1)
+        self.assertEqual(len(self.indexed_rows()), 1)
+
+    def test_deleted_summaries_leave_the_index(self):
+        self.store("aaaaaaaaaaa", "Video", "About llamas.")
+        self.store("aaaaaaaaaaa", "Video", "More about llamas.", "detailed")
+        self.store("bbbbbbbbbbb", "Other video", "Also llamas.")
+
+        Summary.objects.filter(style="detailed").delete()
+        self.assertEqual(len(search_summaries("llamas")), 2)
+
+        # Summaries deleted along with their video go too
+        Video.objects.filter(video_id="aaaaaaaaaaa").delete()
+        self.assertEqual(
+            [result["video_id"] for result in search_summaries("llamas")],
+            ["bbbbbbbbbbb"],
+        )
+        self.assertEqual(
+            self.indexed_rows(), list(Summary.objects.values_list("pk", flat=True))
+        )
+
+    def test_deleted_transcripts_leave_the_index(self):
+        self.store(
+            "aaaaaaaaaaa", "Video", "Summary.", transcript="Spoken words. " * 10
+        )
+
+        Transcript.objects.all().delete()
+
+        self.assertEqual(search_summaries("spoken"), [])
+        self.assertEqual(len(search_summaries("summary")), 1)
+
+    def test_migration_indexes_existing_summaries(self):
+        migration = importlib.import_module("summarize.migrations.0002_search_index")
+        self.store("aaaaaaaaaaa", "Video", "Stored before the index existed.")
+
+        migration.drop_search_index(None, SimpleNamespace(connection=connection))
+        migration.create_search_index(None, SimpleNamespace(connection=connection))
+
+        self.assertEqual(len(search_summaries("stored")), 1)
+
+    def test_search_endpoint(self):
+        self.store("aaaaaaaaaaa", "Video", "About llamas.")
+
+        response = self.client.get(reverse("search_summaries"), {"q": "llamas"})
+        missing = self.client.get(reverse("search_summaries"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["video_id"], "aaaaaaaaaaa")
+        self.assertEqual(missing.status_code, 400)
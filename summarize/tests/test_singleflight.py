@@ -0,0 +1,147 @@
+import fcntl
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from .. import singleflight
+from . import TEST_CACHES
+
+
+def run_in_threads(count, target):
+    results = [None] * count
+
+    def run(i):
+        results[i] = target()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+        # Let each caller reach begin() before the next one starts
+        time.sleep(0.05)
+    return threads, results
+
+
+@override_settings(CACHES=TEST_CACHES)
+@mock.patch.object(singleflight, "LOCK_POLL_INTERVAL", 0.01)
+class RunOnceTests(SimpleTestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def work(self, result="summary"):
+        self.calls += 1
+        self.release.wait(5)
+        return result
+
+    def test_concurrent_callers_share_one_run(self):
+        threads, results = run_in_threads(
+            4, lambda: singleflight.run_once("video|short", self.work, timeout=5)
+        )
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["summary"] * 4)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(singleflight._flights, {})
+
+    def test_different_keys_run_separately(self):
+        self.release.set()
+
+        singleflight.run_once("video|short", self.work)
+        singleflight.run_once("video|detailed", self.work)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_recheck_result_skips_the_work(self):
+        result = singleflight.run_once(
+            "video|short", self.work, recheck=lambda: "cached", timeout=5
+        )
+
+        self.assertEqual(result, "cached")
+        self.assertEqual(self.calls, 0)
+
+    def test_deadline_exceeded_results_are_not_shared(self):
+        expired = {"error": "Time budget exceeded", "deadline_exceeded": True}
+        threads, results = run_in_threads(
+            2,
+            lambda: singleflight.run_once(
+                "video|short", lambda: self.work(expired), timeout=5
+            ),
+        )
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+        # The follower did the work itself rather than take the leader's error
+        self.assertEqual(self.calls, 2)
+
+    def test_followers_do_the_work_when_the_leader_fails(self):
+        errors = []
+
+        def failing_work():
+            self.release.wait(5)
+            raise RuntimeError("boom")
+
+        def lead():
+            try:
+                singleflight.run_once("video|short", failing_work, timeout=5)
+            except RuntimeError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=lead)
+        leader.start()
+        time.sleep(0.05)
+        threads, results = run_in_threads(
+            1, lambda: singleflight.run_once("video|short", self.work, timeout=5)
+        )
+        self.release.set()
+        for thread in [leader] + threads:
+            thread.join()
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(results, ["summary"])
+        self.assertEqual(self.calls, 1)
+
+
+@override_settings(CACHES=TEST_CACHES)
+@mock.patch.object(singleflight, "LOCK_POLL_INTERVAL", 0.01)
+class CrossProcessLockTests(SimpleTestCase):
+    def hold_lock(self, key):
+        # flock locks belong to the open file, so a second open of the lock
+        # file stands in for another process
+        lock_file = open(singleflight._lock_path(key), "a")
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self.addCleanup(lock_file.close)
+        return lock_file
+
+    def test_leader_waits_for_another_process_then_rechecks(self):
+        lock_file = self.hold_lock("video|short")
+        stored = {}
+        work = mock.Mock(return_value="generated")
+
+        def other_process_finishes():
+            time.sleep(0.2)
+            stored["summary"] = "from the other process"
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        threading.Thread(target=other_process_finishes).start()
+        result = singleflight.run_once(
+            "video|short", work, recheck=lambda: stored.get("summary"), timeout=5
+        )
+
+        self.assertEqual(result, "from the other process")
+        work.assert_not_called()
+
+    def test_leader_works_without_the_lock_after_the_timeout(self):
+        self.hold_lock("video|short")
+
+        started = time.monotonic()
+        result = singleflight.run_once(
+            "video|short", lambda: "generated", recheck=lambda: None, timeout=0.2
+        )
+
+        self.assertEqual(result, "generated")
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
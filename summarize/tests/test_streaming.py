@@ -0,0 +1,212 @@
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from ..deadline import Deadline
+from ..views import (
+    TranscriptSummaryStreamParser,
+    format_sse_event,
+    stream_youtube_video_with_gemini,
+)
+from . import VIDEO_ID
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLtest"
+
+
+def parse_sse(body):
+    """
+    Split a text/event-stream body into (event, data) pairs
+    """
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class FormatSseEventTests(SimpleTestCase):
+    def test_event_is_named_and_json_encoded(self):
+        self.assertEqual(
+            format_sse_event("video", {"index": 1, "title": "a\nb"}),
+            'event: video\ndata: {"index": 1, "title": "a\\nb"}\n\n',
+        )
+
+
+class PlaylistStreamTests(SimpleTestCase):
+    def stream(self, events):
+        with mock.patch("summarize.views.iter_process_playlist", events):
+            response = self.client.get(
+                reverse("summarize_playlist_stream"), {"playlist_url": PLAYLIST_URL}
+            )
+            body = b"".join(response.streaming_content).decode()
+        return response, parse_sse(body)
+
+    def test_sends_each_video_as_it_finishes(self):
+        def events(*args):
+            yield "start", {"playlist_info": {"id": "PLtest"}, "videos": []}
+            yield "video", {
+                "index": 2,
+                "summary_result": {"video_id": "bbbbbbbbbbb", "success": True},
+                "summary_data": {"summary": "Second video."},
+            }
+            yield "video", {
+                "index": 1,
+                "summary_result": {"video_id": "aaaaaaaaaaa", "success": False},
+                "summary_data": {"error": "boom"},
+            }
+            yield "complete", {"succeeded": 1, "failed": 1}
+
+        response, sent = self.stream(events)
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(
+            sent,
+            [
+                ("start", {"playlist_info": {"id": "PLtest"}}),
+                (
+                    "video",
+                    {
+                        "index": 2,
+                        "video_id": "bbbbbbbbbbb",
+                        "success": True,
+                        "summary": "Second video.",
+                    },
+                ),
+                ("video", {"index": 1, "video_id": "aaaaaaaaaaa", "success": False}),
+                ("complete", {"succeeded": 1, "failed": 1}),
+            ],
+        )
+
+    def test_failure_ends_the_stream_with_an_error_event(self):
+        def events(*args):
+            yield "start", {"playlist_info": {"id": "PLtest"}}
+            raise RuntimeError("yt-dlp went away")
+
+        _, sent = self.stream(events)
+
+        self.assertEqual(sent[-1][0], "error")
+        self.assertIn("yt-dlp went away", sent[-1][1]["error"])
+
+    def test_playlist_url_is_required(self):
+        response = self.client.get(reverse("summarize_playlist_stream"))
+
+        self.assertEqual(response.status_code, 400)
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class FakeStreamingModel:
+    model_name = "models/test-stream"
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        self.calls += 1
+        for text in self.chunks:
+            yield FakeChunk(text)
+        if self.error is not None:
+            raise self.error
+
+
+class TranscriptSummaryStreamParserTests(SimpleTestCase):
+    def parse(self, chunks):
+        parser = TranscriptSummaryStreamParser()
+        pieces = [piece for chunk in chunks for piece in parser.feed(chunk)]
+        pieces += parser.close()
+
+        # Adjacent pieces of the same section are sent as separate events
+        merged = []
+        for section, text in pieces:
+            if merged and merged[-1][0] == section:
+                merged[-1] = (section, merged[-1][1] + text)
+            else:
+                merged.append((section, text))
+        return merged
+
+    def test_splits_sections_at_the_markers(self):
+        self.assertEqual(
+            self.parse(["TRANSCRIPT:\nhello there\n\nSUMMARY:\nA greeting."]),
+            [("transcript", "\nhello there\n\n"), ("summary", "\nA greeting.")],
+        )
+
+    def test_markers_split_across_chunks_are_held_back(self):
+        parser = TranscriptSummaryStreamParser()
+
+        self.assertEqual(
+            parser.feed("hello there\nSUMM"), [("transcript", "hello there\n")]
+        )
+        self.assertEqual(
+            parser.feed("ARY: A greeting."), [("summary", " A greeting.")]
+        )
+
+    def test_text_that_only_looks_like_a_marker_is_released(self):
+        self.assertEqual(
+            self.parse(["TRANSCRIPT: the SUM", " of its parts"]),
+            [("transcript", " the SUM of its parts")],
+        )
+
+    def test_held_back_text_is_flushed_on_close(self):
+        parser = TranscriptSummaryStreamParser()
+
+        self.assertEqual(
+            parser.feed("TRANSCRIPT: ends with S"), [("transcript", " ends with ")]
+        )
+        self.assertEqual(parser.close(), [("transcript", "S")])
+
+
+class StreamYoutubeVideoTests(SimpleTestCase):
+    def stream(self, model, **kwargs):
+        with mock.patch("summarize.views.get_model", return_value=model):
+            return list(stream_youtube_video_with_gemini(VIDEO_ID, "short", **kwargs))
+
+    def test_chunks_then_complete(self):
+        model = FakeStreamingModel(["TRANSCRIPT: hello", " there SUMMARY: A greeting."])
+
+        events = self.stream(model)
+
+        self.assertEqual(
+            events[:-1],
+            [
+                ("chunk", {"section": "transcript", "text": " hello"}),
+                ("chunk", {"section": "transcript", "text": " there "}),
+                ("chunk", {"section": "summary", "text": " A greeting."}),
+            ],
+        )
+        event, summary_data = events[-1]
+        self.assertEqual(event, "complete")
+        self.assertEqual(summary_data["video_id"], VIDEO_ID)
+        self.assertIn("A greeting.", summary_data["summary"])
+        self.assertEqual(summary_data["model"], "models/test-stream")
+
+    def test_error_after_output_is_not_retried(self):
+        model = FakeStreamingModel(
+            ["TRANSCRIPT: hello"], error=Exception("503 Service Unavailable")
+        )
+
+        events = self.stream(model, retries=3)
+
+        self.assertEqual(events[0][0], "chunk")
+        self.assertEqual(events[-1][0], "error")
+        self.assertTrue(events[-1][1]["retriable"])
+        self.assertEqual(model.calls, 1)
+
+    def test_used_up_deadline_is_reported(self):
+        model = FakeStreamingModel(["TRANSCRIPT: hello"])
+
+        events = self.stream(model, deadline=Deadline(0))
+
+        self.assertEqual(len(events), 1)
+        event, error = events[0]
+        self.assertEqual(event, "error")
+        self.assertTrue(error["deadline_exceeded"])
+        self.assertEqual(error["stage"], "streaming attempt 1")
+        self.assertEqual(model.calls, 0)
@@ -0,0 +1,88 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from .. import engines
+from ..engines import ExtractiveEngine, SummaryEngine, summarize_degraded
+from ..textrank import caption_text, extract_key_sentences
+from . import VIDEO_ID
+
+SENTENCES = [
+    f"Sentence {i} explains how neural networks learn topic {i % 4} from data."
+    for i in range(30)
+]
+TRANSCRIPT = " ".join(SENTENCES)
+
+
+class TextRankTests(SimpleTestCase):
+    def test_picks_the_requested_sentences_in_original_order(self):
+        picked = extract_key_sentences(TRANSCRIPT, 5)
+
+        self.assertEqual(len(picked), 5)
+        self.assertEqual(picked, sorted(picked, key=SENTENCES.index))
+
+    def test_caption_text_drops_timings_and_repeated_lines(self):
+        content = (
+            "WEBVTT\nKind: captions\n\n"
+            "00:00:00.000 --> 00:00:02.000\n<c>hello there</c>\n\n"
+            "00:00:02.000 --> 00:00:04.000\nhello there\ngeneral kenobi\n"
+        )
+
+        self.assertEqual(caption_text(content), "hello there general kenobi")
+
+
+class ExtractiveEngineTests(SimpleTestCase):
+    def setUp(self):
+        captions_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(captions_dir.cleanup)
+        self.captions_dir = Path(captions_dir.name)
+
+        settings = override_settings(
+            CAPTIONS_DIR=captions_dir.name, EXTRACTIVE_FALLBACK=True
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_engines_must_implement_summarize(self):
+        with self.assertRaises(TypeError):
+            SummaryEngine()
+
+    @mock.patch.object(engines, "get_transcript", return_value=TRANSCRIPT)
+    def test_summarizes_the_stored_transcript(self, get_transcript):
+        result = ExtractiveEngine().summarize(VIDEO_ID, VIDEO_ID, "short")
+
+        self.assertEqual(result["source"], "transcript")
+        self.assertEqual(result["model"], "extractive")
+        self.assertEqual(len(result["summary"].splitlines()), 5)
+
+    @mock.patch.object(engines, "get_transcript", return_value=None)
+    def test_falls_back_to_the_caption_file(self, get_transcript):
+        (self.captions_dir / f"{VIDEO_ID}.en.vtt").write_text(
+            f"WEBVTT\n\n00:00:00.000 --> 00:01:00.000\n{TRANSCRIPT}\n",
+            encoding="utf-8",
+        )
+
+        result = ExtractiveEngine().summarize(VIDEO_ID, VIDEO_ID, "detailed")
+
+        self.assertEqual(result["source"], "captions")
+        # 12 sentences in paragraphs of 4
+        self.assertEqual(len(result["summary"].split("\n\n")), 3)
+
+    @mock.patch.object(engines, "get_transcript", return_value=None)
+    def test_video_without_local_text_is_an_error(self, get_transcript):
+        result = ExtractiveEngine().summarize(VIDEO_ID, VIDEO_ID, "short")
+
+        self.assertFalse(result["retriable"])
+        self.assertIsNone(summarize_degraded(VIDEO_ID, "short", "quota"))
+
+    @mock.patch.object(engines, "get_transcript", return_value=TRANSCRIPT)
+    def test_degraded_summary_is_marked(self, get_transcript):
+        result = summarize_degraded(VIDEO_ID, "short", "Gemini quota exceeded")
+
+        self.assertTrue(result["degraded"])
+        self.assertEqual(result["degraded_reason"], "Gemini quota exceeded")
+
+        with override_settings(EXTRACTIVE_FALLBACK=False):
+            self.assertIsNone(summarize_degraded(VIDEO_ID, "short", "quota"))
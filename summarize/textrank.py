@@ -0,0 +1,246 @@
+import math
+import re
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    # Without NumPy the same algorithm runs in pure Python on fewer sentences
+    np = None
+
+# TextRank compares every pair of sentences, so long transcripts are merged
+# into at most this many consecutive passages first
+MAX_SENTENCES = 600 if np is not None else 200
+
+# Auto-generated captions often have no punctuation; runs of words longer
+# than this are split into pseudo-sentences
+MAX_SENTENCE_WORDS = 40
+
+# Sentences shorter than this are filler ("Okay.", "Thanks for watching.")
+MIN_SENTENCE_WORDS = 5
+
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+
+STOPWORDS = frozenset(
+    """
+    a about above after again all also am an and any are as at be because been
+    before being below between both but by can could did do does doing down
+    during each few for from further get go going got had has have having he her
+    here hers him his how i if in into is it its itself just know like me more
+    most my no nor not now of off on once one only or other our out over own
+    really right said same say she should so some such than that the their them
+    then there these they this those through to too um uh under until up us very
+    was we were what when where which while who whom why will with would yeah
+    you your
+    """.split()
+)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def split_sentences(text):
+    """
+    Split text into sentences, breaking unpunctuated runs of words into
+    pseudo-sentences and dropping fragments too short to summarize with
+
+    Args:
+        text (str): Transcript or caption text
+
+    Returns:
+        list: Sentences in their original order
+    """
+    sentences = []
+
+    for sentence in _SENTENCE_END.split(" ".join(text.split())):
+        words = sentence.split()
+        for start in range(0, len(words), MAX_SENTENCE_WORDS):
+            piece = words[start : start + MAX_SENTENCE_WORDS]
+            if len(piece) >= MIN_SENTENCE_WORDS:
+                sentences.append(" ".join(piece))
+
+    return sentences
+
+
+def _merge_passages(sentences, limit):
+    # Join consecutive sentences so there are at most `limit` units to compare
+    size = math.ceil(len(sentences) / limit)
+    return [
+        " ".join(sentences[start : start + size])
+        for start in range(0, len(sentences), size)
+    ]
+
+
+def _term_weights(sentences):
+    """
+    TF-IDF weights of each sentence's content words
+
+    Returns:
+        list: {term: weight} per sentence, normalized to unit length
+    """
+    counts = [
+        Counter(word for word in _WORD.findall(sentence.lower()) if word not in STOPWORDS)
+        for sentence in sentences
+    ]
+    document_frequency = Counter(term for count in counts for term in count)
+    total = len(sentences)
+
+    vectors = []
+    for count in counts:
+        vector = {
+            term: (1 + math.log(frequency))
+            * math.log((1 + total) / (1 + document_frequency[term]))
+            for term, frequency in count.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        vectors.append(
+            {term: weight / norm for term, weight in vector.items()} if norm else {}
+        )
+
+    return vectors
+
+
+def _rank_numpy(vectors):
+    vocabulary = {term: i for i, term in enumerate({t for v in vectors for t in v})}
+    matrix = np.zeros((len(vectors), max(1, len(vocabulary))))
+    for row, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            matrix[row, vocabulary[term]] = weight
+
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0.0)
+
+    # Row-normalize into transition probabilities; isolated sentences link to all
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.where(
+        out_weight > 0, similarity / np.where(out_weight > 0, out_weight, 1), 1 / len(vectors)
+    )
+
+    count = len(vectors)
+    scores = np.full(count, 1 / count)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+
+    return scores.tolist()
+
+
+def _rank_python(vectors):
+    count = len(vectors)
+    neighbours = [[] for _ in range(count)]
+
+    for i in range(count):
+        for j in range(i + 1, count):
+            small, large = sorted((vectors[i], vectors[j]), key=len)
+            weight = sum(value * large.get(term, 0.0) for term, value in small.items())
+            if weight > 0:
+                neighbours[i].append((j, weight))
+                neighbours[j].append((i, weight))
+
+    out_weight = [sum(weight for _, weight in links) for links in neighbours]
+
+    scores = [1 / count] * count
+    for _ in range(MAX_ITERATIONS):
+        # Isolated sentences spread their score evenly over all sentences
+        isolated = sum(score for score, total in zip(scores, out_weight) if not total)
+        updated = [(1 - DAMPING) / count + DAMPING * isolated / count] * count
+
+        for i, links in enumerate(neighbours):
+            for j, weight in links:
+                updated[j] += DAMPING * scores[i] * weight / out_weight[i]
+
+        converged = sum(abs(new - old) for new, old in zip(updated, scores)) < TOLERANCE
+        scores = updated
+        if converged:
+            break
+
+    return scores
+
+
+def rank_sentences(sentences):
+    """
+    Score sentences with TextRank: PageRank over the graph of sentences,
+    weighted by the cosine similarity of their TF-IDF vectors
+
+    Args:
+        sentences (list): Sentences
+
+    Returns:
+        list: Score of each sentence
+    """
+    if not sentences:
+        return []
+
+    vectors = _term_weights(sentences)
+    return _rank_numpy(vectors) if np is not None else _rank_python(vectors)
+
+
+def extract_key_sentences(text, sentence_count):
+    """
+    Pick the most central sentences of a text
+
+    Args:
+        text (str): Transcript or caption text
+        sentence_count (int): Number of sentences to pick
+
+    Returns:
+        list: The picked sentences (or passages, for very long texts) in
+            their original order
+    """
+    sentences = split_sentences(text)
+    if len(sentences) > MAX_SENTENCES:
+        sentences = _merge_passages(sentences, MAX_SENTENCES)
+
+    if len(sentences) <= sentence_count:
+        return sentences
+
+    scores = rank_sentences(sentences)
+    best = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)
+    return [sentences[i] for i in sorted(best[:sentence_count])]
+
+
+_CAPTION_TIMING = re.compile(r"-->")
+_CAPTION_TAG = re.compile(r"<[^>]+>")
+
+
+def caption_text(content):
+    """
+    Extract the spoken text of a WebVTT or SRT caption file
+
+    Cue numbers, timings, headers and markup are dropped, and so are the lines
+    that auto-generated captions repeat while they scroll.
+
+    Args:
+        content (str): Caption file content
+
+    Returns:
+        str: Caption text
+    """
+    lines = []
+    skipping_block = False
+
+    for line in content.splitlines():
+        line = line.strip()
+
+        if not line:
+            skipping_block = False
+            continue
+
+        if line.startswith(("WEBVTT", "NOTE", "STYLE", "REGION")):
+            # Header and metadata blocks run until the next blank line
+            skipping_block = True
+            continue
+
+        if skipping_block or line.isdigit() or _CAPTION_TIMING.search(line):
+            continue
+
+        line = _CAPTION_TAG.sub("", line).strip()
+        if line and (not lines or lines[-1] != line):
+            lines.append(line)
+
+    return " ".join(lines)
@@ -0,0 +1,216 @@
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from get_links_from_playlist.models import Video
+
+from .deadline import Deadline
+from .gemini import (
+    API_KEY_MISSING_ERROR,
+    GenerationError,
+    generate_text,
+    generate_text_async,
+    get_model,
+)
+from .models import Transcript
+from .search import index_video
+
+# Shorter "transcripts" are usually the model explaining that it could not
+# watch the video, and are not worth summarizing from later
+MIN_TRANSCRIPT_CHARS = 200
+
+
+def _is_valid_video_id(video_id):
+    return bool(video_id) and re.fullmatch(r"[A-Za-z0-9_-]+", video_id) is not None
+
+
+def get_transcript(video_id):
+    """
+    Get the stored transcript of a video
+
+    Args:
+        video_id (str): Canonical YouTube video ID
+
+    Returns:
+        str: Transcript, or None if none is stored
+    """
+    if not _is_valid_video_id(video_id):
+        return None
+
+    return (
+        Transcript.objects.filter(video__video_id=video_id)
+        .values_list("text", flat=True)
+        .first()
+    )
+
+
+def save_transcript(video_id, transcript, model_name=""):
+    """
+    Store a video's transcript, independent of the summary style
+
+    Args:
+        video_id (str): Canonical YouTube video ID
+        transcript (str): Transcript text generated by the model
+        model_name (str): Model that wrote the transcript
+    """
+    # parse_transcript_and_summary leaves the ":" of "TRANSCRIPT:" in place
+    transcript = (transcript or "").lstrip(":*").strip()
+
+    if not _is_valid_video_id(video_id) or len(transcript) < MIN_TRANSCRIPT_CHARS:
+        return
+
+    Transcript.objects.update_or_create(
+        video=Video.objects.for_id(video_id),
+        defaults={"text": transcript, "model_name": model_name or ""},
+    )
+    index_video(video_id)
+
+
+def build_transcript_prompt(transcript, style="detailed"):
+    """
+    Build the prompt summarizing a stored transcript
+
+    Args:
+        transcript (str): Transcript text
+        style (str): Summary style
+
+    Returns:
+        str: Prompt text
+    """
+    from .views import get_style_instruction
+
+    return f"""
+    Below is the transcript of a YouTube video. Summarize it.
+    {get_style_instruction(style)}
+
+    {transcript}
+    """
+
+
+def summarize_transcript_text(model, transcript, style, deadline):
+    """
+    Summarize transcript text with the shorter output budget
+
+    Returns:
+        str: Summary
+
+    Raises:
+        GenerationError: If the prompt failed for good
+        DeadlineExceeded: If the time budget runs out
+    """
+    return generate_text(
+        model,
+        build_transcript_prompt(transcript, style),
+        deadline,
+        f"{style} summary from transcript",
+        generation_config={
+            "max_output_tokens": settings.TRANSCRIPT_SUMMARY_MAX_OUTPUT_TOKENS
+        },
+    )
+
+
+async def summarize_transcript_text_async(model, transcript, style, deadline):
+    """
+    Async version of summarize_transcript_text
+
+    Returns:
+        str: Summary
+    """
+    return await generate_text_async(
+        model,
+        build_transcript_prompt(transcript, style),
+        deadline,
+        f"{style} summary from transcript",
+        generation_config={
+            "max_output_tokens": settings.TRANSCRIPT_SUMMARY_MAX_OUTPUT_TOKENS
+        },
+    )
+
+
+def _stored_transcript_result(video_url, video_id, transcript, summary, style, model):
+    return {
+        "title": f"Video URL: {video_url}",
+        "video_id": video_id,
+        "transcript": transcript,
+        "summary": summary,
+        "style": style,
+        "model": model.model_name,
+        "from_stored_transcript": True,
+    }
+
+
+def summarize_stored_transcript(
+    video_url, video_id, style="detailed", deadline=None, model_name=None
+):
+    """
+    Summarize a video from its stored transcript instead of having the model
+    process the video and write the transcript again
+
+    Args:
+        video_url (str): YouTube video URL
+        video_id (str): Canonical YouTube video ID
+        style (str): Summary style
+        deadline (Deadline): Time budget shared with the caller's other stages
+        model_name (str): Model to use, defaults to settings.GEMINI_MODEL
+
+    Returns:
+        dict: Transcript and summary data, error message, or None if no
+            transcript is stored
+
+    Raises:
+        DeadlineExceeded: If the time budget runs out
+    """
+    transcript = get_transcript(video_id)
+    if transcript is None:
+        return None
+
+    if deadline is None:
+        deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
+
+    model = get_model(model_name)
+    if model is None:
+        return {"error": API_KEY_MISSING_ERROR, "retriable": False}
+
+    print(f"Summarizing video {video_id} ({style}) from its stored transcript")
+
+    try:
+        summary = summarize_transcript_text(model, transcript, style, deadline)
+    except GenerationError as e:
+        return {"error": str(e), "retriable": e.retriable}
+
+    return _stored_transcript_result(video_url, video_id, transcript, summary, style, model)
+
+
+async def summarize_stored_transcript_async(
+    video_url, video_id, style="detailed", deadline=None, model_name=None
+):
+    """
+    Async version of summarize_stored_transcript
+
+    Returns:
+        dict: Transcript and summary data, error message, or None if no
+            transcript is stored
+
+    Raises:
+        DeadlineExceeded: If the time budget runs out
+    """
+    transcript = await sync_to_async(get_transcript)(video_id)
+    if transcript is None:
+        return None
+
+    if deadline is None:
+        deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
+
+    model = get_model(model_name)
+    if model is None:
+        return {"error": API_KEY_MISSING_ERROR, "retriable": False}
+
+    print(f"Summarizing video {video_id} ({style}) from its stored transcript")
+
+    try:
+        summary = await summarize_transcript_text_async(model, transcript, style, deadline)
+    except GenerationError as e:
+        return {"error": str(e), "retriable": e.retriable}
+
+    return _stored_transcript_result(video_url, video_id, transcript, summary, style, model)
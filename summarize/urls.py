@@ -5,6 +5,41 @@ from . import views
 urlpatterns = [
     path("", views.index, name="summarize_index"),
     path("video/", views.get_video_summary, name="get_video_summary"),
+    path("video/batch/", views.get_video_summaries_batch, name="get_video_summaries_batch"),
     path("test-connection/", views.test_api_connection, name="test_api_connection"),
     path("playlist/", views.summarize_playlist, name="summarize_playlist"),
+    path(
+        "playlist/stream/",
+        views.summarize_playlist_stream,
+        name="summarize_playlist_stream",
+    ),
+    path(
+        "playlist/digest/",
+        views.summarize_playlist_digest,
+        name="summarize_playlist_digest",
+    ),
+    path(
+        "playlist/summaries/",
+        views.playlist_summary_status,
+        name="playlist_summary_status",
+    ),
+    path("playlist/export/", views.export_playlist, name="export_playlist"),
+    path("search/", views.search, name="search_summaries"),
+    # Async versions of the endpoints above, for ASGI servers
+    path("async/video/", views.get_video_summary_async, name="get_video_summary_async"),
+    path(
+        "async/test-connection/",
+        views.test_api_connection_async,
+        name="test_api_connection_async",
+    ),
+    path(
+        "async/playlist/",
+        views.summarize_playlist_async,
+        name="summarize_playlist_async",
+    ),
+    path(
+        "playlist/jobs/<str:job_id>/",
+        views.playlist_job_status,
+        name="playlist_job_status",
+    ),
 ]
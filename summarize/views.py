@@ -11,9 +11,57 @@ from django.conf import settings
 from pathlib import Path
 import sys
 import re
-
-# Import Google's Generative AI library
-import google.generativeai as genai
+import shutil
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from asgiref.sync import sync_to_async
+from django.db.models import Exists, OuterRef
+
+from django_project.metrics import FALLBACKS, STAGE_SECONDS
+from get_links_from_playlist.models import Playlist
+from get_links_from_playlist.views import get_playlist_id
+
+from .batch import iter_batch_summaries
+from .cache import (
+    PROMPT_VERSION,
+    get_cached_summary,
+    set_cached_summary,
+    summarized_video_ids,
+)
+from .deadline import Deadline, DeadlineExceeded, is_retriable_error
+from .export import EXPORT_FORMATS, iter_export_records, iter_ndjson, iter_zip
+from .gemini import (
+    API_KEY_MISSING_ERROR,
+    generate_content,
+    generate_content_async,
+    get_model,
+    get_model_status,
+    mark_model_working,
+    record_request,
+    record_token_usage,
+    report_model_error,
+)
+from .digest import build_playlist_digest
+from .engines import DEFAULT_ENGINE, get_engine, summarize_degraded
+from .jobs import enqueue_playlist_job, get_playlist_job
+from .longvideo import summarize_long_video
+from .manifest import RunManifest
+from .models import Summary
+from .multistyle import summarize_video_styles
+from .search import SearchUnavailable, search_summaries
+from .ratelimit import estimate_tokens, get_gemini_limiter
+from .router import (
+    AUTO_TIER,
+    route_models,
+    run_with_escalation,
+    tier_models,
+    validate_model_tier,
+)
+from .singleflight import begin as begin_flight
+from .singleflight import finish as finish_flight
+from .singleflight import run_once
+from .transcripts import get_transcript, save_transcript, summarize_stored_transcript
 
 
 def extract_video_id_from_url(url):
@@ -58,7 +106,91 @@ def ensure_youtube_url(video_input):
         return f"https://youtu.be/{video_input}"
 
 
-def summarize_youtube_video_with_gemini(video_input, style="detailed", retries=3):
+def get_style_instruction(style):
+    """
+    Get the prompt instruction for a summary style
+
+    Args:
+        style (str): Summary style
+
+    Returns:
+        str: Instruction describing the summary to write
+    """
+    if style == "short":
+        return "Provide a concise summary in 3-5 bullet points with only the most important information."
+    elif style == "academic":
+        return "Provide an academic analysis of the content with formal language, critical evaluation of arguments, and references to key concepts."
+    elif style == "descriptive":
+        return "Provide a detailed descriptive summary, focusing on the visuals, setting, and presentation style along with the content."
+    elif style == "technical":
+        return "Focus on technical details, specifications, methodologies, and processes mentioned in the video."
+    else:  # detailed is default
+        return "Provide a comprehensive summary that captures all key points, arguments, examples, and conclusions."
+
+
+def build_detailed_prompt(video_url, style="detailed", window=None):
+    """
+    Build the prompt asking Gemini for a transcript and a styled summary
+
+    Args:
+        video_url (str): YouTube video URL
+        style (str): Summary style
+        window (str): Only cover this part of the video, e.g. "from 0:15:00 to 0:30:00"
+
+    Returns:
+        str: Prompt text
+    """
+    # Create style-specific prompt enhancement
+    style_prompt = get_style_instruction(style)
+
+    window_prompt = ""
+    if window:
+        window_prompt = f"\n    Only cover the part of the video {window}; ignore everything before and after it."
+
+    # Create the prompt with clear instructions
+    prompt = f"""
+    You're analyzing a YouTube video: {video_url}{window_prompt}
+    
+    First, provide a complete transcript of the video in a section titled "TRANSCRIPT".
+    
+    Then, in a section titled "SUMMARY", summarize the video content.
+    {style_prompt}
+    
+    Format your response exactly like this:
+    
+    TRANSCRIPT:
+    [Full transcript text here]
+    
+    SUMMARY:
+    [Your summary here]
+    """
+
+    return prompt
+
+
+def parse_transcript_and_summary(generated_text):
+    """
+    Split a response to the detailed prompt into transcript and summary
+
+    Args:
+        generated_text (str): Text generated by the model
+
+    Returns:
+        tuple: (transcript, summary)
+    """
+    if "TRANSCRIPT" in generated_text.upper() and "SUMMARY" in generated_text.upper():
+        parts = generated_text.split("SUMMARY", 1)
+        transcript = parts[0].replace("TRANSCRIPT", "", 1).strip()
+        summary = parts[1].strip()
+        return transcript, summary
+
+    # If the format is different, just use the whole text as a summary
+    return "", generated_text
+
+
+def summarize_youtube_video_with_gemini(
+    video_input, style="detailed", retries=3, deadline=None, model_name=None
+):
     """
     Get a transcript and summary of a YouTube video using Google's Gemini model with
     direct API integration and prompt engineering
@@ -67,70 +199,44 @@ def summarize_youtube_video_with_gemini(video_input, style="detailed", retries=3
         video_input (str): YouTube video URL or ID
         style (str): Summary style (detailed, short, academic, descriptive)
         retries (int): Number of retry attempts
+        deadline (Deadline): Time budget shared with the caller's other stages
+        model_name (str): Model to use, defaults to settings.GEMINI_MODEL
 
     Returns:
-        dict: Transcript and summary data or error message
-    """
-    try:
-        # Get API key from environment
-        api_key = os.environ.get("GEMINI_API_KEY")
+        dict: Transcript and summary data or error message. Errors carry
+            "retriable": false when retrying or falling back cannot help.
 
-        if not api_key:
-            return {
-                "error": "Gemini API key not configured. Please set GEMINI_API_KEY in your .env file."
-            }
+    Raises:
+        DeadlineExceeded: If the time budget runs out
+    """
+    if deadline is None:
+        deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
 
-        # Configure the Gemini API
-        genai.configure(api_key=api_key)
+    try:
+        # Shared model - the requested one, falling back to others
+        model = get_model(model_name)
 
-        # Initialize the model - starting with most capable model, can fall back to others
-        try:
-            model = genai.GenerativeModel("gemini-1.5-pro")
-        except Exception as e:
-            print(f"Error initializing model: {str(e)}, trying fallback model")
-            model = genai.GenerativeModel("gemini-1.0-pro")
+        if model is None:
+            return {"error": API_KEY_MISSING_ERROR, "retriable": False}
 
         # Ensure we have a proper YouTube URL
         video_url = ensure_youtube_url(video_input)
         video_id = extract_video_id_from_url(video_url)
 
-        # Create style-specific prompt enhancement
-        style_prompt = ""
-        if style == "short":
-            style_prompt = "Provide a concise summary in 3-5 bullet points with only the most important information."
-        elif style == "academic":
-            style_prompt = "Provide an academic analysis of the content with formal language, critical evaluation of arguments, and references to key concepts."
-        elif style == "descriptive":
-            style_prompt = "Provide a detailed descriptive summary, focusing on the visuals, setting, and presentation style along with the content."
-        elif style == "technical":
-            style_prompt = "Focus on technical details, specifications, methodologies, and processes mentioned in the video."
-        else:  # detailed is default
-            style_prompt = "Provide a comprehensive summary that captures all key points, arguments, examples, and conclusions."
-
         # Create the prompt with clear instructions
-        prompt = f"""
-        You're analyzing a YouTube video: {video_url}
-        
-        First, provide a complete transcript of the video in a section titled "TRANSCRIPT".
-        
-        Then, in a section titled "SUMMARY", summarize the video content.
-        {style_prompt}
-        
-        Format your response exactly like this:
-        
-        TRANSCRIPT:
-        [Full transcript text here]
-        
-        SUMMARY:
-        [Your summary here]
-        """
+        prompt = build_detailed_prompt(video_url, style)
 
         for attempt in range(retries):
+            stage = f"detailed prompt attempt {attempt+1}"
+            deadline.check(stage)
+
             try:
                 print(f"Attempt {attempt+1}/{retries} for video {video_url}")
 
-                # Make the API request with the video URL
-                response = model.generate_content(prompt)
+                # Make the API request with the video URL, bounded by the time left
+                response = generate_content(
+                    model, prompt, request_options={"timeout": deadline.remaining()}
+                )
 
                 # Extract the text response
                 if hasattr(response, "text"):
@@ -139,19 +245,7 @@ def summarize_youtube_video_with_gemini(video_input, style="detailed", retries=3
                     generated_text = str(response)
 
                 # Parse the generated text to separate transcript and summary
-                transcript = ""
-                summary = ""
-
-                if (
-                    "TRANSCRIPT" in generated_text.upper()
-                    and "SUMMARY" in generated_text.upper()
-                ):
-                    parts = generated_text.split("SUMMARY", 1)
-                    transcript = parts[0].replace("TRANSCRIPT", "", 1).strip()
-                    summary = parts[1].strip()
-                else:
-                    # If the format is different, just use the whole text as a summary
-                    summary = generated_text
+                transcript, summary = parse_transcript_and_summary(generated_text)
 
                 return {
                     "title": f"Video URL: {video_url}",
@@ -160,19 +254,33 @@ def summarize_youtube_video_with_gemini(video_input, style="detailed", retries=3
                     "summary": summary,
                     "raw_response": generated_text,
                     "style": style,
+                    "model": model.model_name,
                 }
 
             except Exception as e:
                 print(f"Error on attempt {attempt+1}: {str(e)}")
+
+                if deadline.remaining() <= 0:
+                    raise DeadlineExceeded(stage, deadline.budget)
+
+                if not is_retriable_error(e):
+                    # Fail fast: this error will not go away on retry
+                    return {
+                        "error": f"Error summarizing video: {str(e)}",
+                        "retriable": False,
+                    }
+
                 if attempt < retries - 1:
-                    wait_time = (attempt + 1) * 3
-                    print(f"Waiting {wait_time} seconds before retrying...")
-                    time.sleep(wait_time)
+                    wait_time = get_gemini_limiter().backoff_delay(attempt)
+                    print(f"Waiting {wait_time:.1f} seconds before retrying...")
+                    deadline.sleep(wait_time, f"backoff after attempt {attempt+1}")
                 else:
                     return {"error": f"Failed after {retries} attempts: {str(e)}"}
 
         return {"error": "Failed to generate summary after multiple attempts"}
 
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         import traceback
 
@@ -180,52 +288,265 @@ def summarize_youtube_video_with_gemini(video_input, style="detailed", retries=3
         return {"error": f"Error summarizing video: {str(e)}"}
 
 
-def summarize_youtube_video_with_simple_prompt(video_input, style="detailed"):
+class TranscriptSummaryStreamParser:
+    """
+    Incrementally splits streamed output of the detailed prompt into transcript
+    and summary text as the TRANSCRIPT: / SUMMARY: markers go by. Text that
+    could be the start of a marker split across chunks is held back until the
+    next chunk arrives.
+    """
+
+    MARKERS = {"TRANSCRIPT:": "transcript", "SUMMARY:": "summary"}
+
+    def __init__(self):
+        self.section = "transcript"
+        self.buffer = ""
+
+    def feed(self, text):
+        """
+        Consume a chunk of generated text
+
+        Args:
+            text (str): Newly generated text
+
+        Returns:
+            list: (section, text) pairs that are ready to be sent
+        """
+        self.buffer += text
+        pieces = []
+
+        while True:
+            found = [
+                (self.buffer.find(marker), marker)
+                for marker in self.MARKERS
+                if marker in self.buffer
+            ]
+            if not found:
+                break
+
+            position, marker = min(found)
+            if position:
+                pieces.append((self.section, self.buffer[:position]))
+            self.section = self.MARKERS[marker]
+            self.buffer = self.buffer[position + len(marker) :]
+
+        # Hold back a trailing partial marker
+        held = 0
+        for marker in self.MARKERS:
+            for length in range(len(marker) - 1, 0, -1):
+                if self.buffer.endswith(marker[:length]):
+                    held = max(held, length)
+                    break
+
+        ready = self.buffer[: len(self.buffer) - held]
+        if ready:
+            pieces.append((self.section, ready))
+        self.buffer = self.buffer[len(self.buffer) - held :]
+
+        return pieces
+
+    def close(self):
+        """
+        Flush any held-back text once generation has finished
+
+        Returns:
+            list: (section, text) pairs
+        """
+        pieces = [(self.section, self.buffer)] if self.buffer else []
+        self.buffer = ""
+        return pieces
+
+
+def stream_youtube_video_with_gemini(
+    video_input, style="detailed", retries=3, deadline=None, model_name=None
+):
+    """
+    Streaming version of summarize_youtube_video_with_gemini that relays model
+    output as it is generated
+
+    Args:
+        video_input (str): YouTube video URL or ID
+        style (str): Summary style
+        retries (int): Number of attempts before any output has been sent
+        deadline (Deadline): Time budget for all attempts, backoff and the
+            stream itself; defaults to settings.SUMMARY_DEADLINE_SECONDS
+        model_name (str): Model to use, defaults to settings.GEMINI_MODEL
+
+    Yields:
+        tuple: ("chunk", {"section": "transcript|summary", "text": "..."}) for
+            each piece of output, then ("complete", summary_data) or
+            ("error", {"error": "..."}). If the time budget runs out, the
+            error has "deadline_exceeded": true and the "stage" that used it up.
+    """
+    if deadline is None:
+        deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
+
+    model = get_model(model_name)
+
+    if model is None:
+        yield "error", {"error": API_KEY_MISSING_ERROR}
+        return
+
+    video_url = ensure_youtube_url(video_input)
+    video_id = extract_video_id_from_url(video_url)
+    prompt = build_detailed_prompt(video_url, style)
+
+    for attempt in range(retries):
+        parser = TranscriptSummaryStreamParser()
+        generated_text = ""
+        stage = f"streaming attempt {attempt+1}"
+
+        try:
+            deadline.check(stage)
+            print(f"Streaming attempt {attempt+1}/{retries} for video {video_url}")
+
+            # Hold a rate limiter slot for as long as the response is streaming
+            with get_gemini_limiter().slot(estimate_tokens(prompt)) as usage:
+                usage_metadata = None
+
+                # Includes the time the client takes to read the chunks
+                with STAGE_SECONDS.time(stage="generate_content_stream"):
+                    for chunk in model.generate_content(
+                        prompt,
+                        stream=True,
+                        request_options={"timeout": deadline.remaining()},
+                    ):
+                        # The timeout bounds each read; this bounds the whole stream
+                        deadline.check(stage)
+                        text = chunk.text if hasattr(chunk, "text") else str(chunk)
+                        generated_text += text
+
+                        if getattr(chunk, "usage_metadata", None) is not None:
+                            usage_metadata = chunk.usage_metadata
+                            usage["total_tokens"] = getattr(
+                                usage_metadata, "total_token_count", 0
+                            )
+
+                        for section, piece in parser.feed(text):
+                            yield "chunk", {"section": section, "text": piece}
+
+                # The counts of the last chunk cover the whole response
+                if usage_metadata is not None:
+                    record_token_usage(usage_metadata)
+
+            record_request(model, succeeded=True)
+            mark_model_working(model)
+
+            for section, piece in parser.close():
+                yield "chunk", {"section": section, "text": piece}
+
+        except Exception as e:
+            if not isinstance(e, DeadlineExceeded):
+                record_request(model, succeeded=False)
+                report_model_error(model, e)
+            print(f"Error on streaming attempt {attempt+1}: {str(e)}")
+
+            try:
+                if deadline.remaining() <= 0:
+                    raise DeadlineExceeded(stage, deadline.budget)
+
+                # Output already sent to the client can't be taken back, so only
+                # retry if the model failed before producing anything
+                if generated_text or attempt == retries - 1 or not is_retriable_error(e):
+                    yield "error", {
+                        "error": f"Error streaming summary: {str(e)}",
+                        "retriable": is_retriable_error(e),
+                    }
+                    return
+
+                wait_time = get_gemini_limiter().backoff_delay(attempt)
+                print(f"Waiting {wait_time:.1f} seconds before retrying...")
+                deadline.sleep(wait_time, f"backoff after streaming attempt {attempt+1}")
+            except DeadlineExceeded as e:
+                yield "error", {
+                    "error": str(e),
+                    "deadline_exceeded": True,
+                    "stage": e.stage,
+                    "retriable": False,
+                }
+                return
+            continue
+
+        transcript, summary = parse_transcript_and_summary(generated_text)
+
+        yield "complete", {
+            "title": f"Video URL: {video_url}",
+            "video_id": video_id,
+            "transcript": transcript,
+            "summary": summary,
+            "raw_response": generated_text,
+            "style": style,
+            "model": model.model_name,
+        }
+        return
+
+
+def build_simple_prompt(video_url, style="detailed"):
+    """
+    Build the short prompt used when the detailed prompt fails
+
+    Args:
+        video_url (str): YouTube video URL
+        style (str): Summary style
+
+    Returns:
+        str: Prompt text
+    """
+    # Style-specific prompt
+    style_instruction = ""
+    if style == "short":
+        style_instruction = "Make it concise with 3-5 bullet points."
+    elif style == "academic":
+        style_instruction = "Use academic language and critical analysis."
+    elif style == "descriptive":
+        style_instruction = "Be descriptive about visuals and presentation style."
+    elif style == "technical":
+        style_instruction = "Focus on technical details and methodologies."
+
+    # Simple, direct prompt
+    return f"Summarize the video: {video_url}. {style_instruction}"
+
+
+@STAGE_SECONDS.time(stage="simple_prompt_fallback")
+def summarize_youtube_video_with_simple_prompt(
+    video_input, style="detailed", deadline=None, model_name=None
+):
     """
     Simplified version using just the video URL in prompt
 
     Args:
         video_input (str): YouTube video URL or ID
         style (str): Summary style
+        deadline (Deadline): Time budget shared with the caller's other stages
+        model_name (str): Model to use, defaults to settings.GEMINI_MODEL
 
     Returns:
         dict: Summary data or error message
-    """
-    try:
-        # Get API key from environment
-        api_key = os.environ.get("GEMINI_API_KEY")
 
-        if not api_key:
-            return {
-                "error": "Gemini API key not configured. Please set GEMINI_API_KEY in your .env file."
-            }
+    Raises:
+        DeadlineExceeded: If the time budget runs out
+    """
+    if deadline is None:
+        deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
 
-        # Configure the Gemini API
-        genai.configure(api_key=api_key)
+    try:
+        # Shared model
+        model = get_model(model_name)
 
-        # Initialize the model
-        model = genai.GenerativeModel("gemini-1.5-pro")
+        if model is None:
+            return {"error": API_KEY_MISSING_ERROR, "retriable": False}
 
         # Ensure we have a proper YouTube URL
         video_url = ensure_youtube_url(video_input)
         video_id = extract_video_id_from_url(video_url)
 
-        # Style-specific prompt
-        style_instruction = ""
-        if style == "short":
-            style_instruction = "Make it concise with 3-5 bullet points."
-        elif style == "academic":
-            style_instruction = "Use academic language and critical analysis."
-        elif style == "descriptive":
-            style_instruction = "Be descriptive about visuals and presentation style."
-        elif style == "technical":
-            style_instruction = "Focus on technical details and methodologies."
-
-        # Simple, direct prompt
-        prompt = f"Summarize the video: {video_url}. {style_instruction}"
+        prompt = build_simple_prompt(video_url, style)
 
-        # Make the request
-        response = model.generate_content(prompt)
+        # Make the request, bounded by the time left
+        deadline.check("simple prompt fallback")
+        response = generate_content(
+            model, prompt, request_options={"timeout": deadline.remaining()}
+        )
 
         # Extract and return the response
         summary = response.text if hasattr(response, "text") else str(response)
@@ -235,215 +556,2052 @@ def summarize_youtube_video_with_simple_prompt(video_input, style="detailed"):
             "video_id": video_id,
             "summary": summary,
             "style": style,
+            "model": model.model_name,
         }
 
     except Exception as e:
-        return {"error": f"Error with simple prompt: {str(e)}"}
+        if deadline.remaining() <= 0:
+            raise DeadlineExceeded("simple prompt fallback", deadline.budget)
+        return {
+            "error": f"Error with simple prompt: {str(e)}",
+            "retriable": is_retriable_error(e),
+        }
 
 
-@csrf_exempt
-def get_video_summary(request):
+def resolve_long_video(video_input, duration=None, long_video=None):
     """
-    API endpoint that takes a YouTube video URL or ID and returns its transcript and summary
+    Decide whether a video is summarized in time windows
 
-    Request (POST JSON):
-        {
-            "video_id": "VIDEO_ID"  OR  "video_url": "VIDEO_URL",
-            "style": "detailed|short|academic|descriptive|technical" (optional, default: "detailed"),
-            "save_to_file": true/false (optional, default: false)
-        }
+    Args:
+        video_input (str): YouTube video URL or ID
+        duration (int): Video length in seconds, if known
+        long_video (bool): True to force long-video mode (looking the duration
+            up with yt-dlp if needed), False to disable it, None to decide
+            from the duration
 
-    Response:
-        {
-            "success": true/false,
-            "transcript": "video transcript",
-            "summary": "video summary",
-            "file_path": "/path/to/saved/file.txt" (if save_to_file is true),
-            "error": "Error message if any"
-        }
+    Returns:
+        tuple: (long_video, duration)
     """
-    if request.method != "POST":
-        return JsonResponse({"error": "Only POST method is allowed"}, status=405)
+    if long_video and duration is None:
+        from get_links_from_playlist.views import get_video_duration
 
-    try:
-        data = json.loads(request.body)
-        video_input = data.get("video_url") or data.get("video_id")
-        style = data.get("style", "detailed")
-        save_to_file = data.get("save_to_file", False)
+        duration = get_video_duration(ensure_youtube_url(video_input))
 
-        if not video_input:
-            return JsonResponse(
-                {"error": "Missing video_url or video_id parameter"}, status=400
-            )
+    if long_video is None:
+        long_video = (
+            duration is not None and duration >= settings.LONG_VIDEO_THRESHOLD_SECONDS
+        )
 
-        # Get the summary with the selected style
-        response_data = summarize_youtube_video_with_gemini(video_input, style)
+    # A video that fits in a single window is summarized in one call anyway
+    long_video = bool(
+        long_video and duration and duration > settings.LONG_VIDEO_CHUNK_SECONDS
+    )
 
-        # If first method fails, try a simpler approach
-        if isinstance(response_data, dict) and "error" in response_data:
+    return long_video, duration
+
+
+def summarize_video(
+    video_input,
+    style="detailed",
+    use_cache=True,
+    deadline=None,
+    duration=None,
+    long_video=None,
+    engine=None,
+    model_tier=None,
+):
+    """
+    Summarize a video, serving repeat requests from the summary cache and
+    falling back to the simple prompt if the detailed prompt fails
+
+    Args:
+        video_input (str): YouTube video URL or ID
+        style (str): Summary style
+        use_cache (bool): Whether to read cached summaries
+        deadline (Deadline): Time budget for all attempts, backoff and the
+            fallback; defaults to settings.SUMMARY_DEADLINE_SECONDS
+        duration (int): Video length in seconds, if known
+        long_video (bool): Summarize the video in time windows (see
+            summarize/longvideo.py). None decides from `duration`; True looks
+            the duration up with yt-dlp if it is not given.
+        engine (str): Summarization backend (see summarize/engines.py),
+            defaults to Gemini
+        model_tier (str): Gemini model tier (see summarize/router.py);
+            "auto" or None lets the router choose. With a fixed tier, cached
+            summaries written by another tier's model are not used.
+
+    Returns:
+        dict: Transcript and summary data or error message. If the time
+            budget ran out, the error has "deadline_exceeded": true and the
+            "stage" that used it up.
+    """
+    if deadline is None:
+        deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
+
+    engine = get_engine(engine)
+    video_id = extract_video_id_from_url(ensure_youtube_url(video_input))
+
+    if not engine.cacheable:
+        return engine.summarize(
+            video_input, video_id, style, deadline, duration, long_video, model_tier
+        )
+
+    def cached_summary():
+        cached = get_cached_summary(video_id, style, tier_models(model_tier))
+        return None if cached is None else {**cached, "cached": True}
+
+    if use_cache:
+        cached = cached_summary()
+        if cached is not None:
+            print(f"Cache hit for video {video_id} ({style})")
+            return cached
+
+    def generate():
+        return engine.summarize(
+            video_input, video_id, style, deadline, duration, long_video, model_tier
+        )
+
+    # Concurrent requests for the same video, style and tier share one generation
+    return run_once(
+        f"{video_id}|{style}|{model_tier or AUTO_TIER}",
+        generate,
+        # Another process may have generated the summary while we waited
+        recheck=cached_summary if use_cache else None,
+        timeout=deadline.remaining(),
+    )
+
+
+def generate_video_summary(
+    video_input, video_id, style, deadline, duration, long_video, model_tier=None
+):
+    """
+    Generate and cache a video summary with Gemini; the uncached part of
+    summarize_video. The model is picked by the router (see
+    summarize/router.py). If Gemini cannot answer because of a retriable
+    error, its quota or the deadline, an extractive summary of the video's
+    local transcript is returned instead when there is one (see
+    summarize_degraded); it is marked "degraded" and not cached. Terminal
+    errors (invalid video, blocked content, bad request) are returned as they are.
+    """
+    # While Gemini is over its quota, answer at once rather than queue for it
+    if settings.DEGRADED_MODE_SECONDS and get_gemini_limiter().rate_limited_within(
+        settings.DEGRADED_MODE_SECONDS
+    ):
+        degraded = summarize_degraded(video_id, style, "Gemini quota exceeded")
+        if degraded is not None:
+            return degraded
+
+    try:
+        models = route_models(style, duration, deadline, model_tier)
+
+        # A stored transcript only needs summarizing, which is much cheaper
+        # than having the model transcribe the video again
+        response_data = run_with_escalation(
+            models,
+            style,
+            lambda model_name: summarize_stored_transcript(
+                ensure_youtube_url(video_input),
+                video_id,
+                style,
+                deadline=deadline,
+                model_name=model_name,
+            ),
+        )
+
+        if response_data is not None and "error" in response_data:
+            if not response_data.get("retriable", True):
+                return response_data
+
+            print(
+                f"Summary from stored transcript failed: {response_data['error']}. Processing the video..."
+            )
+            response_data = None
+
+        if response_data is None:
+            long_video, duration = resolve_long_video(video_input, duration, long_video)
+
+            if long_video:
+                response_data = run_with_escalation(
+                    models,
+                    style,
+                    lambda model_name: summarize_long_video(
+                        ensure_youtube_url(video_input),
+                        duration,
+                        style,
+                        deadline=deadline,
+                        model_name=model_name,
+                    ),
+                )
+            else:
+                # Try with detailed prompt first
+                response_data = run_with_escalation(
+                    models,
+                    style,
+                    lambda model_name: summarize_youtube_video_with_gemini(
+                        video_input, style, deadline=deadline, model_name=model_name
+                    ),
+                )
+
+        # If first method fails, try a simpler approach - unless the error is
+        # one that no prompt can get past
+        if (
+            isinstance(response_data, dict)
+            and "error" in response_data
+            and response_data.get("retriable", True)
+        ):
             print(
                 f"Detailed method failed: {response_data['error']}. Trying simple approach..."
             )
-            response_data = summarize_youtube_video_with_simple_prompt(
-                video_input, style
+            FALLBACKS.inc(kind="simple_prompt")
+            response_data = run_with_escalation(
+                models,
+                style,
+                lambda model_name: summarize_youtube_video_with_simple_prompt(
+                    video_input, style, deadline=deadline, model_name=model_name
+                ),
             )
+    except DeadlineExceeded as e:
+        print(f"Deadline exceeded for video {video_id}: {str(e)}")
+        return summarize_degraded(video_id, style, str(e)) or {
+            "error": str(e),
+            "deadline_exceeded": True,
+            "stage": e.stage,
+        }
 
-        if isinstance(response_data, dict) and "error" in response_data:
-            return JsonResponse(response_data, status=400)
+    if isinstance(response_data, dict) and "error" in response_data:
+        if not response_data.get("retriable", True):
+            return response_data
+        return summarize_degraded(video_id, style, response_data["error"]) or response_data
 
-        result = {
-            "success": True,
-            "transcript": response_data.get("transcript", ""),
-            "summary": response_data.get("summary", ""),
-            "style": response_data.get("style", style),
-        }
+    if isinstance(response_data, dict):
+        store_summary(video_id, style, response_data)
 
-        # Save to file if requested
-        if save_to_file:
-            output_dir = Path(settings.BASE_DIR) / "summary_files"
-            output_dir.mkdir(exist_ok=True)
+    return response_data
 
-            # Extract video ID for filename
-            video_id = response_data.get(
-                "video_id", extract_video_id_from_url(video_input)
-            )
-            if not video_id:
-                video_id = "unknown"
 
-            output_file = output_dir / f"summary_{video_id}_{style}.txt"
+def store_summary(video_id, style, response_data):
+    """
+    Cache a newly generated summary and store its transcript for later
+    summaries of the same video
 
-            # Format the transcript and summary for the file
-            with open(output_file, "w", encoding="utf-8") as f:
-                if "title" in response_data:
-                    f.write(f"Title: {response_data['title']}\n\n")
+    Args:
+        video_id (str): Canonical YouTube video ID
+        style (str): Summary style
+        response_data (dict): Transcript and summary data
+    """
+    set_cached_summary(video_id, style, response_data)
 
-                if "style" in response_data:
-                    f.write(f"Style: {response_data['style']}\n\n")
+    if response_data.get("transcript") and not response_data.get("from_stored_transcript"):
+        save_transcript(
+            video_id, response_data["transcript"], response_data.get("model", "")
+        )
 
-                if "transcript" in response_data and response_data["transcript"]:
-                    f.write("Transcript:\n\n")
-                    f.write(response_data["transcript"])
-                    f.write("\n\n")
 
-                if "summary" in response_data and response_data["summary"]:
-                    f.write("Summary:\n\n")
-                    f.write(response_data["summary"])
+@STAGE_SECONDS.time(stage="artifact_write")
+def save_video_summary(response_data, video_input, style):
+    """
+    Save a video's transcript and summary to summary_files/
 
-            result["file_path"] = str(output_file)
+    Args:
+        response_data (dict): Transcript and summary data
+        video_input (str): YouTube video URL or ID
+        style (str): Summary style
 
-        return JsonResponse(result)
+    Returns:
+        str: Path to the saved file
+    """
+    output_dir = Path(settings.BASE_DIR) / "summary_files"
+    output_dir.mkdir(exist_ok=True)
 
-    except json.JSONDecodeError:
-        return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
-    except Exception as e:
-        import traceback
+    # Extract video ID for filename
+    video_id = response_data.get("video_id", extract_video_id_from_url(video_input))
+    if not video_id:
+        video_id = "unknown"
 
-        traceback.print_exc()
-        return JsonResponse({"error": str(e)}, status=500)
+    output_file = output_dir / f"summary_{video_id}_{style}.txt"
 
+    # Format the transcript and summary for the file
+    with open(output_file, "w", encoding="utf-8") as f:
+        if "title" in response_data:
+            f.write(f"Title: {response_data['title']}\n\n")
 
-@csrf_exempt
-def test_api_connection(request):
+        if "style" in response_data:
+            f.write(f"Style: {response_data['style']}\n\n")
+
+        if "transcript" in response_data and response_data["transcript"]:
+            f.write("Transcript:\n\n")
+            f.write(response_data["transcript"])
+            f.write("\n\n")
+
+        if "summary" in response_data and response_data["summary"]:
+            f.write("Summary:\n\n")
+            f.write(response_data["summary"])
+
+    return str(output_file)
+
+
+def summary_chunk_events(response_data):
     """
-    Test endpoint to verify API key and connection
+    Send a summary that is already complete as "chunk" events
+
+    Args:
+        response_data (dict): Transcript and summary data or error message
+
+    Yields:
+        str: One event per non-empty section
     """
-    try:
-        # Get API key
-        api_key = os.environ.get("GEMINI_API_KEY")
+    if "error" in response_data:
+        return
 
-        if not api_key:
-            return JsonResponse(
-                {
-                    "status": "error",
-                    "message": "API key not found in environment variables",
-                },
-                status=400,
+    for section in ("transcript", "summary"):
+        if response_data.get(section):
+            yield format_sse_event(
+                "chunk", {"section": section, "text": response_data[section]}
             )
 
-        # Test with the Google Generative AI library directly
-        genai.configure(api_key=api_key)
 
-        # Try to initialize the model
-        try:
-            model = genai.GenerativeModel("gemini-1.5-pro")
-        except Exception as e:
-            return JsonResponse(
-                {
-                    "status": "error",
-                    "message": f"Error initializing Gemini model: {str(e)}",
-                },
-                status=400,
-            )
+def stream_summary_generation(video_input, video_id, style, deadline, duration=None):
+    """
+    Stream a new summary from Gemini as "chunk" events and cache it, falling
+    back to the simple prompt if streaming fails before any output was sent.
+    The stream uses the router's first model, since output that has been sent
+    can't be taken back to escalate; the fallback escalates as usual.
 
-        # Simple test prompt
-        test_prompt = "Hello! This is a test to verify the API connection."
+    Args:
+        video_input (str): YouTube video URL or ID
+        video_id (str): Canonical YouTube video ID
+        style (str): Summary style
+        deadline (Deadline): Time budget shared by the stream and the fallback
+        duration (int): Video length in seconds, if known
 
-        try:
-            response = model.generate_content(test_prompt)
-            response_text = (
-                response.text if hasattr(response, "text") else str(response)
-            )
+    Yields:
+        str: Events in text/event-stream format
 
-            return JsonResponse(
-                {
-                    "status": "success",
-                    "message": "Gemini API connection successful",
-                    "response_preview": (
-                        response_text[:100] + "..."
-                        if len(response_text) > 100
-                        else response_text
+    Returns:
+        dict: Transcript and summary data or error message
+    """
+    response_data = None
+    sent_output = False
+    models = route_models(style, duration, deadline)
+
+    for event, event_data in stream_youtube_video_with_gemini(
+        video_input, style, deadline=deadline, model_name=models[0]
+    ):
+        if event == "chunk":
+            sent_output = True
+            yield format_sse_event(event, event_data)
+        elif event == "complete":
+            response_data = event_data
+            store_summary(video_id, style, response_data)
+        elif not sent_output and event_data.get("retriable", True):
+            # Nothing has been shown yet, so the simple prompt can still be tried
+            print(f"Streaming failed: {event_data['error']}. Trying simple approach...")
+            FALLBACKS.inc(kind="simple_prompt")
+            try:
+                response_data = run_with_escalation(
+                    models,
+                    style,
+                    lambda model_name: summarize_youtube_video_with_simple_prompt(
+                        video_input, style, deadline=deadline, model_name=model_name
                     ),
-                    "model": "gemini-1.5-pro",
+                )
+            except DeadlineExceeded as e:
+                response_data = {
+                    "error": str(e),
+                    "deadline_exceeded": True,
+                    "stage": e.stage,
                 }
-            )
-        except Exception as e:
-            return JsonResponse(
-                {
-                    "status": "error",
-                    "message": f"Error generating content: {str(e)}",
-                },
-                status=400,
-            )
+            if "error" not in response_data:
+                store_summary(video_id, style, response_data)
+                yield from summary_chunk_events(response_data)
+        else:
+            response_data = event_data
 
-    except Exception as e:
-        import traceback
+    return response_data
 
-        traceback.print_exc()
+
+def stream_video_summary_events(
+    video_input,
+    style,
+    save_to_file,
+    use_cache=True,
+    duration=None,
+    long_video=None,
+    deadline=None,
+):
+    """
+    Generate the server-sent events of a streaming get_video_summary request
+
+    Long videos are summarized in time windows, which cannot be streamed, and
+    videos with a stored transcript are summarized quickly from it, so their
+    transcript and summary are sent as one chunk each once complete.
+
+    Args:
+        video_input (str): YouTube video URL or ID
+        style (str): Summary style
+        save_to_file (bool): Whether to save the summary once it is complete
+        use_cache (bool): Whether to serve a cached summary
+        duration (int): Video length in seconds, if known
+        long_video (bool): Long-video mode, see resolve_long_video
+        deadline (Deadline): Time budget of the whole request; defaults to
+            settings.SUMMARY_DEADLINE_SECONDS
+
+    Yields:
+        str: Events in text/event-stream format
+    """
+    if deadline is None:
+        deadline = Deadline(settings.SUMMARY_DEADLINE_SECONDS)
+
+    try:
+        video_id = extract_video_id_from_url(ensure_youtube_url(video_input))
+        response_data = None
+
+        if use_cache:
+            response_data = get_cached_summary(video_id, style, tier_models())
+            if response_data is not None:
+                response_data = {**response_data, "cached": True}
+                yield from summary_chunk_events(response_data)
+
+        if response_data is None and get_transcript(video_id) is not None:
+            # Summarizing a stored transcript is quick, so it isn't streamed
+            response_data = summarize_video(
+                video_input,
+                style,
+                use_cache=False,
+                deadline=deadline,
+                duration=duration,
+                long_video=long_video,
+            )
+            yield from summary_chunk_events(response_data)
+
+        if response_data is None:
+            long_video, duration = resolve_long_video(video_input, duration, long_video)
+
+        if response_data is None and long_video:
+            response_data = summarize_video(
+                video_input,
+                style,
+                use_cache=False,
+                deadline=deadline,
+                duration=duration,
+                long_video=True,
+            )
+            yield from summary_chunk_events(response_data)
+
+        if response_data is None:
+            # Concurrent requests for the same video and style share one
+            # generation; streams take any model's summary, like "auto" requests
+            flight_key = f"{video_id}|{style}|{AUTO_TIER}"
+            flight = begin_flight(flight_key, deadline.remaining())
+
+            if not flight.leader:
+                response_data = flight.result
+                if response_data is not None:
+                    print(f"Reusing in-flight result for {flight_key}")
+                    yield from summary_chunk_events(response_data)
+                else:
+                    response_data = yield from stream_summary_generation(
+                        video_input, video_id, style, deadline, duration
+                    )
+            else:
+                try:
+                    if use_cache:
+                        # Another process may have generated it while we waited
+                        response_data = get_cached_summary(
+                            video_id, style, tier_models()
+                        )
+                        if response_data is not None:
+                            response_data = {**response_data, "cached": True}
+                            yield from summary_chunk_events(response_data)
+
+                    if response_data is None:
+                        response_data = yield from stream_summary_generation(
+                            video_input, video_id, style, deadline, duration
+                        )
+                finally:
+                    finish_flight(flight, response_data)
+
+        if "error" in response_data:
+            yield format_sse_event("error", response_data)
+            return
+
+        result = video_summary_result(response_data, style)
+
+        if save_to_file:
+            result["file_path"] = save_video_summary(response_data, video_input, style)
+
+        yield format_sse_event("complete", result)
+
+    except Exception as e:
+        import traceback
+
+        traceback.print_exc()
+        yield format_sse_event("error", {"error": str(e)})
+
+
+def summarize_video_styles_response(video_input, styles, save_to_file, **options):
+    """
+    Build the get_video_summary response for a multi-style request
+
+    Args:
+        video_input (str): YouTube video URL or ID
+        styles (list): Summary styles
+        save_to_file (bool): Whether to save each style's summary
+        **options: Passed on to summarize_video_styles
+
+    Returns:
+        JsonResponse: Summaries per style
+    """
+    results = summarize_video_styles(video_input, styles, **options)
+
+    errors = {style: data for style, data in results.items() if "error" in data}
+    if len(errors) == len(results):
+        # Nothing to show: report the first failure like a single-style request
+        error = next(iter(errors.values()))
+        return JsonResponse(error, status=504 if error.get("deadline_exceeded") else 400)
+
+    result = {
+        "success": not errors,
+        "transcript": next(
+            (data["transcript"] for data in results.values() if data.get("transcript")),
+            "",
+        ),
+        "summaries": {
+            style: data.get("summary", "")
+            for style, data in results.items()
+            if style not in errors
+        },
+        "cached": {
+            style: data.get("cached", False)
+            for style, data in results.items()
+            if style not in errors
+        },
+    }
+
+    if errors:
+        result["errors"] = {style: data["error"] for style, data in errors.items()}
+
+    if save_to_file:
+        result["file_paths"] = {
+            style: save_video_summary(data, video_input, style)
+            for style, data in results.items()
+            if style not in errors
+        }
+
+    return JsonResponse(result)
+
+
+def video_summary_result(response_data, style):
+    """
+    Build the response of the video summary endpoints
+
+    Args:
+        response_data (dict): Transcript and summary data
+        style (str): Requested summary style
+
+    Returns:
+        dict: Response fields, see get_video_summary
+    """
+    result = {
+        "success": True,
+        "transcript": response_data.get("transcript", ""),
+        "summary": response_data.get("summary", ""),
+        "style": response_data.get("style", style),
+        "cached": response_data.get("cached", False),
+        "engine": response_data.get("engine", DEFAULT_ENGINE),
+        "model": response_data.get("model", ""),
+    }
+
+    if response_data.get("degraded"):
+        result["degraded"] = True
+        result["degraded_reason"] = response_data.get("degraded_reason", "")
+
+    return result
+
+
+@csrf_exempt
+def get_video_summary(request):
+    """
+    API endpoint that takes a YouTube video URL or ID and returns its transcript and summary
+
+    Request (POST JSON):
+        {
+            "video_id": "VIDEO_ID"  OR  "video_url": "VIDEO_URL",
+            "style": "detailed|short|academic|descriptive|technical" (optional, default: "detailed"),
+            "save_to_file": true/false (optional, default: false),
+            "refresh": true/false (optional, default: false, bypass the summary cache),
+            "stream": true/false (optional, default: false, stream the output as it is generated),
+            "deadline_seconds": 120 (optional, total time budget for retries and fallbacks,
+                                     capped at settings.SUMMARY_DEADLINE_SECONDS),
+            "duration_seconds": 7200 (optional, video length; videos of at least
+                                      settings.LONG_VIDEO_THRESHOLD_SECONDS are
+                                      summarized in parallel time windows),
+            "long_video": true/false (optional, force or disable long-video mode;
+                                      true looks the duration up if it is not given),
+            "styles": ["short", "detailed"] (optional, summarize in several styles
+                                             from one pass over the video; replaces
+                                             "style" and is never streamed),
+            "engine": "gemini|extractive" (optional, default: "gemini"; extractive
+                                           picks key sentences of the stored
+                                           transcript or caption file locally,
+                                           without Gemini, and cannot be
+                                           combined with stream or styles),
+            "model_tier": "auto|fast|capable" (optional, default: "auto", the
+                                               router picks the Gemini model
+                                               from style, duration and time
+                                               budget; see settings.GEMINI_MODEL_TIERS)
+        }
+
+    Response:
+        {
+            "success": true/false,
+            "transcript": "video transcript",
+            "summary": "video summary",
+            "cached": true/false,
+            "engine": "engine that wrote the summary",
+            "model": "model that wrote the summary",
+            "degraded": true (if Gemini could not answer and the summary was
+                              extracted from the stored transcript instead),
+            "degraded_reason": "why Gemini could not answer" (if degraded),
+            "file_path": "/path/to/saved/file.txt" (if save_to_file is true),
+            "error": "Error message if any",
+            "stage": "stage that used up the time budget" (HTTP 504 only)
+        }
+
+    Response (stream, text/event-stream):
+        event: chunk
+        data: {"section": "transcript|summary", "text": "..."}
+        ... one event per piece of generated text ...
+
+        event: complete
+        data: {same fields as the non-streaming response}
+
+        An "error" event is sent instead of "complete" if generation fails.
+
+    Response (styles):
+        {
+            "success": true/false (false if any style failed),
+            "transcript": "video transcript",
+            "summaries": {"short": "...", "detailed": "..."},
+            "cached": {"short": true, "detailed": false},
+            "file_paths": {"short": "/path/to/file.txt", ...} (if save_to_file is true),
+            "errors": {"style": "Error message", ...} (if any style failed)
+        }
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Only POST method is allowed"}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        video_input = data.get("video_url") or data.get("video_id")
+        style = data.get("style", "detailed")
+        save_to_file = data.get("save_to_file", False)
+        refresh = data.get("refresh", False)
+        duration = data.get("duration_seconds")
+        long_video = data.get("long_video")
+        engine = data.get("engine", DEFAULT_ENGINE)
+        model_tier = data.get("model_tier", AUTO_TIER)
+
+        if not video_input:
+            return JsonResponse(
+                {"error": "Missing video_url or video_id parameter"}, status=400
+            )
+
+        try:
+            get_engine(engine)
+            validate_model_tier(model_tier)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        if engine != DEFAULT_ENGINE and (data.get("styles") or data.get("stream", False)):
+            return JsonResponse(
+                {"error": f"The {engine} engine cannot be combined with stream or styles"},
+                status=400,
+            )
+
+        if duration is not None:
+            duration = int(duration)
+
+        deadline_seconds = min(
+            float(data.get("deadline_seconds", settings.SUMMARY_DEADLINE_SECONDS)),
+            settings.SUMMARY_DEADLINE_SECONDS,
+        )
+
+        if data.get("styles"):
+            return summarize_video_styles_response(
+                video_input,
+                data["styles"],
+                save_to_file,
+                use_cache=not refresh,
+                deadline=Deadline(deadline_seconds),
+                duration=duration,
+                long_video=long_video,
+            )
+
+        if data.get("stream", False):
+            response = StreamingHttpResponse(
+                stream_video_summary_events(
+                    video_input,
+                    style,
+                    save_to_file,
+                    use_cache=not refresh,
+                    duration=duration,
+                    long_video=long_video,
+                    deadline=Deadline(deadline_seconds),
+                ),
+                content_type="text/event-stream",
+            )
+            response["Cache-Control"] = "no-cache"
+            # Stop nginx from buffering the stream
+            response["X-Accel-Buffering"] = "no"
+            return response
+
+        # Get the summary with the selected style
+        response_data = summarize_video(
+            video_input,
+            style,
+            use_cache=not refresh,
+            deadline=Deadline(deadline_seconds),
+            duration=duration,
+            long_video=long_video,
+            engine=engine,
+            model_tier=model_tier,
+        )
+
+        if isinstance(response_data, dict) and response_data.get("deadline_exceeded"):
+            return JsonResponse(response_data, status=504)
+
+        if isinstance(response_data, dict) and "error" in response_data:
+            return JsonResponse(response_data, status=400)
+
+        result = video_summary_result(response_data, style)
+
+        # Save to file if requested
+        if save_to_file:
+            result["file_path"] = save_video_summary(response_data, video_input, style)
+
+        return JsonResponse(result)
+
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
+    except Exception as e:
+        import traceback
+
+        traceback.print_exc()
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@csrf_exempt
+def get_video_summaries_batch(request):
+    """
+    API endpoint that summarizes many videos in one request. Cached summaries
+    are answered at once; the others are generated concurrently.
+
+    Request (POST JSON):
+        {
+            "videos": ["VIDEO_ID", "VIDEO_URL", ...],
+            "style": "detailed|short|academic|descriptive|technical" (optional, default: "detailed"),
+            "styles": ["short", "detailed"] (optional, replaces "style"),
+            "refresh": true/false (optional, default: false, bypass the summary cache),
+            "stream": true/false (optional, default: false, send each video's
+                                  result as soon as it is ready),
+            "include_transcript": true/false (optional, default: false),
+            "max_workers": 4 (optional, capped at settings.PLAYLIST_MAX_WORKERS),
+            "deadline_seconds": 120 (optional, time budget of each video,
+                                     capped at settings.SUMMARY_DEADLINE_SECONDS)
+        }
+
+    Response:
+        {
+            "success": true/false (false if any video failed),
+            "results": {
+                "VIDEO_ID": {
+                    "video_id": "VIDEO_ID",
+                    "success": true/false,
+                    "summaries": {"detailed": "..."},
+                    "cached": {"detailed": true},
+                    "errors": {"style": "Error message", ...} (if any style failed),
+                    "transcript": "..." (if include_transcript is true)
+                },
+                ...
+            },
+            "succeeded": 9,
+            "failed": 1,
+            "error": "Error message if any"
+        }
+
+    Response (stream, text/event-stream):
+        event: video
+        data: {one entry of "results"}
+        ... one event per video, cached videos first ...
+
+        event: complete
+        data: {"succeeded": 9, "failed": 1}
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Only POST method is allowed"}, status=405)
+
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
+
+    video_inputs = data.get("videos")
+    styles = data.get("styles") or [data.get("style", "detailed")]
+    refresh = data.get("refresh", False)
+    include_transcript = data.get("include_transcript", False)
+
+    if not isinstance(video_inputs, list) or not video_inputs:
+        return JsonResponse({"error": "Missing videos parameter"}, status=400)
+
+    if len(video_inputs) > settings.BATCH_MAX_VIDEOS:
+        return JsonResponse(
+            {"error": f"At most {settings.BATCH_MAX_VIDEOS} videos per batch"},
+            status=400,
+        )
+
+    try:
+        max_workers = data.get("max_workers") or settings.PLAYLIST_MAX_WORKERS
+        max_workers = max(1, min(int(max_workers), settings.PLAYLIST_MAX_WORKERS))
+        deadline_seconds = min(
+            float(data.get("deadline_seconds", settings.SUMMARY_DEADLINE_SECONDS)),
+            settings.SUMMARY_DEADLINE_SECONDS,
+        )
+    except (TypeError, ValueError):
+        return JsonResponse(
+            {"error": "max_workers and deadline_seconds must be numbers"}, status=400
+        )
+
+    video_ids = []
+    invalid = []
+    for video_input in video_inputs:
+        video_id = extract_video_id_from_url(ensure_youtube_url(str(video_input)))
+        if video_id:
+            video_ids.append(video_id)
+        else:
+            invalid.append(str(video_input))
+
+    if invalid:
+        return JsonResponse(
+            {"error": f"Not a YouTube video: {', '.join(invalid)}"}, status=400
+        )
+
+    results = iter_batch_summaries(
+        list(dict.fromkeys(video_ids)),
+        list(dict.fromkeys(styles)),
+        use_cache=not refresh,
+        max_workers=max_workers,
+        deadline_seconds=deadline_seconds,
+        include_transcript=include_transcript,
+    )
+
+    if data.get("stream", False):
+
+        def event_stream():
+            succeeded = 0
+            failed = 0
+
+            for result in results:
+                if result["success"]:
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield format_sse_event("video", result)
+
+            yield format_sse_event("complete", {"succeeded": succeeded, "failed": failed})
+
+        response = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        # Stop nginx from buffering the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    results = {result["video_id"]: result for result in results}
+    failed = sum(not result["success"] for result in results.values())
+
+    return JsonResponse(
+        {
+            "success": not failed,
+            "results": results,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+        }
+    )
+
+
+@csrf_exempt
+def test_api_connection(request):
+    """
+    Test endpoint to verify API key and connection
+    """
+    try:
+        # Try to get the shared model
+        try:
+            model = get_model()
+        except Exception as e:
+            return JsonResponse(
+                {
+                    "status": "error",
+                    "message": f"Error initializing Gemini model: {str(e)}",
+                },
+                status=400,
+            )
+
+        if model is None:
+            return JsonResponse(
+                {
+                    "status": "error",
+                    "message": "API key not found in environment variables",
+                },
+                status=400,
+            )
+
+        # Simple test prompt
+        test_prompt = "Hello! This is a test to verify the API connection."
+
+        try:
+            response = generate_content(model, test_prompt)
+            response_text = (
+                response.text if hasattr(response, "text") else str(response)
+            )
+
+            return JsonResponse(
+                {
+                    "status": "success",
+                    "message": "Gemini API connection successful",
+                    "response_preview": (
+                        response_text[:100] + "..."
+                        if len(response_text) > 100
+                        else response_text
+                    ),
+                    "model": model.model_name,
+                    "models": get_model_status(),
+                }
+            )
+        except Exception as e:
+            return JsonResponse(
+                {
+                    "status": "error",
+                    "message": f"Error generating content: {str(e)}",
+                },
+                status=400,
+            )
+
+    except Exception as e:
+        import traceback
+
+        traceback.print_exc()
+        return JsonResponse(
+            {"status": "error", "message": f"Error testing API connection: {str(e)}"},
+            status=500,
+        )
+
+
+def read_summary_file(file_path):
+    """
+    Read back an individual summary file written by summarize_playlist_video
+
+    Args:
+        file_path (Path): Path of the summary file
+
+    Returns:
+        dict: Summary data with transcript and summary
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    # Skip the Title/URL/Style header
+    style_end = content.find("\n\n", content.find("Style: "))
+    body = content[style_end + 2 :] if style_end != -1 else content
+
+    transcript = ""
+    if body.startswith("Transcript:\n\n"):
+        body = body[len("Transcript:\n\n") :]
+        summary_start = body.find("\n\nSummary:\n\n")
+        if summary_start == -1:
+            return {"transcript": body.rstrip("\n"), "summary": ""}
+
+        transcript = body[:summary_start]
+        body = body[summary_start + 2 :]
+
+    summary = body[len("Summary:\n\n") :] if body.startswith("Summary:\n\n") else body
+
+    return {"transcript": transcript, "summary": summary}
+
+
+def summarize_playlist_video(
+    index,
+    total,
+    video,
+    style,
+    save_to_file,
+    playlist_dir,
+    manifest=None,
+    extra_styles=None,
+):
+    """
+    Summarize a single video of a playlist and save its summary file
+
+    Args:
+        index (int): 1-based position of the video in the playlist
+        total (int): Number of videos in the playlist, None if not known yet
+        video (dict): Video dictionary with id, url and title
+        style (str): Summary style
+        save_to_file (bool): Whether to save the individual summary
+        playlist_dir (Path): Directory for this playlist's summaries
+        manifest (RunManifest): Checkpoint of earlier runs; videos it lists as
+            completed are read back from their summary file
+        extra_styles (list): Other styles to generate in the same model call
+            and cache for later runs
+
+    Returns:
+        tuple: (summary_result, summary_data)
+    """
+    resumed = resume_playlist_video(index, total, video, manifest)
+    if resumed is not None:
+        return resumed
+
+    video_url = video.get("url")
+
+    print(f"Processing video {index}/{total or '?'}: {video.get('title')}")
+    print(f"URL: {video_url}")
+
+    # Get the summary with better error handling
+    try:
+        # Use full URL instead of ID
+        if extra_styles:
+            summary_data = summarize_video_styles(
+                video_url, [style] + extra_styles, duration=video.get("duration")
+            )[style]
+        else:
+            summary_data = summarize_video(
+                video_url, style, duration=video.get("duration")
+            )
+    except Exception as e:
+        import traceback
+
+        traceback.print_exc()
+        summary_data = {"error": f"Exception in summarization: {str(e)}"}
+
+    return playlist_video_result(video, style, summary_data, save_to_file, playlist_dir)
+
+
+def resume_playlist_video(index, total, video, manifest):
+    """
+    Read back the summary of a playlist video completed by an earlier run
+
+    Args:
+        index (int): 1-based position of the video in the playlist
+        total (int): Number of videos in the playlist, None if not known yet
+        video (dict): Video dictionary with id, url and title
+        manifest (RunManifest): Checkpoint of earlier runs, or None
+
+    Returns:
+        tuple: (summary_result, summary_data), or None if the video has to be
+            summarized
+    """
+    video_id = video.get("id")
+    completed_file = manifest.completed_file(video_id) if manifest else None
+    if not completed_file:
+        return None
+
+    try:
+        summary_data = read_summary_file(completed_file)
+    except OSError as e:
+        print(f"Could not read {completed_file}: {str(e)}, summarizing again")
+        return None
+
+    print(f"Skipping video {index}/{total or '?'} (already summarized): {video.get('title')}")
+    summary_result = {
+        "video_id": video_id,
+        "video_url": video.get("url"),
+        "title": video.get("title"),
+        "success": True,
+        "resumed": True,
+        "file_path": str(completed_file),
+    }
+    return summary_result, summary_data
+
+
+def playlist_video_result(video, style, summary_data, save_to_file, playlist_dir):
+    """
+    Build the per-video result of a playlist run and save the summary file
+
+    Args:
+        video (dict): Video dictionary with id, url and title
+        style (str): Summary style
+        summary_data (dict): Summary data or error message
+        save_to_file (bool): Whether to save the individual summary
+        playlist_dir (Path): Directory for this playlist's summaries
+
+    Returns:
+        tuple: (summary_result, summary_data)
+    """
+    video_id = video.get("id")
+    video_url = video.get("url")
+    video_title = video.get("title")
+
+    summary_result = {
+        "video_id": video_id,
+        "video_url": video_url,
+        "title": video_title,
+        "success": not (isinstance(summary_data, dict) and "error" in summary_data),
+    }
+
+    if not summary_result["success"]:
+        # If there was an error, add it to the result
+        summary_result["error"] = summary_data.get("error", "Unknown error")
+        return summary_result, summary_data
+
+    if summary_data.get("degraded"):
+        summary_result["degraded"] = True
+
+    # If save_to_file is true, save the individual summary
+    if save_to_file:
+        # Individual file path
+        file_path = playlist_dir / f"summary_{video_id}_{style}.txt"
+
+        # Format the transcript and summary for the file
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(f"Title: {video_title}\n")
+            f.write(f"URL: {video_url}\n\n")
+            f.write(f"Style: {style}\n\n")
+
+            if isinstance(summary_data, dict):
+                # Write transcript if available
+                if "transcript" in summary_data and summary_data["transcript"]:
+                    f.write("Transcript:\n\n")
+                    f.write(summary_data["transcript"])
+                    f.write("\n\n")
+
+                # Write summary if available
+                if "summary" in summary_data and summary_data["summary"]:
+                    f.write("Summary:\n\n")
+                    f.write(summary_data["summary"])
+            else:
+                f.write(str(summary_data))
+
+        summary_result["file_path"] = str(file_path)
+
+    return summary_result, summary_data
+
+
+def write_combined_header(combined_file, playlist_url, style, video_count):
+    """
+    Write the header of a playlist's combined summary file
+
+    Args:
+        combined_file (file): Open combined summary file
+        playlist_url (str): YouTube playlist URL
+        style (str): Summary style
+        video_count (int): Number of videos in the playlist
+    """
+    combined_file.write(f"Summaries for playlist: {playlist_url}\n")
+    combined_file.write(f"Summary style: {style}\n")
+    combined_file.write(f"Total videos: {video_count}\n\n")
+    combined_file.write("=" * 80 + "\n\n")
+
+
+@STAGE_SECONDS.time(stage="artifact_write")
+def write_combined_entry(combined_file, index, summary_result, summary_data):
+    """
+    Append one video's summary or error to a playlist's combined summary file
+
+    Args:
+        combined_file (file): Open combined summary file
+        index (int): 1-based position of the video in the playlist
+        summary_result (dict): Per-video result from summarize_playlist_video
+        summary_data (dict): Summary data or error message
+    """
+    combined_file.write(f"Video {index}: {summary_result['title']}\n")
+    combined_file.write(f"ID: {summary_result['video_id']}\n")
+    combined_file.write(f"URL: {summary_result['video_url']}\n\n")
+
+    if summary_result["success"]:
+        if isinstance(summary_data, dict) and "summary" in summary_data:
+            combined_file.write("Summary:\n")
+            combined_file.write(summary_data["summary"])
+        else:
+            combined_file.write("No summary available")
+
+        combined_file.write("\n\n" + "=" * 80 + "\n\n")
+    else:
+        # Add error info to the combined file
+        combined_file.write(f"Error: {summary_result['error']}\n\n")
+        combined_file.write("=" * 80 + "\n\n")
+
+
+class OrderedCombinedWriter:
+    """
+    Writes combined file entries in playlist order even though videos finish
+    out of order. Only entries that are ahead of the next expected index are
+    held in memory.
+    """
+
+    def __init__(self, combined_file):
+        self.combined_file = combined_file
+        self.next_index = 1
+        self.pending = {}
+
+    def add(self, index, summary_result, summary_data):
+        self.pending[index] = (summary_result, summary_data)
+
+        while self.next_index in self.pending:
+            entry = self.pending.pop(self.next_index)
+            write_combined_entry(self.combined_file, self.next_index, *entry)
+            self.next_index += 1
+
+
+def iter_playlist_summaries(
+    videos,
+    style,
+    save_to_file,
+    playlist_dir,
+    max_workers,
+    total=None,
+    manifest=None,
+    extra_styles=None,
+):
+    """
+    Summarize playlist videos in parallel, yielding each result as soon as it is ready
+
+    Videos are handed to the workers as soon as they are read from `videos`, so
+    a generator that is still listing the playlist keeps the workers busy.
+
+    Args:
+        videos (iterable): Video dictionaries, e.g. a list or a generator
+        style (str): Summary style
+        save_to_file (bool): Whether to save individual summaries
+        playlist_dir (Path): Directory for this playlist's summaries
+        max_workers (int): Number of videos summarized in parallel
+        total (int): Number of videos if already known, for progress messages
+        manifest (RunManifest): Checkpoint of earlier runs to resume from
+        extra_styles (list): Other styles to generate along with `style`
+
+    Yields:
+        tuple: (index, summary_result, summary_data) in completion order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+
+        try:
+            for index, video in enumerate(videos, 1):
+                future = executor.submit(
+                    summarize_playlist_video,
+                    index,
+                    total,
+                    video,
+                    style,
+                    save_to_file,
+                    playlist_dir,
+                    manifest,
+                    extra_styles,
+                )
+                futures[future] = index
+
+                # Hand back whatever finished while the playlist is still being listed
+                for future in [future for future in futures if future.done()]:
+                    summary_result, summary_data = future.result()
+                    yield futures.pop(future), summary_result, summary_data
+
+            for future in as_completed(list(futures)):
+                summary_result, summary_data = future.result()
+                yield futures.pop(future), summary_result, summary_data
+        finally:
+            # If the consumer stops early (e.g. a streaming client disconnected),
+            # don't start the videos that are still queued
+            for future in futures:
+                future.cancel()
+
+
+def get_playlist_dir(playlist_id):
+    """
+    Get (creating it if needed) the directory of a playlist's summary files
+
+    Args:
+        playlist_id (str): YouTube playlist ID
+
+    Returns:
+        Path: summary_files/playlist_{playlist_id}
+    """
+    # Create output directory for summaries
+    output_dir = Path(settings.BASE_DIR) / "summary_files"
+    output_dir.mkdir(exist_ok=True)
+
+    # Create a specific directory for this playlist's summaries
+    playlist_dir = output_dir / f"playlist_{playlist_id}"
+    playlist_dir.mkdir(exist_ok=True)
+    return playlist_dir
+
+
+def unsummarized_playlist_videos(videos, playlist_id, style):
+    """
+    Get the videos of a playlist that have not been summarized in a style yet:
+    no stored summary and no completed entry in the playlist's run manifest.
+    A video only stops being new once a run has summarized it, so videos of a
+    run that failed or was interrupted are picked up again by the next one.
+
+    Args:
+        videos (list): List of video dictionaries, in playlist order
+        playlist_id (str): YouTube playlist ID
+        style (str): Summary style
+
+    Returns:
+        list: The videos still to summarize, in playlist order
+    """
+    manifest = RunManifest(get_playlist_dir(playlist_id), style)
+    summarized = summarized_video_ids([video["id"] for video in videos], style)
+
+    return [
+        video
+        for video in videos
+        if video["id"] not in summarized and manifest.completed_file(video["id"]) is None
+    ]
+
+
+def iter_process_playlist(
+    playlist_url,
+    style="detailed",
+    save_to_file=True,
+    max_workers=None,
+    only_new=False,
+    resume=True,
+    extra_styles=None,
+):
+    """
+    Summarize every video of a playlist and write the combined summary file,
+    reporting progress as a sequence of events
+
+    Unless the playlist's video list is cached, videos start being summarized
+    while yt-dlp is still listing the rest of the playlist.
+
+    Args:
+        playlist_url (str): YouTube playlist URL
+        style (str): Summary style
+        save_to_file (bool): Whether to save individual summaries
+        max_workers (int): Number of videos summarized in parallel, capped at
+            settings.PLAYLIST_MAX_WORKERS
+        only_new (bool): Fetch the playlist again and only summarize the videos
+            that have no summary in this style yet, into new_summaries_{style}.txt
+        resume (bool): Reuse the summary files of videos completed by an earlier
+            run (recorded in the playlist's manifest_{style}.json) instead of
+            summarizing them again
+        extra_styles (list): Other styles to generate in the same model calls
+            and cache, so runs of the playlist in those styles are cache hits
+
+    Yields:
+        tuple: (event, data) pairs:
+            ("start", {"playlist_info": {...}}) once the first video is known;
+                "video_count" is None while the playlist is still being listed,
+            ("listed", {"video_count": 10}) once the whole playlist has been listed,
+            ("video", {"index": 1, "summary_result": {...}, "summary_data": {...}})
+                for each video in completion order,
+            ("complete", {"playlist_info": {...}, "combined_file": "...",
+                          "succeeded": 9, "failed": 1, "resumed": 5}) at the end,
+            or a single ("error", {"error": "..."}) if the playlist cannot be read
+    """
+    # First, get the videos from the playlist using the functionality from get_links_from_playlist
+    from get_links_from_playlist.views import (
+        PlaylistExtractionError,
+        get_playlist_id,
+        iter_playlist_videos,
+        refresh_playlist_videos,
+    )
+
+    if only_new:
+        changes = refresh_playlist_videos(playlist_url)
+
+        if "error" in changes:
+            yield "error", changes
+            return
+
+        new_videos = unsummarized_playlist_videos(
+            changes["videos"], get_playlist_id(playlist_url), style
+        )
+        videos = iter(new_videos)
+        video_count = len(new_videos)
+    else:
+        videos = iter_playlist_videos(playlist_url)
+        video_count = None
+
+    # Read the first video so an unreadable playlist is reported before starting
+    try:
+        first_videos = [next(videos)]
+    except StopIteration:
+        first_videos = []
+    except PlaylistExtractionError as e:
+        yield "error", {"error": str(e)}
+        return
+    except Exception as e:
+        yield "error", {"error": f"Error extracting playlist: {str(e)}"}
+        return
+
+    if not first_videos:
+        video_count = 0
+
+    # Extract playlist ID for identification purposes
+    playlist_id = get_playlist_id(playlist_url)
+
+    playlist_info = {
+        "url": playlist_url,
+        "id": playlist_id,
+        "video_count": video_count,
+        "style": style,
+    }
+
+    if only_new:
+        playlist_info["only_new"] = True
+        playlist_info["removed"] = [video["id"] for video in changes["removed"]]
+
+    yield "start", {"playlist_info": dict(playlist_info)}
+
+    listing = {"count": 0, "finished": False, "error": None}
+
+    def listed_videos():
+        try:
+            for video in itertools.chain(first_videos, videos):
+                listing["count"] += 1
+                manifest.mark(video["id"], RunManifest.PENDING, save=False)
+                yield video
+        except Exception as e:
+            # Keep the videos listed so far; the error is reported at the end
+            listing["error"] = str(e)
+        listing["finished"] = True
+
+    playlist_dir = get_playlist_dir(playlist_id)
+
+    # Checkpoint of which videos are done, so an interrupted run can be resumed.
+    # Without resume the old checkpoint is ignored and overwritten.
+    manifest = RunManifest(playlist_dir, style, load=resume)
+
+    # Also create a combined file for all summaries
+    if only_new:
+        combined_file_path = playlist_dir / f"new_summaries_{style}.txt"
+    else:
+        combined_file_path = playlist_dir / f"all_summaries_{style}.txt"
+
+    # Never run more workers than configured, however many the client asks for
+    if max_workers is None:
+        max_workers = settings.PLAYLIST_MAX_WORKERS
+    max_workers = max(1, min(int(max_workers), settings.PLAYLIST_MAX_WORKERS))
+
+    succeeded = 0
+    failed = 0
+    resumed = 0
+    reported_listed = False
+
+    # The video count goes in the header, but may only be known at the end, so
+    # the entries are written to a temporary file first
+    body_file_path = combined_file_path.with_suffix(".part")
+
+    # Removed in a finally block, so a streaming client that disconnects
+    # (GeneratorExit) doesn't leave it behind
+    try:
+        with open(body_file_path, "w+", encoding="utf-8") as body_file:
+            writer = OrderedCombinedWriter(body_file)
+
+            for index, summary_result, summary_data in iter_playlist_summaries(
+                listed_videos(),
+                style,
+                save_to_file,
+                playlist_dir,
+                max_workers,
+                video_count,
+                manifest,
+                extra_styles,
+            ):
+                if listing["finished"] and not reported_listed:
+                    reported_listed = True
+                    yield "listed", {"video_count": listing["count"]}
+
+                writer.add(index, summary_result, summary_data)
+
+                if summary_result["success"]:
+                    succeeded += 1
+                    if summary_result.get("resumed"):
+                        resumed += 1
+                    elif summary_result.get("degraded"):
+                        # Left pending, so a later run replaces it with a Gemini summary
+                        pass
+                    else:
+                        manifest.mark(
+                            summary_result["video_id"],
+                            RunManifest.COMPLETED,
+                            file_path=summary_result.get("file_path"),
+                            error=None,
+                        )
+                else:
+                    failed += 1
+                    manifest.mark(
+                        summary_result["video_id"],
+                        RunManifest.FAILED,
+                        error=summary_result["error"],
+                    )
+
+                yield "video", {
+                    "index": index,
+                    "summary_result": summary_result,
+                    "summary_data": summary_data,
+                }
+
+            if not reported_listed:
+                yield "listed", {"video_count": listing["count"]}
+
+            playlist_info["video_count"] = listing["count"]
+
+            # Open the combined file
+            with open(combined_file_path, "w", encoding="utf-8") as combined_file:
+                write_combined_header(
+                    combined_file, playlist_url, style, listing["count"]
+                )
+
+                body_file.seek(0)
+                shutil.copyfileobj(body_file, combined_file)
+    finally:
+        body_file_path.unlink(missing_ok=True)
+
+    complete = {
+        "playlist_info": playlist_info,
+        "combined_file": str(combined_file_path),
+        "succeeded": succeeded,
+        "failed": failed,
+        "resumed": resumed,
+    }
+
+    if listing["error"]:
+        complete["listing_error"] = listing["error"]
+
+    yield "complete", complete
+
+
+def process_playlist(
+    playlist_url,
+    style="detailed",
+    save_to_file=True,
+    max_workers=None,
+    only_new=False,
+    on_start=None,
+    on_result=None,
+    resume=True,
+    extra_styles=None,
+):
+    """
+    Summarize every video of a playlist and write the combined summary file
+
+    Args:
+        playlist_url (str): YouTube playlist URL
+        style (str): Summary style
+        save_to_file (bool): Whether to save individual summaries
+        max_workers (int): Number of videos summarized in parallel, capped at
+            settings.PLAYLIST_MAX_WORKERS
+        only_new (bool): Only summarize videos with no summary in this style yet
+        on_start (callable): Called with the number of videos once the run
+            starts (None while the playlist is still being listed) and again
+            once the whole playlist has been listed
+        on_result (callable): Called with (index, summary_result) as each video finishes
+        resume (bool): Reuse videos completed by an earlier run of this playlist
+        extra_styles (list): Other styles to generate and cache along with `style`
+
+    Returns:
+        dict: Playlist info and per-video results in playlist order, or error message
+    """
+    summaries = {}
+
+    for event, data in iter_process_playlist(
+        playlist_url, style, save_to_file, max_workers, only_new, resume, extra_styles
+    ):
+        if event == "error":
+            return data
+
+        if event == "start":
+            if on_start:
+                on_start(data["playlist_info"]["video_count"])
+
+        elif event == "listed":
+            if on_start:
+                on_start(data["video_count"])
+
+        elif event == "video":
+            summaries[data["index"]] = data["summary_result"]
+            if on_result:
+                on_result(data["index"], data["summary_result"])
+
+        elif event == "complete":
+            result = {
+                "success": True,
+                "playlist_info": data["playlist_info"],
+                "summaries": [summaries[index] for index in sorted(summaries)],
+                "combined_file": data["combined_file"],
+            }
+            if "listing_error" in data:
+                result["listing_error"] = data["listing_error"]
+            return result
+
+
+def format_sse_event(event, data):
+    """
+    Format a server-sent event
+
+    Args:
+        event (str): Event name
+        data (dict): JSON-serializable event payload
+
+    Returns:
+        str: Event in text/event-stream format
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@csrf_exempt
+def summarize_playlist(request):
+    """
+    API endpoint that takes a YouTube playlist URL and summarizes all videos in the playlist
+
+    Request (POST JSON):
+        {
+            "playlist_url": "https://www.youtube.com/playlist?list=PLAYLIST_ID",
+            "style": "detailed|short|academic|descriptive|technical" (optional, default: "detailed"),
+            "save_to_file": true/false (optional, default: true),
+            "max_workers": 4 (optional, number of videos summarized in parallel,
+                              capped at settings.PLAYLIST_MAX_WORKERS),
+            "background": true/false (optional, default: false, queue the run as a
+                                      background job and return its ID at once),
+            "only_new": true/false (optional, default: false, fetch the playlist again
+                                    and only summarize the videos with no summary
+                                    in this style yet),
+            "resume": true/false (optional, default: true, skip videos completed by
+                                  an earlier run and retry only the failed ones),
+            "styles": ["short", "detailed"] (optional, summarize every video in several
+                                             styles from one pass over it; replaces
+                                             "style", not available with background
+                                             or only_new)
+        }
+
+    Response:
+        {
+            "success": true/false,
+            "playlist_info": {
+                "url": "playlist_url",
+                "id": "playlist_id",
+                "video_count": 10
+            },
+            "summaries": [
+                {
+                    "video_id": "VIDEO_ID1",
+                    "title": "Video title",
+                    "success": true/false,
+                    "file_path": "/path/to/summary_VIDEO_ID1.txt" (if save_to_file is true)
+                },
+                ...
+            ],
+            "error": "Error message if any"
+        }
+
+    Response (background, HTTP 202):
+        {
+            "success": true,
+            "job_id": "JOB_ID",
+            "status_url": "/api/summarize/playlist/jobs/JOB_ID/"
+        }
+
+    Response (styles):
+        {
+            "success": true,
+            "results": {"short": {same fields as above}, "detailed": {...}}
+        }
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Only POST method is allowed"}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        playlist_url = data.get("playlist_url")
+        style = data.get("style", "detailed")
+        save_to_file = data.get("save_to_file", True)
+        max_workers = data.get("max_workers")
+        only_new = data.get("only_new", False)
+        resume = data.get("resume", True)
+        styles = list(dict.fromkeys(data.get("styles") or []))
+
+        if not playlist_url:
+            return JsonResponse({"error": "Missing playlist_url parameter"}, status=400)
+
+        if styles:
+            if data.get("background", False) or only_new:
+                return JsonResponse(
+                    {"error": "styles cannot be combined with background or only_new"},
+                    status=400,
+                )
+
+            # The first run generates every style for each video; the runs for
+            # the other styles then only read the summary cache
+            results = {}
+            for index, playlist_style in enumerate(styles):
+                results[playlist_style] = process_playlist(
+                    playlist_url,
+                    playlist_style,
+                    save_to_file,
+                    max_workers,
+                    resume=resume,
+                    extra_styles=styles[1:] if index == 0 else None,
+                )
+
+                if "error" in results[playlist_style]:
+                    return JsonResponse(results[playlist_style], status=400)
+
+            return JsonResponse({"success": True, "results": results})
+
+        if data.get("background", False):
+            job_id = enqueue_playlist_job(
+                playlist_url, style, save_to_file, max_workers, only_new, resume
+            )
+            return JsonResponse(
+                {
+                    "success": True,
+                    "job_id": job_id,
+                    "status_url": f"{request.path}jobs/{job_id}/",
+                },
+                status=202,
+            )
+
+        result = process_playlist(
+            playlist_url, style, save_to_file, max_workers, only_new, resume=resume
+        )
+
+        if "error" in result:
+            return JsonResponse(result, status=400)
+
+        # Return the results
+        return JsonResponse(result)
+
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
+    except Exception as e:
+        # Print exception details for debugging
+        import traceback
+
+        traceback.print_exc()
+        return JsonResponse(
+            {"error": f"Error processing playlist: {str(e)}"}, status=500
+        )
+
+
+def playlist_job_status(request, job_id):
+    """
+    API endpoint that reports the progress of a background playlist job.
+    Jobs run in the process that accepted them (see summarize/jobs.py); one
+    whose process stopped is reported as failed.
+
+    Response:
+        {
+            "success": true/false,
+            "job_id": "JOB_ID",
+            "status": "queued|running|completed|failed",
+            "progress": {"total": 10, "done": 6, "failed": 1, "pending": 3},
+            "eta_seconds": 42.0,
+            "summaries": [...results of finished videos, in playlist order...],
+            "error": "Error message if any"
+        }
+    """
+    job = get_playlist_job(job_id)
+
+    if job is None:
+        return JsonResponse({"error": f"Unknown job: {job_id}"}, status=404)
+
+    return JsonResponse({"success": True, **job})
+
+
+def playlist_summary_status(request):
+    """
+    API endpoint that lists which videos of a playlist already have a summary
+    in a style, from the last fetched playlist membership
+
+    Query parameters:
+        playlist_url: YouTube playlist URL
+        style: Summary style (default "detailed")
+
+    Response:
+        {
+            "success": true/false,
+            "playlist_url": "PLAYLIST_URL",
+            "style": "detailed",
+            "fetched_at": 1700000000.0,
+            "videos": [{"title", "id", "url", "position", "has_summary"}, ...],
+            "summarized": 4,
+            "error": "Error message if any"
+        }
+    """
+    playlist_url = request.GET.get("playlist_url", "")
+    style = request.GET.get("style", "detailed")
+
+    if not playlist_url:
+        return JsonResponse({"error": "Playlist URL is required"}, status=400)
+
+    playlist = Playlist.objects.filter(playlist_id=get_playlist_id(playlist_url)).first()
+    if playlist is None:
+        return JsonResponse(
+            {"error": "This playlist has not been fetched yet"}, status=404
+        )
+
+    summaries = Summary.objects.filter(
+        video=OuterRef("video"),
+        style=style,
+        model_name__in=tier_models(),
+        prompt_version=PROMPT_VERSION,
+    )
+    memberships = (
+        playlist.memberships.filter(removed_at__isnull=True)
+        .select_related("video")
+        .annotate(has_summary=Exists(summaries))
+        .order_by("position")
+    )
+
+    videos = [
+        {
+            **membership.video.as_dict(),
+            "position": membership.position,
+            "has_summary": membership.has_summary,
+        }
+        for membership in memberships
+    ]
+
+    return JsonResponse(
+        {
+            "success": True,
+            "playlist_url": playlist.url,
+            "style": style,
+            "fetched_at": (
+                playlist.fetched_at.timestamp() if playlist.fetched_at else None
+            ),
+            "videos": videos,
+            "summarized": sum(video["has_summary"] for video in videos),
+        }
+    )
+
+
+def export_playlist(request):
+    """
+    API endpoint that streams the transcripts and summaries of a playlist's
+    summarized videos, in playlist order
+
+    Query parameters:
+        playlist_url: YouTube playlist URL
+        style: Summary style (default "detailed")
+        format: "ndjson" (default) or "zip"
+        cursor: Resume after this playlist position (the "cursor" of the last
+            record received, or the number that starts the last file name in
+            an interrupted ZIP download)
+
+    Response:
+        NDJSON: one {"cursor", "position", "video_id", "title", "url", "style",
+            "model", "transcript", "summary"} object per line
+        ZIP: one JSON file with that object per video
+    """
+    playlist_url = request.GET.get("playlist_url", "")
+    style = request.GET.get("style", "detailed")
+    export_format = request.GET.get("format", "ndjson")
+
+    if not playlist_url:
+        return JsonResponse({"error": "Playlist URL is required"}, status=400)
+
+    if export_format not in EXPORT_FORMATS:
         return JsonResponse(
-            {"status": "error", "message": f"Error testing API connection: {str(e)}"},
-            status=500,
+            {"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"},
+            status=400,
+        )
+
+    try:
+        cursor = int(request.GET.get("cursor", 0))
+    except ValueError:
+        return JsonResponse({"error": "cursor must be a number"}, status=400)
+
+    playlist_id = get_playlist_id(playlist_url)
+    playlist = Playlist.objects.filter(playlist_id=playlist_id).first()
+    if playlist is None:
+        return JsonResponse(
+            {"error": "This playlist has not been fetched yet"}, status=404
+        )
+
+    records = iter_export_records(playlist, style, cursor=cursor)
+
+    if export_format == "zip":
+        response = StreamingHttpResponse(iter_zip(records), content_type="application/zip")
+        response["Content-Disposition"] = (
+            f'attachment; filename="{playlist_id}_{style}.zip"'
+        )
+    else:
+        response = StreamingHttpResponse(
+            iter_ndjson(records), content_type="application/x-ndjson"
+        )
+
+    # Stop nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def search(request):
+    """
+    API endpoint for full-text search over stored summaries and transcripts
+
+    Query parameters:
+        q: Search text; all words must match, "word*" matches a prefix
+        style: Only search summaries of this style (optional)
+        playlist_url: Only search videos in this playlist (optional)
+        limit: Maximum number of results (default 20, at most 100)
+
+    Response:
+        {
+            "success": true/false,
+            "query": "SEARCH TEXT",
+            "results": [{"video_id", "title", "url", "style", "model", "snippet", "score"}, ...],
+            "took_ms": 1.2,
+            "error": "Error message if any"
+        }
+    """
+    query = request.GET.get("q", "").strip()
+    style = request.GET.get("style") or None
+    playlist_url = request.GET.get("playlist_url", "")
+
+    if not query:
+        return JsonResponse({"error": "Search text (q) is required"}, status=400)
+
+    try:
+        limit = int(request.GET.get("limit", 20))
+    except ValueError:
+        return JsonResponse({"error": "limit must be a number"}, status=400)
+
+    started = time.perf_counter()
+    try:
+        results = search_summaries(
+            query,
+            style=style,
+            playlist_id=get_playlist_id(playlist_url) if playlist_url else None,
+            limit=limit,
         )
+    except SearchUnavailable as e:
+        return JsonResponse({"error": str(e)}, status=501)
+
+    return JsonResponse(
+        {
+            "success": True,
+            "query": query,
+            "results": results,
+            "took_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    )
 
 
 @csrf_exempt
-def summarize_playlist(request):
+def summarize_playlist_stream(request):
     """
-    API endpoint that takes a YouTube playlist URL and summarizes all videos in the playlist
+    Streaming variant of summarize_playlist that sends each video's result as a
+    server-sent event as soon as it is ready
+
+    Request (POST JSON, or GET query parameters for EventSource clients):
+        {
+            "playlist_url": "https://www.youtube.com/playlist?list=PLAYLIST_ID",
+            "style": "detailed|short|academic|descriptive|technical" (optional, default: "detailed"),
+            "save_to_file": true/false (optional, default: true),
+            "max_workers": 4 (optional, capped at settings.PLAYLIST_MAX_WORKERS),
+            "only_new": true/false (optional, default: false),
+            "resume": true/false (optional, default: true)
+        }
+
+    Response (text/event-stream):
+        event: start
+        data: {"playlist_info": {...}}
+
+        event: video
+        data: {"index": 1, "video_id": "...", "title": "...", "success": true,
+               "summary": "...", "file_path": "..."}
+        ... one event per video, in completion order ...
+
+        event: complete
+        data: {"playlist_info": {...}, "combined_file": "...", "succeeded": 9, "failed": 1,
+               "resumed": 5}
+
+        An "error" event is sent instead if the playlist cannot be processed.
+    """
+    if request.method == "GET":
+        data = request.GET.dict()
+        data["save_to_file"] = data.get("save_to_file", "true").lower() != "false"
+        data["only_new"] = data.get("only_new", "false").lower() == "true"
+        data["resume"] = data.get("resume", "true").lower() != "false"
+    elif request.method == "POST":
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
+    else:
+        return JsonResponse({"error": "Only GET and POST methods are allowed"}, status=405)
+
+    playlist_url = data.get("playlist_url")
+    style = data.get("style", "detailed")
+    save_to_file = data.get("save_to_file", True)
+    max_workers = data.get("max_workers")
+    only_new = data.get("only_new", False)
+    resume = data.get("resume", True)
+
+    if not playlist_url:
+        return JsonResponse({"error": "Missing playlist_url parameter"}, status=400)
+
+    def event_stream():
+        try:
+            for event, event_data in iter_process_playlist(
+                playlist_url, style, save_to_file, max_workers, only_new, resume
+            ):
+                if event == "start":
+                    event_data = {"playlist_info": event_data["playlist_info"]}
+                elif event == "video":
+                    summary_data = event_data["summary_data"]
+                    event_data = {
+                        "index": event_data["index"],
+                        **event_data["summary_result"],
+                    }
+                    if event_data["success"]:
+                        event_data["summary"] = summary_data.get("summary", "")
+
+                yield format_sse_event(event, event_data)
+        except Exception as e:
+            import traceback
+
+            traceback.print_exc()
+            yield format_sse_event(
+                "error", {"error": f"Error processing playlist: {str(e)}"}
+            )
+
+    response = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@csrf_exempt
+def summarize_playlist_digest(request):
+    """
+    API endpoint that summarizes a whole playlist into one course-level summary,
+    built from the per-video summaries (see summarize/digest.py). Videos
+    summarized before are served from the summary cache or an earlier run.
 
     Request (POST JSON):
         {
             "playlist_url": "https://www.youtube.com/playlist?list=PLAYLIST_ID",
             "style": "detailed|short|academic|descriptive|technical" (optional, default: "detailed"),
-            "save_to_file": true/false (optional, default: true)
+            "save_to_file": true/false (optional, default: true, also saves
+                                        digest_{style}.txt with the playlist's summaries),
+            "max_workers": 4 (optional, capped at settings.PLAYLIST_MAX_WORKERS)
         }
 
     Response:
         {
             "success": true/false,
-            "playlist_info": {
-                "url": "playlist_url",
-                "id": "playlist_id",
-                "video_count": 10
-            },
-            "summaries": [
-                {
-                    "video_id": "VIDEO_ID1",
-                    "title": "Video title",
-                    "success": true/false,
-                    "file_path": "/path/to/summary_VIDEO_ID1.txt" (if save_to_file is true)
-                },
-                ...
-            ],
+            "playlist_info": {...},
+            "digest": "Summary of the whole playlist",
+            "rounds": 2,
+            "calls": 5,
+            "failed_videos": ["VIDEO_ID", ...],
+            "digest_file": "/path/to/digest_detailed.txt" (if save_to_file is true),
             "error": "Error message if any"
         }
     """
@@ -452,164 +2610,217 @@ def summarize_playlist(request):
 
     try:
         data = json.loads(request.body)
-        playlist_url = data.get("playlist_url")
-        style = data.get("style", "detailed")
-        save_to_file = data.get("save_to_file", True)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
 
-        if not playlist_url:
-            return JsonResponse({"error": "Missing playlist_url parameter"}, status=400)
+    playlist_url = data.get("playlist_url")
+    style = data.get("style", "detailed")
+    save_to_file = data.get("save_to_file", True)
+    max_workers = data.get("max_workers")
 
-        # First, extract the videos from the playlist using the functionality from get_links_from_playlist
-        from get_links_from_playlist.views import extract_playlist_videos_ytdlp
+    if not playlist_url:
+        return JsonResponse({"error": "Missing playlist_url parameter"}, status=400)
 
-        videos = extract_playlist_videos_ytdlp(playlist_url)
+    # Never run more workers than configured, however many the client asks for
+    try:
+        if max_workers is None:
+            max_workers = settings.PLAYLIST_MAX_WORKERS
+        max_workers = max(1, min(int(max_workers), settings.PLAYLIST_MAX_WORKERS))
+    except (TypeError, ValueError):
+        return JsonResponse({"error": "max_workers must be an integer"}, status=400)
 
-        if isinstance(videos, dict) and "error" in videos:
-            return JsonResponse(videos, status=400)
+    try:
+        summaries = {}
+        failed_videos = []
 
-        # Extract playlist ID for identification purposes
-        if "list=" in playlist_url:
-            playlist_id = playlist_url.split("list=")[1].split("&")[0]
-        else:
-            playlist_id = "playlist"
+        for event, event_data in iter_process_playlist(
+            playlist_url, style, save_to_file, max_workers
+        ):
+            if event == "error":
+                return JsonResponse(event_data, status=400)
 
-        # Create output directory for summaries
-        output_dir = Path(settings.BASE_DIR) / "summary_files"
-        output_dir.mkdir(exist_ok=True)
+            if event == "video":
+                summary_result = event_data["summary_result"]
+                if summary_result["success"]:
+                    summaries[event_data["index"]] = (
+                        summary_result["title"],
+                        event_data["summary_data"].get("summary", ""),
+                    )
+                else:
+                    failed_videos.append(summary_result["video_id"])
 
-        # Create a specific directory for this playlist's summaries
-        playlist_dir = output_dir / f"playlist_{playlist_id}"
-        playlist_dir.mkdir(exist_ok=True)
+            elif event == "complete":
+                playlist_info = event_data["playlist_info"]
+                combined_file_path = Path(event_data["combined_file"])
 
-        # Also create a combined file for all summaries
-        combined_file_path = playlist_dir / f"all_summaries_{style}.txt"
+        result = build_playlist_digest(
+            [summaries[index] for index in sorted(summaries)], style, max_workers
+        )
 
-        # Process each video in the playlist
-        summaries = []
+        if "error" in result:
+            return JsonResponse(result, status=400)
 
-        # Open the combined file
-        with open(combined_file_path, "w", encoding="utf-8") as combined_file:
-            combined_file.write(f"Summaries for playlist: {playlist_url}\n")
-            combined_file.write(f"Summary style: {style}\n")
-            combined_file.write(f"Total videos: {len(videos)}\n\n")
-            combined_file.write("=" * 80 + "\n\n")
+        response_data = {
+            "success": True,
+            "playlist_info": playlist_info,
+            "digest": result["digest"],
+            "rounds": result["rounds"],
+            "calls": result["calls"],
+            "failed_videos": failed_videos,
+        }
 
-            # Process each video
-            for i, video in enumerate(videos, 1):
-                video_id = video.get("id")
-                video_url = video.get("url")
-                video_title = video.get("title")
+        if save_to_file:
+            digest_file_path = combined_file_path.parent / f"digest_{style}.txt"
+            with open(digest_file_path, "w", encoding="utf-8") as f:
+                f.write(f"Digest of playlist: {playlist_url}\n")
+                f.write(f"Summary style: {style}\n")
+                f.write(f"Videos summarized: {len(summaries)}\n\n")
+                f.write(result["digest"])
 
-                print(f"Processing video {i}/{len(videos)}: {video_title}")
-                print(f"URL: {video_url}")
+            response_data["digest_file"] = str(digest_file_path)
 
-                # Get the summary with better error handling
-                try:
-                    # Try with detailed prompt first - use full URL instead of ID
-                    summary_data = summarize_youtube_video_with_gemini(video_url, style)
+        return JsonResponse(response_data)
 
-                    # If that fails, try with simple prompt
-                    if isinstance(summary_data, dict) and "error" in summary_data:
-                        print(
-                            f"Detailed prompt failed: {summary_data['error']}. Trying simple prompt..."
-                        )
-                        summary_data = summarize_youtube_video_with_simple_prompt(
-                            video_url, style
-                        )
-                except Exception as e:
-                    import traceback
+    except Exception as e:
+        import traceback
 
-                    traceback.print_exc()
-                    summary_data = {"error": f"Exception in summarization: {str(e)}"}
+        traceback.print_exc()
+        return JsonResponse(
+            {"error": f"Error building playlist digest: {str(e)}"}, status=500
+        )
 
-                summary_result = {
-                    "video_id": video_id,
-                    "video_url": video_url,
-                    "title": video_title,
-                    "success": not (
-                        isinstance(summary_data, dict) and "error" in summary_data
-                    ),
-                }
 
-                if summary_result["success"]:
-                    # If save_to_file is true, save the individual summary
-                    if save_to_file:
-                        # Individual file path
-                        file_path = playlist_dir / f"summary_{video_id}_{style}.txt"
-
-                        # Format the transcript and summary for the file
-                        with open(file_path, "w", encoding="utf-8") as f:
-                            f.write(f"Title: {video_title}\n")
-                            f.write(f"URL: {video_url}\n\n")
-                            f.write(f"Style: {style}\n\n")
-
-                            if isinstance(summary_data, dict):
-                                # Write transcript if available
-                                if (
-                                    "transcript" in summary_data
-                                    and summary_data["transcript"]
-                                ):
-                                    f.write("Transcript:\n\n")
-                                    f.write(summary_data["transcript"])
-                                    f.write("\n\n")
-
-                                # Write summary if available
-                                if (
-                                    "summary" in summary_data
-                                    and summary_data["summary"]
-                                ):
-                                    f.write("Summary:\n\n")
-                                    f.write(summary_data["summary"])
-                            else:
-                                f.write(str(summary_data))
-
-                        summary_result["file_path"] = str(file_path)
-
-                    # Add to the combined file
-                    combined_file.write(f"Video {i}: {video_title}\n")
-                    combined_file.write(f"ID: {video_id}\n")
-                    combined_file.write(f"URL: {video_url}\n\n")
-
-                    if isinstance(summary_data, dict) and "summary" in summary_data:
-                        combined_file.write("Summary:\n")
-                        combined_file.write(summary_data["summary"])
-                    else:
-                        combined_file.write("No summary available")
+@csrf_exempt
+async def get_video_summary_async(request):
+    """
+    Async version of get_video_summary for ASGI servers: the Gemini calls and
+    retry backoff don't hold a worker thread, so one process can keep many
+    summaries in flight. Takes the same request and returns the same response;
+    "styles" and "stream" requests are handed to get_video_summary.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Only POST method is allowed"}, status=405)
 
-                    combined_file.write("\n\n" + "=" * 80 + "\n\n")
-                else:
-                    # If there was an error, add it to the result
-                    summary_result["error"] = summary_data.get("error", "Unknown error")
+    from .aio import summarize_video_async
 
-                    # Add error info to the combined file
-                    combined_file.write(f"Video {i}: {video_title}\n")
-                    combined_file.write(f"ID: {video_id}\n")
-                    combined_file.write(f"URL: {video_url}\n\n")
-                    combined_file.write(f"Error: {summary_result['error']}\n\n")
-                    combined_file.write("=" * 80 + "\n\n")
+    try:
+        data = json.loads(request.body)
 
-                # Add to our results
-                summaries.append(summary_result)
+        if (
+            data.get("styles")
+            or data.get("stream", False)
+            or data.get("engine", DEFAULT_ENGINE) != DEFAULT_ENGINE
+        ):
+            return await sync_to_async(get_video_summary)(request)
 
-        # Return the results
-        return JsonResponse(
-            {
-                "success": True,
-                "playlist_info": {
-                    "url": playlist_url,
-                    "id": playlist_id,
-                    "video_count": len(videos),
-                    "style": style,
-                },
-                "summaries": summaries,
-                "combined_file": str(combined_file_path),
-            }
+        video_input = data.get("video_url") or data.get("video_id")
+        style = data.get("style", "detailed")
+        save_to_file = data.get("save_to_file", False)
+        duration = data.get("duration_seconds")
+        model_tier = data.get("model_tier", AUTO_TIER)
+
+        if not video_input:
+            return JsonResponse(
+                {"error": "Missing video_url or video_id parameter"}, status=400
+            )
+
+        try:
+            validate_model_tier(model_tier)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        if duration is not None:
+            duration = int(duration)
+
+        deadline_seconds = min(
+            float(data.get("deadline_seconds", settings.SUMMARY_DEADLINE_SECONDS)),
+            settings.SUMMARY_DEADLINE_SECONDS,
+        )
+
+        response_data = await summarize_video_async(
+            video_input,
+            style,
+            use_cache=not data.get("refresh", False),
+            deadline=Deadline(deadline_seconds),
+            duration=duration,
+            long_video=data.get("long_video"),
+            model_tier=model_tier,
         )
 
+        if isinstance(response_data, dict) and response_data.get("deadline_exceeded"):
+            return JsonResponse(response_data, status=504)
+
+        if isinstance(response_data, dict) and "error" in response_data:
+            return JsonResponse(response_data, status=400)
+
+        result = video_summary_result(response_data, style)
+
+        if save_to_file:
+            result["file_path"] = await sync_to_async(
+                save_video_summary, thread_sensitive=False
+            )(response_data, video_input, style)
+
+        return JsonResponse(result)
+
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
+    except Exception as e:
+        import traceback
+
+        traceback.print_exc()
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@csrf_exempt
+async def summarize_playlist_async(request):
+    """
+    Async version of summarize_playlist for ASGI servers. Videos are
+    summarized as coroutines, up to "max_concurrency" (capped at
+    settings.ASYNC_PLAYLIST_CONCURRENCY) at a time, instead of one per worker
+    thread. Takes the same request and returns the same response;
+    "background", "only_new" and "styles" requests are handed to
+    summarize_playlist.
+
+    Request (POST JSON):
+        {
+            "playlist_url": "https://www.youtube.com/playlist?list=PLAYLIST_ID",
+            "style": "detailed|short|academic|descriptive|technical" (optional, default: "detailed"),
+            "save_to_file": true/false (optional, default: true),
+            "max_concurrency": 50 (optional, number of videos summarized at once),
+            "resume": true/false (optional, default: true)
+        }
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Only POST method is allowed"}, status=405)
+
+    from .aio import process_playlist_async
+
+    try:
+        data = json.loads(request.body)
+        playlist_url = data.get("playlist_url")
+
+        if data.get("background", False) or data.get("only_new", False) or data.get("styles"):
+            return await sync_to_async(summarize_playlist)(request)
+
+        if not playlist_url:
+            return JsonResponse({"error": "Missing playlist_url parameter"}, status=400)
+
+        result = await process_playlist_async(
+            playlist_url,
+            data.get("style", "detailed"),
+            data.get("save_to_file", True),
+            data.get("max_concurrency"),
+            resume=data.get("resume", True),
+        )
+
+        if "error" in result:
+            return JsonResponse(result, status=400)
+
+        return JsonResponse(result)
+
     except json.JSONDecodeError:
         return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
     except Exception as e:
-        # Print exception details for debugging
         import traceback
 
         traceback.print_exc()
@@ -618,7 +2829,72 @@ def summarize_playlist(request):
         )
 
 
-# Add to summarize/views.py
+@csrf_exempt
+async def test_api_connection_async(request):
+    """
+    Async version of test_api_connection
+    """
+    try:
+        try:
+            model = get_model()
+        except Exception as e:
+            return JsonResponse(
+                {
+                    "status": "error",
+                    "message": f"Error initializing Gemini model: {str(e)}",
+                },
+                status=400,
+            )
+
+        if model is None:
+            return JsonResponse(
+                {
+                    "status": "error",
+                    "message": "API key not found in environment variables",
+                },
+                status=400,
+            )
+
+        test_prompt = "Hello! This is a test to verify the API connection."
+
+        try:
+            response = await generate_content_async(model, test_prompt)
+            response_text = (
+                response.text if hasattr(response, "text") else str(response)
+            )
+
+            return JsonResponse(
+                {
+                    "status": "success",
+                    "message": "Gemini API connection successful",
+                    "response_preview": (
+                        response_text[:100] + "..."
+                        if len(response_text) > 100
+                        else response_text
+                    ),
+                    "model": model.model_name,
+                    "models": get_model_status(),
+                }
+            )
+        except Exception as e:
+            return JsonResponse(
+                {
+                    "status": "error",
+                    "message": f"Error generating content: {str(e)}",
+                },
+                status=400,
+            )
+
+    except Exception as e:
+        import traceback
+
+        traceback.print_exc()
+        return JsonResponse(
+            {"status": "error", "message": f"Error testing API connection: {str(e)}"},
+            status=500,
+        )
+
+
 def index(request):
     """
     Main page view for the summarizer app